@@ -0,0 +1,44 @@
+# Generated by Django 4.2.26 on 2026-10-19 14:02
+
+import django.contrib.postgres.indexes
+import django.db.models.functions.text
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("api", "0121_vw_project_summary_sample_events_macroinvertebrate"),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddIndex(
+            model_name="management",
+            index=models.Index(
+                models.F("project"),
+                django.db.models.functions.text.Lower(
+                    django.db.models.functions.text.Replace(
+                        django.db.models.functions.text.Replace(
+                            django.db.models.functions.text.Replace("name", models.Value(" ")),
+                            models.Value("_"),
+                        ),
+                        models.Value("-"),
+                    )
+                ),
+                name="management_norm_name_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="site",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["name"], name="site_name_trgm_idx", opclasses=["gin_trgm_ops"]
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="sampleevent",
+            index=models.Index(
+                fields=["site", "management", "sample_date"], name="se_site_mgmt_date_idx"
+            ),
+        ),
+    ]
@@ -4,7 +4,9 @@ import logging
 import uuid
 
 from django.contrib.gis.db import models
+from django.contrib.postgres.indexes import GinIndex
 from django.db import transaction
+from django.db.models.functions import Lower, Replace
 from django.forms.models import model_to_dict
 from django.utils import timezone
 from django.utils.translation import gettext as _
@@ -314,6 +316,19 @@ class Management(BaseModel, JSONMixin, AreaMixin):
         db_table = "management"
         verbose_name = _("management regime")
         ordering = ("name",)
+        indexes = [
+            # Names compared ignoring case, spaces, underscores and dashes
+            models.Index(
+                models.F("project"),
+                Lower(
+                    Replace(
+                        Replace(Replace("name", models.Value(" ")), models.Value("_")),
+                        models.Value("-"),
+                    )
+                ),
+                name="management_norm_name_idx",
+            ),
+        ]
 
     def __str__(self):
         fullname = self.name
@@ -392,6 +407,9 @@ class Site(BaseModel, JSONMixin):
     class Meta:
         db_table = "site"
         ordering = ("name",)
+        indexes = [
+            GinIndex(fields=["name"], opclasses=["gin_trgm_ops"], name="site_name_trgm_idx"),
+        ]
 
     def __str__(self):
         return _("%s") % self.name
@@ -506,6 +524,11 @@ class SampleEvent(BaseModel, JSONMixin):
     class Meta:
         db_table = "sample_event"
         ordering = ("site", "sample_date")
+        indexes = [
+            models.Index(
+                fields=["site", "management", "sample_date"], name="se_site_mgmt_date_idx"
+            ),
+        ]
 
     def __str__(self):
         return "%s %s" % (self.site.__str__(), self.sample_date)
@@ -54,7 +54,9 @@ class BeltTransectWidth(BaseChoiceModel):
         if isinstance(size, (int, float, Decimal)) is False or size < 0:
             return None
 
-        conditions = list(self.conditions.all().order_by("size"))
+        # Sorted in Python (nulls last, as ordered by the db) so prefetched
+        # conditions are used without another query.
+        conditions = sorted(self.conditions.all(), key=lambda c: (c.size is None, c.size or 0))
         default_condition = self._get_default_condition(conditions)
         combos = self._get_conditions_combinations(conditions)
 
@@ -3,6 +3,7 @@ from django.utils import timezone
 from django.utils.text import slugify
 
 from api.reports import RawCSVReport
+from api.reports.report_serializer import serialize_many
 
 
 def get_fields(serializer_class, include_additional_fields, show_display_fields):
@@ -67,21 +68,44 @@ def _flatten_json_columns(content, show_display_fields=False):
 def get_formatted_data(
     data, serializer_class, include_additional_fields=False, show_display_fields=False
 ):
-    fields = get_fields(
-        serializer_class,
-        include_additional_fields=include_additional_fields,
-        show_display_fields=show_display_fields,
-    )
-    serialized_data = get_data(
-        serializer_class,
-        data,
-        include_additional_fields=include_additional_fields,
-        show_display_fields=show_display_fields,
-    )
-    report = RawCSVReport()
-    fdata = report.data(fields, serialized_data)
-    formatted_data = _flatten_json_columns(fdata, show_display_fields=show_display_fields)
-    return formatted_data[0], formatted_data[1:]
+    return get_formatted_data_sets(
+        data, serializer_class, [(include_additional_fields, show_display_fields)]
+    )[0]
+
+
+def get_formatted_data_sets(data, serializer_class, field_options):
+    """
+    Format `data` once per `(include_additional_fields, show_display_fields)`
+    option, reading the rows in a single pass.
+    """
+    serializers = [
+        serializer_class(
+            data,
+            include_additional_fields=include_additional_fields,
+            show_display_fields=show_display_fields,
+        )
+        for include_additional_fields, show_display_fields in field_options
+    ]
+    serialized_data = [[] for _ in serializers]
+    if data is not None:
+        for prepared_rows in serialize_many(serializers, data):
+            for records, prepared_row in zip(serialized_data, prepared_rows):
+                records.append(prepared_row)
+
+    formatted_data_sets = []
+    for (include_additional_fields, show_display_fields), records in zip(
+        field_options, serialized_data
+    ):
+        fields = get_fields(
+            serializer_class,
+            include_additional_fields=include_additional_fields,
+            show_display_fields=show_display_fields,
+        )
+        fdata = RawCSVReport().data(fields, records)
+        formatted_data = _flatten_json_columns(fdata, show_display_fields=show_display_fields)
+        formatted_data_sets.append((formatted_data[0], formatted_data[1:]))
+
+    return formatted_data_sets
 
 
 def get_csv_response(
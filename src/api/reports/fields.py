@@ -1,4 +1,3 @@
-
 class BaseReportField:
     def __init__(self, display=None, alias=None, **kwargs):
         self._display = None
@@ -24,6 +23,13 @@ class BaseReportField:
     def to_representation(self, row, serializer_instance):
         raise NotImplementedError()
 
+    @property
+    def is_column_formattable(self):
+        return False
+
+    def to_column_representation(self, values, serializer_instance):
+        raise NotImplementedError()
+
     def __str__(self):
         return f"{self.display} ({self.alias})"
 
@@ -41,6 +47,16 @@ class ReportField(BaseReportField):
 
         return self.formatter(value, self, row, serializer_instance)
 
+    @property
+    def is_column_formattable(self):
+        return self.formatter is None or hasattr(self.formatter, "column")
+
+    def to_column_representation(self, values, serializer_instance):
+        if self.formatter is None:
+            return list(values)
+
+        return self.formatter.column(values, self, serializer_instance)
+
 
 class ReportMethodField(BaseReportField):
     def __init__(self, method_name, display=None, alias=None, **kwargs):
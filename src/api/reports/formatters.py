@@ -1,3 +1,5 @@
+from operator import attrgetter
+
 from api.models import Project
 
 DATA_POLICIES = dict(Project.DATA_POLICIES)
@@ -16,84 +18,134 @@ def handle_none(default_val=None):
     return decorator
 
 
+def column_formatter(column_func):
+    """
+    Attach a column-level version of a formatter. It is called once per chunk
+    of values, `column_func(values, field, serializer_instance)`, and must
+    return the formatted values in the same order.
+    """
+
+    def decorator(func):
+        func.column = column_func
+        return func
+
+    return decorator
+
+
+def _map_not_none(func):
+    def column(values, field, serializer_instance):
+        return [None if v is None else func(v) for v in values]
+
+    return column
+
+
+def _names(value):
+    return ", ".join([v["name"] for v in value])
+
+
+def _life_history_proportion(value, key):
+    for lh in value:
+        if "name" in lh and "proportion" in lh and lh["name"] == key:
+            return lh["proportion"]
+    return None
+
+
+def _protocol_value(value, protocol, key):
+    if protocol not in value or key not in value[protocol]:
+        return None
+
+    returnval = value[protocol][key]
+    if isinstance(returnval, dict):
+        returnval = ", ".join([f"{key}: {val}" for key, val in returnval.items()])
+    return returnval
+
+
+@column_formatter(_map_not_none(str))
 @handle_none()
 def to_str(value, field, row, serializer_instance):
     return str(value)
 
 
+@column_formatter(_map_not_none(float))
 @handle_none()
 def to_float(value, field, row, serializer_instance):
     return float(value)
 
 
+@column_formatter(_map_not_none(attrgetter("y")))
 @handle_none()
 def to_latitude(value, field, row, serializer_instance):
     return value.y
 
 
+@column_formatter(_map_not_none(attrgetter("x")))
 @handle_none()
 def to_longitude(value, field, row, serializer_instance):
     return value.x
 
 
+@column_formatter(_map_not_none(attrgetter("year")))
 @handle_none()
 def to_year(value, field, row, serializer_instance):
     return value.year
 
 
+@column_formatter(_map_not_none(attrgetter("month")))
 @handle_none()
 def to_month(value, field, row, serializer_instance):
     return value.month
 
 
+@column_formatter(_map_not_none(attrgetter("day")))
 @handle_none()
 def to_day(value, field, row, serializer_instance):
     return value.day
 
 
+@column_formatter(_map_not_none(", ".join))
 @handle_none()
 def to_join_list(value, field, row, serializer_instance):
     return ", ".join(value)
 
 
+@column_formatter(_map_not_none(", ".join))
 @handle_none()
 def to_governance(value, field, row, serializer_instance):
     return ", ".join(value)
 
 
+@column_formatter(_map_not_none(_names))
 @handle_none()
 def to_names(value, field, row, serializer_instance):
-    vals = [v["name"] for v in value]
-    return ", ".join(vals)
+    return _names(value)
+
 
+def _life_history_column(values, field, serializer_instance):
+    return [None if v is None else _life_history_proportion(v, field.key) for v in values]
 
+
+@column_formatter(_life_history_column)
 @handle_none()
 def to_life_history(value, field, row, serializer_instance):
-    if value is None:
-        return None
+    return _life_history_proportion(value, field.key)
 
-    proportion = None
-    for lh in value:
-        if "name" in lh and "proportion" in lh and lh["name"] == field.key:
-            proportion = lh["proportion"]
-            break
-    return proportion
 
+def _protocol_value_column(values, field, serializer_instance):
+    if not hasattr(field, "protocol") or not hasattr(field, "key"):
+        return [None] * len(values)
+
+    protocol = field.protocol
+    key = field.key
+    return [None if v is None else _protocol_value(v, protocol, key) for v in values]
 
+
+@column_formatter(_protocol_value_column)
 @handle_none()
 def to_protocol_value(value, field, row, serializer_instance):
-    if (
-        not hasattr(field, "protocol")
-        or not hasattr(field, "key")
-        or field.protocol not in value
-        or field.key not in value[field.protocol]
-    ):
+    if not hasattr(field, "protocol") or not hasattr(field, "key"):
         return None
 
-    returnval = value[field.protocol][field.key]
-    if isinstance(returnval, dict):
-        returnval = ", ".join([f"{key}: {val}" for key, val in returnval.items()])
-    return returnval
+    return _protocol_value(value, field.protocol, field.key)
 
 
 @handle_none()
@@ -136,6 +188,11 @@ def to_percent_cover(value, field, row, serializer_instance):
     )
 
 
+def _covariate_column(values, field, serializer_instance):
+    return [to_covariate(v, field, None, serializer_instance) for v in values]
+
+
+@column_formatter(_covariate_column)
 def to_covariate(value, field, row, serializer_instance):
     if not value:
         return ""
@@ -146,15 +203,19 @@ def to_covariate(value, field, row, serializer_instance):
         values = covariate["value"]
         if not isinstance(values, list):
             return values
-        sorted(values, key=lambda x: (x["area"]), reverse=True)
+        sorted(values, key=lambda x: x["area"], reverse=True)
         return values[0]["name"] if values else ""
 
     return ""
 
 
+@column_formatter(lambda values, field, serializer_instance: ["Yes" if v else "No" for v in values])
 def to_yesno(value, field, row, serializer_instance):
     return "Yes" if value else "No"
 
 
+@column_formatter(
+    lambda values, field, serializer_instance: [DATA_POLICIES.get(v, "Unknown") for v in values]
+)
 def to_data_policy(value, field, row, serializer_instance):
     return DATA_POLICIES.get(value, "Unknown")
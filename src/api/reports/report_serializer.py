@@ -2,6 +2,7 @@ import re
 from collections import OrderedDict
 
 from ..utils import is_match
+from ..utils.dbutils import iter_queryset, queryset_chunks
 
 
 class ReportSerializer(object):
@@ -48,13 +49,49 @@ class ReportSerializer(object):
         column_paths += self.non_field_columns or tuple()
         return qs.only(*column_paths)
 
+    def _get_row_key(self, field):
+        if getattr(self, "show_display_fields", False) is True:
+            return field.display
+        return field.alias or field.column_path
+
+    def _get_column_formattable_paths(self, fields):
+        """
+        Column paths to read with `values_list` if every field can be formatted
+        a column at a time, otherwise None.
+        """
+        if not hasattr(self.queryset, "values_list") or not all(
+            f.is_column_formattable for f in fields
+        ):
+            return None
+
+        concrete_fields = {}
+        for f in self.queryset.model._meta.concrete_fields:
+            if f.is_relation:
+                concrete_fields[f.attname] = f
+            else:
+                concrete_fields[f.name] = f
+
+        column_paths = []
+        for field in fields:
+            if field.column_path not in concrete_fields:
+                return None
+            if field.column_path not in column_paths:
+                column_paths.append(field.column_path)
+
+        return column_paths
+
+    def _prepare_rows(self, chunk, fields, column_paths):
+        columns = dict(zip(column_paths, zip(*chunk)))
+        keys = [self._get_row_key(f) for f in fields]
+        formatted_columns = [
+            f.to_column_representation(columns[f.column_path], self) for f in fields
+        ]
+        return [dict(zip(keys, values)) for values in zip(*formatted_columns)]
+
     def _prepare_row(self, row, fields):
         prepared_row = OrderedDict()
         for field in fields:
-            if getattr(self, "show_display_fields", False) is True:
-                prepared_row[field.display] = field.to_representation(row, self)
-            else:
-                prepared_row[field.alias or field.column_path] = field.to_representation(row, self)
+            prepared_row[self._get_row_key(field)] = field.to_representation(row, self)
 
         return prepared_row
 
@@ -73,8 +110,50 @@ class ReportSerializer(object):
         fields = self.get_fields()
         qs = self._get_prepared_queryset(self.queryset)
         self.preserialize(qs)
-        for row in qs:
-            yield self._prepare_row(row, fields)
+
+        column_paths = self._get_column_formattable_paths(fields)
+        if column_paths is None:
+            for row in iter_queryset(qs):
+                yield self._prepare_row(row, fields)
+            return
+
+        for chunk in queryset_chunks(self.queryset.values_list(*column_paths)):
+            yield from self._prepare_rows(chunk, fields, column_paths)
 
     def get_serialized_data(self, *args, **kwargs):
         return self.data
+
+
+def serialize_many(serializers, queryset):
+    """
+    Serialize `queryset` with several serializers in a single pass over the rows.
+    Yields a tuple per row with the prepared row of each serializer.
+    """
+    field_sets = [s.get_fields() for s in serializers]
+    path_sets = [s._get_column_formattable_paths(f) for s, f in zip(serializers, field_sets)]
+    column_paths = set()
+    for serializer in serializers:
+        column_paths.update(serializer._get_column_paths())
+        column_paths.update(serializer.non_field_columns or tuple())
+
+    qs = queryset
+    if any(s.ignore_select_related is False for s in serializers):
+        qs = qs.select_related()
+    qs = qs.only(*column_paths)
+
+    for serializer in serializers:
+        serializer.preserialize(qs)
+
+    if any(paths is None for paths in path_sets):
+        for row in iter_queryset(qs):
+            yield tuple(s._prepare_row(row, fields) for s, fields in zip(serializers, field_sets))
+        return
+
+    column_paths = list(dict.fromkeys(p for paths in path_sets for p in paths))
+    for chunk in queryset_chunks(queryset.values_list(*column_paths)):
+        columns = list(zip(*chunk))
+        prepared_rows = []
+        for serializer, fields, paths in zip(serializers, field_sets, path_sets):
+            serializer_chunk = list(zip(*[columns[column_paths.index(p)] for p in paths]))
+            prepared_rows.append(serializer._prepare_rows(serializer_chunk, fields, paths))
+        yield from zip(*prepared_rows)
@@ -1,6 +1,7 @@
 from django.conf import settings
 from django.db import transaction
-from django.db.models import Q
+from django.db.models import Count, Q
+from django.utils import timezone
 from rest_condition import Or
 from rest_framework import permissions, serializers, status
 from rest_framework.exceptions import MethodNotAllowed, ValidationError
@@ -10,8 +11,10 @@ from ...exceptions import check_uuid
 from ...models import (
     BENTHICPQT_PROTOCOL,
     Annotation,
+    BenthicAttribute,
     ClassificationStatus,
     CollectRecord,
+    GrowthForm,
     Image,
     ObsBenthicPhotoQuadrat,
     Point,
@@ -22,11 +25,22 @@ from ...utils import truthy
 from ...utils.classification import classify_image_job, create_classification_status
 from ..base import BaseAPIFilterSet, BaseAPISerializer, BaseProjectApiViewSet
 from ..mixins import DynamicFieldsMixin
-from .annotation import SaveAnnotationSerializer
 from .classification_status import ClassificationStatusSerializer
 from .point import PointSerializer
 
 
+# Point counts computed in the database, used by ImageSerializer when present
+POINT_COUNT_ANNOTATIONS = {
+    "num_points": Count("points", distinct=True),
+    "num_confirmed_points": Count(
+        "points", filter=Q(points__annotations__is_confirmed=True), distinct=True
+    ),
+    "num_unclassified_points": Count(
+        "points", filter=Q(points__annotations__isnull=True), distinct=True
+    ),
+}
+
+
 class ImagePermission(permissions.BasePermission):
     def has_permission(self, request, view):
         profile = getattr(request.user, "profile", None)
@@ -89,6 +103,14 @@ class ImageSerializer(DynamicFieldsMixin, BaseAPISerializer):
         if obj.pk in self._counts_cache:
             return self._counts_cache[obj.pk]
 
+        if hasattr(obj, "num_confirmed_points"):
+            count_unconfirmed = (
+                obj.num_points - obj.num_confirmed_points - obj.num_unclassified_points
+            )
+            result = (obj.num_confirmed_points, count_unconfirmed, obj.num_unclassified_points)
+            self._counts_cache[obj.pk] = result
+            return result
+
         count_confirmed = 0
         count_unconfirmed = 0
         count_unclassified = 0
@@ -253,26 +275,124 @@ class ImageViewSet(BaseProjectApiViewSet):
         data = ImageSerializer(instance=image_record, context={"request": request}).data
         return Response(data=data, status=status.HTTP_201_CREATED)
 
-    def _get_validated_annotations(self, point_data, pk):
-        if "annotations" not in point_data:
-            raise ValidationError("'annotations' is required.")
+    def _get_point_annotations(self, points_data, pk):
+        for point_data in points_data:
+            if "annotations" not in point_data:
+                raise ValidationError("'annotations' is required.")
+
+        point_ids = [check_uuid(point_data.get("id")) for point_data in points_data]
+        points = {str(p.pk): p for p in Point.objects.filter(id__in=point_ids, image=pk)}
+
+        point_annotations = []
+        for point_id, point_data in zip(point_ids, points_data):
+            point = points.get(str(point_id))
+            if point is None:
+                raise ValidationError(f"Point ({point_id}) is missing")
+
+            annotations = point_data.get("annotations") or []
+            # Only allow one confirmed annotation per point
+            if len([anno for anno in annotations if anno.get("is_confirmed")]) > 1:
+                raise ValidationError("Only one annotation can be confirmed.")
+            point_annotations.append((point, annotations))
+
+        return point_annotations
+
+    def _check_related_ids(self, model_cls, field_name, ids):
+        ids = {str(check_uuid(pk)) for pk in ids if pk is not None}
+        existing_ids = {
+            str(pk) for pk in model_cls.objects.filter(id__in=ids).values_list("id", flat=True)
+        }
+        missing_ids = sorted(ids - existing_ids)
+        if missing_ids:
+            raise ValidationError(
+                {field_name: [f'Invalid pk "{pk}" - object does not exist.' for pk in missing_ids]}
+            )
 
-        point_id = point_data.get("id")
-        point = Point.objects.get_or_none(id=point_data.get("id"), image=pk)
-        if point is None:
-            raise ValidationError(f"Point ({point_id}) is missing")
+    def _validate_annotations(self, point_annotations):
+        annotations = [anno for _, annos in point_annotations for anno in annos]
+        if any(anno.get("benthic_attribute") is None for anno in annotations):
+            raise ValidationError({"benthic_attribute": ["This field is required."]})
 
-        return point, point_data.get("annotations")
+        self._check_related_ids(
+            BenthicAttribute,
+            "benthic_attribute",
+            [anno.get("benthic_attribute") for anno in annotations],
+        )
+        self._check_related_ids(
+            GrowthForm, "growth_form", [anno.get("growth_form") for anno in annotations]
+        )
 
-    def _delete_existing_user_annotations(self, point, annotations):
-        user_annotation_ids = [
-            anno.get("id")
-            for anno in annotations
-            if not anno.get("is_machine_created") and anno.get("id")
-        ]
-        Annotation.objects.filter(point=point, is_machine_created=False).exclude(
+    def _save_point_annotations(self, point_annotations, profile):
+        """
+        Diff submitted annotations against the existing ones and apply the
+        changes with one delete, one insert and one update per field set.
+        """
+        points = [point for point, _ in point_annotations]
+        existing = {
+            (anno.point_id, str(anno.pk)): anno
+            for anno in Annotation.objects.filter(point__in=points)
+        }
+        updated_on = timezone.now()
+
+        user_annotation_ids = []
+        new_annotations = []
+        user_annotations = []
+        machine_annotations = []
+        for point, annotations in point_annotations:
+            for annotation_data in annotations:
+                anno_id = annotation_data.get("id")
+                is_machine_created = bool(annotation_data.get("is_machine_created"))
+                is_confirmed = bool(annotation_data.get("is_confirmed"))
+                if not is_machine_created and anno_id:
+                    user_annotation_ids.append(check_uuid(anno_id))
+
+                instance = existing.get((point.pk, str(anno_id)))
+                if instance is None:
+                    if is_machine_created:
+                        raise ValidationError("Machine generated annotations can not be created.")
+                    new_annotations.append(
+                        Annotation(
+                            point=point,
+                            benthic_attribute_id=annotation_data["benthic_attribute"],
+                            growth_form_id=annotation_data.get("growth_form"),
+                            is_confirmed=is_confirmed,
+                            score=100,
+                            classifier=None,
+                            created_by=profile,
+                            updated_by=profile,
+                        )
+                    )
+                elif not instance.is_machine_created:
+                    instance.benthic_attribute_id = annotation_data["benthic_attribute"]
+                    instance.growth_form_id = annotation_data.get("growth_form")
+                    instance.is_confirmed = is_confirmed
+                    instance.score = 100
+                    instance.classifier = None
+                    instance.updated_by = profile
+                    instance.updated_on = updated_on
+                    user_annotations.append(instance)
+                elif instance.is_confirmed != is_confirmed:
+                    instance.is_confirmed = is_confirmed
+                    instance.updated_on = updated_on
+                    machine_annotations.append(instance)
+
+        Annotation.objects.filter(point__in=points, is_machine_created=False).exclude(
             id__in=user_annotation_ids
         ).delete()
+        Annotation.objects.bulk_update(
+            user_annotations,
+            [
+                "benthic_attribute",
+                "growth_form",
+                "is_confirmed",
+                "score",
+                "classifier",
+                "updated_by",
+                "updated_on",
+            ],
+        )
+        Annotation.objects.bulk_update(machine_annotations, ["is_confirmed", "updated_on"])
+        Annotation.objects.bulk_create(new_annotations)
 
     def partial_update(self, request, pk, *args, **kwargs):
         data = request.data
@@ -284,25 +404,12 @@ class ImageViewSet(BaseProjectApiViewSet):
 
         context = {"request": request}
         with transaction.atomic():
-            points = data.get("points")
             serializer = PatchImageSerializer(data=data, instance=image_record, context=context)
             serializer.is_valid(raise_exception=True)
 
-            for point_data in points:
-                point, annotations = self._get_validated_annotations(point_data, pk)
-                self._delete_existing_user_annotations(point, annotations)
-                # Only allow one confirmed annotation per point
-                pnt_serializer = PointSerializer(instance=point, data=point_data, context=context)
-                pnt_serializer.is_valid(raise_exception=True)
-
-                for annotation_data in annotations:
-                    anno_id = annotation_data.get("id")
-                    anno_instance = Annotation.objects.get_or_none(id=anno_id, point=point)
-                    anno_serializer = SaveAnnotationSerializer(
-                        instance=anno_instance, data=annotation_data, context=context
-                    )
-                    anno_serializer.is_valid(raise_exception=True)
-                    anno_serializer.save(point=point)
+            point_annotations = self._get_point_annotations(data.get("points"), pk)
+            self._validate_annotations(point_annotations)
+            self._save_point_annotations(point_annotations, request.user.profile)
 
-        updated_image_record = qs.get(id=pk)
+        updated_image_record = qs.annotate(**POINT_COUNT_ANNOTATIONS).get(id=pk)
         return Response(ImageSerializer(instance=updated_image_record).data)
@@ -146,7 +146,9 @@ class CollectRecordViewSet(BaseProjectApiViewSet):
         record_ids = request.data.get("ids") or []
         profile = request.user.profile
         try:
-            output = validate_collect_records(profile, record_ids, CollectRecordSerializer)
+            output = validate_collect_records(
+                profile, record_ids, CollectRecordSerializer, incremental=True
+            )
         except ValueError as err:
             raise ParseError(err) from err
 
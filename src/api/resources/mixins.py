@@ -23,7 +23,7 @@ from ..permissions import ProjectDataAdminPermission
 from ..signals.classification import post_edit
 from ..utils import create_iso_date_string, get_protected_related_objects, truthy
 from ..utils.project import get_safe_project_name
-from ..utils.sample_unit_methods import edit_transect_method
+from ..utils.sample_unit_methods import edit_transect_method, edit_transect_methods
 
 
 class ProtectedResourceMixin(object):
@@ -134,24 +134,43 @@ class OrFilterSetMixin(object):
 
 
 class SampleUnitMethodEditMixin(object):
-    def edit_sample_unit(self, request, pk):
+    def _get_collect_record_owner(self, request):
         collect_record_owner = Project.objects.get_or_none(id=request.data.get("owner"))
         if collect_record_owner is None:
             collect_record_owner = request.user.profile
+        return collect_record_owner
 
+    def _get_protocol(self):
         model = self.get_queryset().model
         if hasattr(model, "protocol") is False:
             raise ValueError("Unsupported model")
+        return model.protocol
 
+    def edit_sample_unit(self, request, pk, project_pk=None):
         return edit_transect_method(
-            self.serializer_class, collect_record_owner, request, pk, model.protocol
+            self.serializer_class,
+            self._get_collect_record_owner(request),
+            request,
+            pk,
+            self._get_protocol(),
+            project_pk=project_pk,
+        )
+
+    def edit_sample_units(self, request, pks, project_pk=None):
+        return edit_transect_methods(
+            self.serializer_class,
+            self._get_collect_record_owner(request),
+            request,
+            pks,
+            self._get_protocol(),
+            project_pk=project_pk,
         )
 
     @transaction.atomic
     @action(detail=True, methods=["PUT"], permission_classes=[ProjectDataAdminPermission])
     def edit(self, request, project_pk, pk):
         try:
-            collect_record = self.edit_sample_unit(request, pk)
+            collect_record = self.edit_sample_unit(request, pk, project_pk=project_pk)
             post_edit.send(sender=collect_record.__class__, instance=collect_record)
 
             return Response({"id": str(collect_record.pk)})
@@ -160,6 +179,25 @@ class SampleUnitMethodEditMixin(object):
                 f"{self.get_queryset().model.__name__} with id {pk} not found", status=404
             )
 
+    @transaction.atomic
+    @action(detail=False, methods=["PUT"], permission_classes=[ProjectDataAdminPermission])
+    def edit_many(self, request, project_pk):
+        pks = request.data.get("ids")
+        if not isinstance(pks, list) or not pks:
+            raise exceptions.ValidationError("ids must be a non-empty list")
+        for pk in pks:
+            check_uuid(pk)
+
+        try:
+            collect_records = self.edit_sample_units(request, pks, project_pk=project_pk)
+        except ObjectDoesNotExist as e:
+            return Response(str(e), status=404)
+
+        for collect_record in collect_records:
+            post_edit.send(sender=collect_record.__class__, instance=collect_record)
+
+        return Response({"ids": [str(collect_record.pk) for collect_record in collect_records]})
+
 
 class SampleUnitMethodSummaryReport(object):
     @action(detail=False, methods=["GET"])
@@ -16,7 +16,7 @@ from ...permissions import (
 )
 from ...reports import csv_report
 from ...resources.base import BaseApiViewSet, BaseProjectApiViewSet
-from ...utils import cached, truthy
+from ...utils import cached, cached_filters, truthy
 from ...utils.sample_units import consolidate_sample_events, has_duplicate_sample_events
 
 
@@ -137,16 +137,26 @@ class AggregatedViewMixin(BaseApiViewSet):
                 include_additional_fields=include_additional_fields,
                 show_display_fields=show_display_fields,
             )
-            if cached.exists(key):
+            last_modified = cached.get_project_last_modified(project_id)
+            if cached.has_filtering_params(request):
+                response = cached_filters.filtered_csv_response(
+                    request,
+                    key,
+                    self.filterset_class,
+                    file_name_prefix=file_name_prefix,
+                    last_modified=last_modified,
+                )
+            else:
                 response = cached.streaming_response(
                     request=request,
                     key=key,
                     file_name=f"{file_name_prefix}.csv",
                     content_type="text/csv",
                     content_encoding="gzip",
+                    last_modified=last_modified,
                 )
-                if response:
-                    return response
+            if response:
+                return response
 
         queryset = self.filter_queryset(self.get_queryset())
         return csv_report.get_csv_response(
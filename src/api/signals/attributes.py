@@ -1,7 +1,7 @@
 import logging
 
 from django.core.management import call_command
-from django.db.models.signals import post_delete, post_save
+from django.db.models.signals import m2m_changed, post_delete, post_save
 from django.dispatch import receiver
 
 from ..models import (
@@ -10,10 +10,12 @@ from ..models import (
     FishFamily,
     FishGenus,
     FishGrouping,
+    FishGroupingRelationship,
     FishSpecies,
     GrowthForm,
     Region,
 )
+from ..utils.fish_attribute_constants import invalidate_fish_attribute_constants
 from ..utils.q import submit_job
 from ..utils.reports import update_attributes_report
 
@@ -22,6 +24,12 @@ benthic_models = [BenthicAttribute, GrowthForm, Region]
 fish_models = [FishGrouping, FishFamily, FishGenus, FishSpecies, Region]
 
 
+def refresh_fish_attributes():
+    logger.info("refresh fish")
+    call_command("refresh_view", "mv_fish_attributes")
+    invalidate_fish_attribute_constants()
+
+
 @receiver(post_delete, sender=BenthicAttribute)
 @receiver(post_save, sender=BenthicAttribute)
 @receiver(post_delete, sender=FishFamily)
@@ -37,8 +45,7 @@ fish_models = [FishGrouping, FishFamily, FishGenus, FishSpecies, Region]
 @receiver(post_save, sender=GrowthForm)
 def refresh_attribute_views(sender, instance, **kwargs):
     if sender in fish_models:
-        logger.info("refresh fish")
-        call_command("refresh_view", "mv_fish_attributes")
+        refresh_fish_attributes()
 
     if sender in benthic_models:
         logger.info("refresh benthic")
@@ -49,3 +56,17 @@ def refresh_attribute_views(sender, instance, **kwargs):
         or instance.status == SUPERUSER_APPROVED
     ):
         submit_job(10, True, update_attributes_report)
+
+
+# Grouping constants are aggregated from the species of their attributes
+# and regions
+@receiver(post_delete, sender=FishGroupingRelationship)
+@receiver(post_save, sender=FishGroupingRelationship)
+def refresh_fish_grouping_attributes(sender, instance, **kwargs):
+    refresh_fish_attributes()
+
+
+@receiver(m2m_changed, sender=FishGrouping.regions.through)
+def refresh_fish_grouping_regions(sender, instance, action, **kwargs):
+    if action in ("post_add", "post_remove", "post_clear"):
+        refresh_fish_attributes()
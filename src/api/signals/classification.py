@@ -1,38 +1,17 @@
-import logging
-
 from django.db.models.signals import post_delete, post_save, pre_save
 from django.dispatch import receiver
 
 from ..models import Classifier, CollectRecord, Image
-from ..utils import classification as cls_utils
+from ..utils import classification as cls_utils, point_layouts
 from .submission import post_edit, post_submit
 
-logger = logging.getLogger(__name__)
-
 
 @receiver(pre_save, sender=Image)
 def pre_image_save(sender, instance, **kwargs):
     if not instance.created_on:
-        try:
-            cls_utils.check_if_valid_image(instance)
-
-            try:
-                cls_utils.store_exif(instance)
-            except Exception:
-                logger.exception("Error storing EXIF data")
-
-            instance.original_image_name = instance.image.name
-            image_name = f"{instance.id}.png"
-            instance.name = image_name
-            instance.image.name = image_name
-
-            cls_utils.save_normalized_imagefile(instance)
-            # original_* dimensions refer to width/height after correcting for orientation
-            # i.e. original width/height of the image taken with a 'camera on its side'
-            instance.original_image_width = instance.image.width
-            instance.original_image_height = instance.image.height
-        except Exception:
-            raise
+        instance.original_image_name = instance.image.name
+        instance.name = f"{instance.id}.png"
+        cls_utils.process_uploaded_image(instance)
 
     # Re-apply per-instance storage after normalization replaced file fields
     if instance.image_bucket:
@@ -63,6 +42,18 @@ def post_save_classification_image(sender, instance, created, **kwargs):
     if getattr(instance, "_is_copy", False):
         return
 
+    # New uploads: thumbnail and checksum were derived in pre_save from the
+    # decoded image, so store the thumbnail without reading the image back or
+    # saving the whole record again.
+    thumb_file = instance.__dict__.pop("_thumbnail_file", None)
+    if thumb_file is not None:
+        instance.__dict__.pop("_normalized_image_buf", None)
+        instance.thumbnail.save(thumb_file.name, thumb_file, save=False)
+        Image.objects.filter(pk=instance.pk).update(thumbnail=instance.thumbnail.name)
+        if instance.image_bucket:
+            instance._apply_storage()
+        return
+
     buf = getattr(instance, "_normalized_image_buf", None)
 
     if not instance.thumbnail:
@@ -102,7 +93,9 @@ def assign_classifier(sender, instance, **kwargs):
     classifier = Classifier.latest()
     if "classifier_id" not in instance.data and classifier:
         instance.data["classifier_id"] = str(classifier.id)
-        instance.data["quadrat_transect"]["num_points_per_quadrat"] = classifier.num_points
+        # Images are classified with the project's point layout, if it has one
+        layout_options = point_layouts.get_layout_options(instance.project, classifier.num_points)
+        instance.data["quadrat_transect"]["num_points_per_quadrat"] = layout_options["num_points"]
 
 
 @receiver(post_submit, sender=CollectRecord)
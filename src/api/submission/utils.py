@@ -1,8 +1,14 @@
 import json
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 
+from django.conf import settings
+from django.core import serializers
 from django.core.exceptions import ValidationError as DJValidationError
-from django.db import transaction
+from django.db import connection, connections, transaction
+from django.db.models import Q
 from django.utils import timezone
 from django.utils.translation import gettext_lazy
 from rest_framework.exceptions import ValidationError
@@ -18,13 +24,19 @@ from ..models import (
     HABITATCOMPLEXITY_PROTOCOL,
     MACROINVERTEBRATE_PROTOCOL,
     PROTOCOL_MAP,
+    ArchivedRecord,
     AuditRecord,
     CollectRecord,
+    Project,
+    ProjectProfile,
+    Revision,
 )
 from ..signals import post_submit
+from ..utils.dbutils import raw_delete
 from ..utils.sample_unit_methods import create_audit_record
 from ..utils.summary_cache import add_project_to_queue
 from .validations import (
+    ValidationLookups,
     ValidationRunner,
     belt_fish,
     belt_invert,
@@ -100,42 +112,50 @@ def format_exception_errors(err):
     return {identifier: [msg]}
 
 
+def _write(writer, collect_record):
+    try:
+        writer.write()
+    except (ValidationError, DJValidationError) as ve:
+        return VALIDATION_ERROR_STATUS, format_serializer_errors(ve)
+    except Exception as err:
+        logger.exception(f"write_collect_record: {collect_record.id}")
+        return ERROR_STATUS, format_exception_errors(err)
+    return SUCCESS_STATUS, None
+
+
 def write_collect_record(collect_record, request, dry_run=False):
-    status = None
-    result = None
-    context = {"request": request}
+    """
+    Write `collect_record` and delete it once written. A dry run only
+    validates the write in memory (see `BaseWriter`): nothing is written, so
+    it needs no savepoint to roll back and sends no signals.
+    """
+    context = {"request": request, "dry_run": dry_run}
     writer = get_writer(collect_record, context)
+    if dry_run is True:
+        return _write(writer, collect_record)
+
     with transaction.atomic():
         sid = transaction.savepoint()
-        try:
-            writer.write()
-            status = SUCCESS_STATUS
-        except (ValidationError, DJValidationError) as ve:
-            result = format_serializer_errors(ve)
-            status = VALIDATION_ERROR_STATUS
-        except Exception as err:
-            logger.exception("write_collect_record: {}".format(getattr(collect_record, "id")))
-            result = format_exception_errors(err)
-            status = ERROR_STATUS
-        finally:
-            if dry_run is True or status != SUCCESS_STATUS:
-                transaction.savepoint_rollback(sid)
-            else:
-                create_audit_record(
-                    request.user.profile, AuditRecord.SUBMIT_RECORD_EVENT_TYPE, collect_record
-                )
-                collect_record_id = collect_record.id
-                collect_record.delete()
-                transaction.savepoint_commit(sid)
-
-                collect_record.id = collect_record_id
-                post_submit.send(
-                    sender=collect_record.__class__,
-                    instance=collect_record,
-                )
+        status, result = _write(writer, collect_record)
+        if status != SUCCESS_STATUS:
+            transaction.savepoint_rollback(sid)
+            return status, result
+
+        create_audit_record(
+            request.user.profile, AuditRecord.SUBMIT_RECORD_EVENT_TYPE, collect_record
+        )
+        collect_record_id = collect_record.id
+        collect_record.delete()
+        transaction.savepoint_commit(sid)
+
+        collect_record.id = collect_record_id
+        post_submit.send(
+            sender=collect_record.__class__,
+            instance=collect_record,
+        )
 
-                add_project_to_queue(collect_record.project_id)
-        return status, result
+        add_project_to_queue(collect_record.project_id)
+    return status, result
 
 
 def validate(validator_cls, model_cls, qry_params=None):
@@ -168,12 +188,14 @@ def validate(validator_cls, model_cls, qry_params=None):
         )
 
 
-def _validate_collect_record(record, record_serializer, request):
+def _validate_collect_record(record, record_serializer, request, lookups=None, incremental=False):
     protocol = record.data.get("protocol")
     if protocol not in PROTOCOL_MAP:
         raise ValueError(gettext_lazy(f"{protocol} not supported"))
 
-    runner = ValidationRunner(serializer=record_serializer)
+    runner = ValidationRunner(
+        serializer=record_serializer, lookups=lookups, incremental=incremental
+    )
     if protocol == BENTHICLIT_PROTOCOL:
         runner.validate(record, benthic_lit.benthic_lit_validations, request=request)
     elif protocol == BENTHICPIT_PROTOCOL:
@@ -258,49 +280,270 @@ def validate_collect_record(profile, record, serializer_class, validation_suppre
     return dict(status=status, record=serialized_collect_record)
 
 
-def validate_collect_records(profile, record_ids, serializer_class, validation_suppressants=None):
+def _close_worker_connections(barrier):
+    # Every worker waits here until each of them has taken one of these tasks,
+    # so each worker closes its own connections
+    barrier.wait()
+    connections.close_all()
+
+
+def _validate_records(records, record_serializer, request, lookups, max_workers, incremental=False):
+    """
+    Validation outputs of `records`, in the same order. Records are validated
+    by a pool of `max_workers` threads unless called inside a transaction,
+    whose uncommitted changes other threads' connections can't see. Each
+    worker keeps its database connection until the pool is done.
+    """
+    if max_workers > 1 and len(records) > 1 and not connection.in_atomic_block:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            try:
+                return list(
+                    executor.map(
+                        partial(
+                            _validate_collect_record,
+                            record_serializer=record_serializer,
+                            request=request,
+                            lookups=lookups,
+                            incremental=incremental,
+                        ),
+                        records,
+                    )
+                )
+            finally:
+                barrier = threading.Barrier(max_workers)
+                list(executor.map(_close_worker_connections, [barrier] * max_workers))
+
+    return [
+        _validate_collect_record(record, record_serializer, request, lookups, incremental)
+        for record in records
+    ]
+
+
+def _validate_and_save(records, profile, serializer_class, max_workers=None, incremental=False):
+    """
+    Validate `records` together, sharing reference data fetched once for all
+    of them, and save the results with a single bulk update. Returns the
+    validation status of each record, keyed by pk. With `incremental`, only
+    validations whose inputs changed since the last validation are re-run.
+    """
+    request = MockRequest(profile=profile)
+    lookups = ValidationLookups()
+    lookups.prefetch(
+        [{"id": str(r.pk), "project": str(r.project_id), "data": r.data or {}} for r in records]
+    )
+
+    max_workers = max_workers or settings.VALIDATION_MAX_WORKERS
+    validation_outputs = _validate_records(
+        records, serializer_class, request, lookups, max_workers, incremental
+    )
+
+    validation_timestamp = timezone.now()
+    statuses = {}
+    for record, validation_output in zip(records, validation_outputs):
+        validation_output["last_validated"] = str(validation_timestamp)
+        status = validation_output["status"]
+        statuses[record.pk] = status
+
+        record.stage = CollectRecord.VALIDATED_STAGE if status == OK else CollectRecord.SAVED_STAGE
+        record.validations = validation_output
+        record.updated_on = validation_timestamp
+        record.updated_by = profile
+
+    # Using bulk_update so updated_on and validation_timestamp match
+    CollectRecord.objects.bulk_update(records, ["stage", "validations", "updated_on", "updated_by"])
+
+    return statuses
+
+
+def _get_collect_records(record_ids):
+    """Collect records of `record_ids` that exist, in `record_ids` order."""
+    record_order = {str(record_id).lower(): n for n, record_id in enumerate(record_ids)}
+    return sorted(
+        CollectRecord.objects.filter(id__in=record_ids),
+        key=lambda r: record_order.get(str(r.pk), len(record_order)),
+    )
+
+
+def validate_collect_records(
+    profile,
+    record_ids,
+    serializer_class,
+    validation_suppressants=None,
+    max_workers=None,
+    incremental=False,
+):
+    """
+    Validate many collect records in one pass: reference data used by the
+    validators is fetched once for all records and the results are saved with
+    a single bulk update. Output is in `record_ids` order.
+
+    With `incremental`, validators that declare the record paths they depend
+    on are only re-run when those values changed since the last validation;
+    their stored results, including ignored statuses, are kept otherwise.
+    """
     output = {}
     for record_id in record_ids:
         check_uuid(record_id)
 
-    records = CollectRecord.objects.filter(id__in=record_ids)
-    for record in records.iterator():
-        output[str(record.pk)] = validate_collect_record(
-            profile, record, serializer_class, validation_suppressants
+    if validation_suppressants:
+        print("validation_suppressants not supported")
+
+    records = _get_collect_records(record_ids)
+    if not records:
+        return output
+
+    statuses = _validate_and_save(records, profile, serializer_class, max_workers, incremental)
+
+    serialized_records = serializer_class(records, many=True).data
+    for record, serialized_collect_record in zip(records, serialized_records):
+        output[str(record.pk)] = dict(status=statuses[record.pk], record=serialized_collect_record)
+
+    return output
+
+
+def _sample_event_key(collect_record):
+    sample_event = (collect_record.data or {}).get("sample_event") or {}
+    return tuple(str(sample_event.get(k) or "") for k in ("site", "management", "sample_date"))
+
+
+def _archive_collect_records(collect_records):
+    records = json.loads(serializers.serialize("json", collect_records))
+    ArchivedRecord.objects.bulk_create(
+        ArchivedRecord(
+            app_label=collect_record._meta.app_label,
+            model=collect_record._meta.model_name,
+            record_pk=collect_record.pk,
+            project_pk=collect_record.project_id,
+            record=record,
+        )
+        for collect_record, record in zip(collect_records, records)
+    )
+
+
+def _delete_submitted_records(collect_records, profile):
+    """
+    Audit, archive and delete submitted collect records with one statement
+    each. The per-record delete signals are replaced by one revision per
+    owner's project profile and one update of each project.
+    """
+    if not collect_records:
+        return
+
+    AuditRecord.objects.bulk_create(
+        AuditRecord(
+            event_type=AuditRecord.SUBMIT_RECORD_EVENT_TYPE,
+            event_by=profile,
+            model=CollectRecord._meta.model_name,
+            record_id=collect_record.pk,
         )
+        for collect_record in collect_records
+    )
+    _archive_collect_records(collect_records)
+
+    raw_delete(CollectRecord.objects.filter(id__in=[cr.pk for cr in collect_records]))
+
+    owners = Q()
+    for profile_id, project_id in {(cr.profile_id, cr.project_id) for cr in collect_records}:
+        owners |= Q(profile_id=profile_id, project_id=project_id)
+    for project_profile in ProjectProfile.objects.filter(owners):
+        Revision.create_from_instance(project_profile)
+
+    for project in Project.objects.filter(id__in={cr.project_id for cr in collect_records}):
+        project.save()
+
+
+def write_collect_records(collect_records, request, batch_size=None):
+    """
+    Write many validated collect records and delete them once written.
+
+    Records are grouped by sample event, and writers share the sample events
+    and transects they get or create. Each batch of `batch_size` records is
+    written in one transaction, with a savepoint per record so a failing
+    record doesn't affect the others. Written records are audited, archived
+    and deleted in bulk. The summaries of their projects are queued once at
+    the end. Returns (status, result) for each record, keyed by pk.
+    """
+    batch_size = batch_size or settings.SUBMIT_BATCH_SIZE
+    profile = request.user.profile
+    context = {"request": request, "instances": {}}
+    collect_records = sorted(collect_records, key=_sample_event_key)
+
+    output = {}
+    project_ids = set()
+    for n in range(0, len(collect_records), batch_size):
+        submitted = []
+        with transaction.atomic():
+            for collect_record in collect_records[n : n + batch_size]:
+                writer = get_writer(collect_record, context)
+                sid = transaction.savepoint()
+                status, result = _write(writer, collect_record)
+                if status == SUCCESS_STATUS:
+                    transaction.savepoint_commit(sid)
+                    submitted.append(collect_record)
+                else:
+                    transaction.savepoint_rollback(sid)
+                    # Instances created under the rolled back savepoint are gone
+                    context["instances"].clear()
+                output[collect_record.pk] = status, result
+
+            _delete_submitted_records(submitted, profile)
+
+            for collect_record in submitted:
+                post_submit.send(sender=collect_record.__class__, instance=collect_record)
+
+        project_ids.update(cr.project_id for cr in submitted)
+
+    for project_id in project_ids:
+        add_project_to_queue(project_id)
 
     return output
 
 
 def submit_collect_records(profile, record_ids, serializer_class, validation_suppressants=None):
+    """
+    Validate collect records together and submit the valid ones with
+    `write_collect_records`. Output is keyed by the ids in `record_ids`.
+    Records that repeat the sample unit of an earlier record in `record_ids`
+    fail validation, so only the first of them is written.
+    """
     output = {}
     request = MockRequest(profile=profile)
+    if validation_suppressants:
+        print("validation_suppressants not supported")
+
+    records = _get_collect_records(record_ids)
+    found_ids = {str(record.pk) for record in records}
     for record_id in record_ids:
-        collect_record = CollectRecord.objects.get_or_none(id=record_id)
-        if collect_record is None:
+        if str(record_id).lower() not in found_ids:
             output[record_id] = dict(status=ERROR, message=gettext_lazy("Not found"))
-            continue
 
-        validation_output = validate_collect_record(
-            profile, collect_record, serializer_class, validation_suppressants
-        )
-        status = validation_output["status"]
+    if not records:
+        return output
 
-        if status != OK:
-            output[record_id] = validation_output
-            continue
+    record_ids = {str(record_id).lower(): record_id for record_id in record_ids}
+    statuses = _validate_and_save(records, profile, serializer_class)
+
+    invalid_records = [record for record in records if statuses[record.pk] != OK]
+    serialized_records = serializer_class(invalid_records, many=True).data
+    for record, serialized_collect_record in zip(invalid_records, serialized_records):
+        output[record_ids[str(record.pk)]] = dict(
+            status=statuses[record.pk], record=serialized_collect_record
+        )
 
-        # If validate comes out all good (status == OK) then
-        # try parsing and saving the collect record into its
-        # components.
-        status, result = write_collect_record(collect_record, request)
+    # If validate comes out all good (status == OK) then
+    # try parsing and saving the collect record into its
+    # components.
+    valid_records = [record for record in records if statuses[record.pk] == OK]
+    write_output = write_collect_records(valid_records, request)
+    for record in valid_records:
+        record_id = record_ids[str(record.pk)]
+        status, result = write_output[record.pk]
         if status == VALIDATION_ERROR_STATUS:
             output[record_id] = dict(status=ERROR, message=result)
-            continue
         elif status == ERROR_STATUS:
-            logger.error(json.dumps(dict(id=record_id, data=collect_record.data)), result)
+            logger.error(json.dumps(dict(id=record_id, data=record.data)), result)
             output[record_id] = dict(status=ERROR, message=gettext_lazy("System failure"))
-            continue
-        output[record_id] = dict(status=OK, message=gettext_lazy("Success"))
+        else:
+            output[record_id] = dict(status=OK, message=gettext_lazy("Success"))
 
     return output
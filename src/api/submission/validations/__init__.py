@@ -1,3 +1,4 @@
 # flake8: noqa
 from .base import Validation, ValidationRunner
+from .lookups import ValidationLookups
 from .statuses import ERROR, IGNORE, OK, STALE, WARN
@@ -1,9 +1,11 @@
 import hashlib
+import json
 from dataclasses import dataclass
 from typing import List, Literal, Union
 
 from dotty_dict import dotty
 
+from .lookups import ValidationLookups
 from .statuses import ERROR, IGNORE, OK, WARN
 from .validators import BaseValidator, ValidatorResult
 
@@ -35,6 +37,10 @@ class Validation:
     delay_validation: bool = False  # Only run if there are no errors from other validations.
 
     def _get_validation_id(self):
+        # Validations are module level and reused for every record
+        if getattr(self, "_validation_id", None) is not None:
+            return self._validation_id
+
         parts = [
             self.validator.name,
             "+".join(self.paths),
@@ -43,7 +49,8 @@ class Validation:
         ]
         key = "::".join(parts)
         md5_val = hashlib.md5(key.encode("utf-8"))
-        return str(md5_val.hexdigest())
+        self._validation_id = str(md5_val.hexdigest())
+        return self._validation_id
 
     def _assign_validation_id(self, result: Union[ValidatorResult, List[ValidatorResult]]):
         if isinstance(result, list):
@@ -52,10 +59,64 @@ class Validation:
         else:
             result.validation_id = self._get_validation_id()
 
+    def get_fingerprint(self, collect_record: dict, version: str = ""):
+        """
+        Hash of the collect record values the validator depends on, the
+        validator's version and parameters and the runner `version`, or None
+        if it has to be re-run every time.
+        """
+        paths = self.validator.depends_on
+        if paths is None:
+            return None
+
+        data = dotty(collect_record)
+        values = [
+            self._get_validation_id(),
+            version,
+            self.validator.VERSION,
+            self.validator.parameters,
+        ]
+        for path in paths:
+            try:
+                values.append(data.get(path))
+            except (TypeError, KeyError):
+                values.append(None)
+        key = json.dumps(values, sort_keys=True, default=str)
+        return str(hashlib.md5(key.encode("utf-8")).hexdigest())
+
+    def _from_validation_result(self, o):
+        result = ValidatorResult.from_dict(o)
+        result.validation_id = self._get_validation_id()
+        return result
+
+    def from_validation_result(self, existing_results):
+        """
+        Results of this validation in `existing_results`, the stored results
+        under its key, or None if they are incomplete.
+        """
+        validation_id = self._get_validation_id()
+        try:
+            if self.validation_type == LIST_VALIDATION_TYPE:
+                results = []
+                for row in existing_results or []:
+                    matches = [o for o in row if o.get("validation_id") == validation_id]
+                    if not matches:
+                        return None
+                    results.append(self._from_validation_result(matches[0]))
+                return results
+
+            for o in existing_results or []:
+                if o.get("validation_id") == validation_id:
+                    return self._from_validation_result(o)
+        except (AttributeError, KeyError, TypeError, ValueError):
+            pass
+        return None
+
     def run(self, *args, **kwargs):
         result = self.validator(*args, **kwargs)
         self._assign_validation_id(result)
         self.result = result
+        return result
 
     def _to_validation_result(self, result):
         o = result.to_dict()
@@ -70,11 +131,12 @@ class Validation:
             output.append(o)
         return output
 
-    def to_validation_result(self):
-        if isinstance(self.result, ValidatorResult):
-            return self._to_validation_result(self.result)
-        elif isinstance(self.result, list):
-            return self._to_validation_list_result(self.result)
+    def to_validation_result(self, result=None):
+        result = self.result if result is None else result
+        if isinstance(result, ValidatorResult):
+            return self._to_validation_result(result)
+        elif isinstance(result, list):
+            return self._to_validation_list_result(result)
         raise TypeError("Invalid ValidatorResult")
 
 
@@ -83,8 +145,13 @@ class ValidationRunner:
     results = None
     status = OK
 
-    def __init__(self, serializer):
+    def __init__(self, serializer, lookups=None, incremental=False):
         self.serializer = serializer
+        self.lookups = lookups
+        # Reuse the stored results of validations whose inputs are unchanged
+        self.incremental = incremental
+        self.fingerprints = {}
+        self.previous_fingerprints = {}
 
     def _get_dotty_value(self, data, key):
         try:
@@ -124,11 +191,16 @@ class ValidationRunner:
             self.results[key][n].append(res)
         return self._get_overall_status_level(statuses)
 
-    def set_validator_result(self, validation: Validation, existing_validations: dict):
+    def set_validator_result(
+        self,
+        validation: Validation,
+        existing_validations: dict,
+        validator_result: Union[ValidatorResult, List[ValidatorResult], None] = None,
+    ):
         status = OK
 
         self.results = self.results or dotty()
-        result = validation.to_validation_result()
+        result = validation.to_validation_result(validator_result)
         validation_level = validation.validation_level
 
         if validation_level not in LEVELS:
@@ -161,22 +233,46 @@ class ValidationRunner:
 
         return OK
 
+    def _get_previous_result(self, validation, fingerprint, existing_validations):
+        if (
+            self.incremental is False
+            or fingerprint is None
+            or self.previous_fingerprints.get(validation._get_validation_id()) != fingerprint
+        ):
+            return None
+
+        key = RECORD_KEY if validation.validation_level == RECORD_LEVEL else validation.paths[0]
+        return validation.from_validation_result(self._get_dotty_value(existing_validations, key))
+
     def _validate(
         self, validation, collect_record, collect_record_dict, request, existing_validations
     ):
-        if validation.requires_instance is True:
-            validation.run(collect_record, request=request)
-        else:
-            validation.run(collect_record_dict, request=request)
-        return self.set_validator_result(validation, existing_validations)
+        fingerprint = validation.get_fingerprint(collect_record_dict, self.VERSION)
+        result = self._get_previous_result(validation, fingerprint, existing_validations)
+        if result is None:
+            # Use the returned result, validations are shared by runners in other threads
+            if validation.requires_instance is True:
+                result = validation.run(collect_record, request=request, lookups=self.lookups)
+            else:
+                result = validation.run(collect_record_dict, request=request, lookups=self.lookups)
+
+        if fingerprint is not None:
+            self.fingerprints[validation._get_validation_id()] = fingerprint
+        return self.set_validator_result(validation, existing_validations, result)
 
     def validate(self, collect_record, validations, request):
         delayed_validations = []
         statuses = []
         collect_record_dict = self.serializer(instance=collect_record).data
+        if self.lookups is None:
+            self.lookups = ValidationLookups()
+        self.lookups.prefetch([collect_record_dict])
         existing_validations = (
             self._get_dotty_value(dotty(collect_record_dict), "validations.results") or dotty()
         )
+        self.previous_fingerprints = (
+            self._get_dotty_value(dotty(collect_record_dict), "validations.fingerprints") or {}
+        )
         for validation in validations:
             if validation.delay_validation:
                 delayed_validations.append(validation)
@@ -210,4 +306,5 @@ class ValidationRunner:
             "version": self.VERSION,
             "status": self.status,
             "results": self.results.to_dict(),
+            "fingerprints": self.fingerprints,
         }
@@ -0,0 +1,218 @@
+"""
+Reference data shared by the validators of a validation run.
+
+`ValidationRunner` builds one `ValidationLookups` per run, prefetches the
+sites, managements, projects and widths referenced by the records being
+validated and passes it to every validator as the `lookups` keyword
+argument. Anything not prefetched is fetched on first use and cached for the
+rest of the run. Per-record queries that can be answered for many records at
+once go through `batched`, so a run issues them once, and records of the
+run are compared with each other through `earlier_duplicate`. Fish attribute
+constants are cached per process instead (`api.utils.fish_attribute_constants`).
+"""
+
+import uuid
+
+from django.db.models import Q
+from django.utils.dateparse import parse_date
+
+from ...models import (
+    BeltTransectWidth,
+    FishSize,
+    Management,
+    Project,
+    Region,
+    SampleEvent,
+    Site,
+)
+
+SITE_PATH = "data.sample_event.site"
+MANAGEMENT_PATH = "data.sample_event.management"
+SAMPLE_DATE_PATH = "data.sample_event.sample_date"
+PROJECT_PATH = "project"
+WIDTH_PATHS = ("data.fishbelt_transect.width", "data.belt_transect.width")
+
+
+def _to_key(pk):
+    try:
+        return str(uuid.UUID(str(pk)))
+    except (ValueError, TypeError, AttributeError):
+        return None
+
+
+def _get_path_value(record, path):
+    value = record
+    for key in path.split("."):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(key)
+    return value
+
+
+class ModelLookup:
+    """Model instances by id, fetched in bulk and cached for the run."""
+
+    def __init__(self, queryset):
+        self.queryset = queryset
+        self._cache = {}
+
+    def prefetch(self, ids):
+        ids = {_to_key(pk) for pk in ids} - {None} - self._cache.keys()
+        if not ids:
+            return
+
+        found = {str(obj.pk): obj for obj in self.queryset.filter(pk__in=ids)}
+        for pk in ids:
+            self._cache[pk] = found.get(pk)
+
+    def get(self, pk):
+        pk = _to_key(pk)
+        if pk is None:
+            return None
+        if pk not in self._cache:
+            self.prefetch([pk])
+        return self._cache[pk]
+
+    def get_many(self, ids):
+        """Instances of `ids` that exist, keyed by id string."""
+        self.prefetch(ids)
+        instances = {}
+        for pk in ids:
+            instance = self.get(pk)
+            if instance is not None:
+                instances[str(pk)] = instance
+        return instances
+
+
+class ValidationLookups:
+    def __init__(self):
+        self.projects = ModelLookup(Project.objects.all())
+        self.sites = ModelLookup(Site.objects.all())
+        self.managements = ModelLookup(Management.objects.all())
+        self.belt_transect_widths = ModelLookup(
+            BeltTransectWidth.objects.prefetch_related("conditions")
+        )
+        self._fish_sizes = {}
+        self._site_regions = {}
+        self._sample_events = {}
+        self._results = {}
+        self.records = []
+
+    def prefetch(self, records):
+        """Fetch the reference data used by `records` (serialized collect records)."""
+        self.records.extend(records)
+        self.projects.prefetch(_get_path_value(r, PROJECT_PATH) for r in records)
+        self.sites.prefetch(_get_path_value(r, SITE_PATH) for r in records)
+        self.managements.prefetch(_get_path_value(r, MANAGEMENT_PATH) for r in records)
+        self.belt_transect_widths.prefetch(
+            _get_path_value(r, path) for r in records for path in WIDTH_PATHS
+        )
+
+        self.prefetch_sample_events(
+            (
+                _get_path_value(r, SITE_PATH),
+                _get_path_value(r, MANAGEMENT_PATH),
+                _get_path_value(r, SAMPLE_DATE_PATH),
+            )
+            for r in records
+        )
+
+    def _sample_event_key(self, site_id, management_id, sample_date):
+        site_id = _to_key(site_id)
+        management_id = _to_key(management_id)
+        try:
+            sample_date = parse_date(sample_date) if isinstance(sample_date, str) else None
+        except ValueError:
+            sample_date = None
+        if site_id is None or management_id is None or sample_date is None:
+            return None
+        return site_id, management_id, sample_date
+
+    def prefetch_sample_events(self, keys):
+        keys = {self._sample_event_key(*k) for k in keys} - {None} - self._sample_events.keys()
+        if not keys:
+            return
+
+        qry = Q()
+        for site_id, management_id, sample_date in keys:
+            qry |= Q(site_id=site_id, management_id=management_id, sample_date=sample_date)
+
+        for key in keys:
+            self._sample_events[key] = None
+        for sample_event in SampleEvent.objects.filter(qry):
+            key = (
+                str(sample_event.site_id),
+                str(sample_event.management_id),
+                sample_event.sample_date,
+            )
+            if self._sample_events[key] is None:
+                self._sample_events[key] = sample_event
+
+    def sample_event(self, site_id, management_id, sample_date):
+        key = self._sample_event_key(site_id, management_id, sample_date)
+        if key is None:
+            return None
+        if key not in self._sample_events:
+            self.prefetch_sample_events([key])
+        return self._sample_events[key]
+
+    def fish_sizes(self, size_bin_id):
+        size_bin_id = _to_key(size_bin_id)
+        if size_bin_id is None:
+            return []
+        if size_bin_id not in self._fish_sizes:
+            self._fish_sizes[size_bin_id] = list(
+                FishSize.objects.filter(fish_bin_size_id=size_bin_id)
+            )
+        return self._fish_sizes[size_bin_id]
+
+    def site_region_id(self, site):
+        """Id of the first region intersecting the site location, or None."""
+        if site.pk not in self._site_regions:
+            region = Region.objects.filter(geom__intersects=site.location).first()
+            self._site_regions[site.pk] = str(region.pk) if region else None
+        return self._site_regions[site.pk]
+
+    def cached(self, key, func):
+        """Result of `func()`, computed once per run for `key`."""
+        if key not in self._results:
+            self._results[key] = func()
+        return self._results[key]
+
+    def earlier_duplicate(self, key, record, get_key):
+        """
+        Id of the first record of the run that comes before `record` and has
+        the same `get_key(record)`, or None. Records with a None key, or that
+        aren't part of the run, have no duplicates.
+        """
+        first_ids, run_ids = self.cached(key, lambda: self._first_record_ids(get_key))
+        record_id = str(record.get("id"))
+        record_key = get_key(record)
+        if record_key is None or record_id not in run_ids:
+            return None
+
+        first_id = first_ids.get(record_key)
+        return first_id if first_id != record_id else None
+
+    def _first_record_ids(self, get_key):
+        first_ids = {}
+        run_ids = set()
+        for record in self.records:
+            record_id = str(record.get("id"))
+            run_ids.add(record_id)
+            record_key = get_key(record)
+            if record_key is not None:
+                first_ids.setdefault(record_key, record_id)
+        return first_ids, run_ids
+
+    def batched(self, key, item, func, get_items):
+        """
+        Result for `item` of `func`, which takes a set of items and returns
+        results keyed by item. On first use `func` is called once for the
+        items of all records of the run (`get_items(records)`); items added
+        later are computed on their own.
+        """
+        results = self.cached(key, lambda: dict(func({item, *get_items(self.records)})))
+        if item not in results:
+            results.update(func({item}))
+        return results[item]
@@ -1,3 +1,6 @@
+from uuid import UUID
+
+from django.utils.dateparse import parse_date
 from rest_framework.exceptions import ParseError
 
 from ...exceptions import check_uuid
@@ -39,3 +42,41 @@ def valid_id(uuid):
     except ParseError:
         return None
     return uuid
+
+
+def normalized_id(uuid):
+    """Canonical string form of `uuid`, or None if it isn't a valid uuid."""
+    uuid = valid_id(uuid)
+    if uuid is None:
+        return None
+    return str(UUID(str(uuid)))
+
+
+def _normalized_value(value):
+    if value is None:
+        return None
+    value_id = normalized_id(value)
+    if value_id is not None:
+        return value_id
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        pass
+    try:
+        date = parse_date(str(value))
+    except ValueError:
+        date = None
+    return str(date) if date else str(value).strip()
+
+
+def sample_unit_key(protocol, query_args, profiles):
+    """
+    Hashable key of a sample unit from the query arguments and observer
+    profiles used to look up its duplicates, comparing ids, numbers and dates
+    by value.
+    """
+    return (
+        protocol,
+        tuple((name, _normalized_value(value)) for name, value in sorted(query_args.items())),
+        tuple(sorted(_normalized_value(profile) for profile in profiles)),
+    )
@@ -4,6 +4,7 @@ from typing import Literal, Optional, Tuple, Union
 
 from dotty_dict import dotty
 
+from api.submission.validations.lookups import ValidationLookups
 from api.submission.validations.statuses import ERROR, IGNORE, OK, STALE, WARN
 
 STATUSES: Tuple[str] = (ERROR, IGNORE, OK, WARN, STALE)
@@ -95,6 +96,9 @@ def validate_list(func):
 
 
 class BaseValidator:
+    # Bump when the validator's logic or class level thresholds change, so
+    # incremental validation doesn't reuse results stored by the old version
+    VERSION = "1"
     result = None
 
     def __init__(self, **kwargs):
@@ -113,6 +117,25 @@ class BaseValidator:
 
         return name
 
+    @property
+    def depends_on(self):
+        """
+        Dotty paths of the collect record the result depends on, or None when
+        it also depends on data outside the record (database, other records)
+        and has to be re-run every time.
+        """
+        return None
+
+    @property
+    def parameters(self):
+        """Constructor parameters, which the result depends on as much as on `depends_on`."""
+        return {k: v for k, v in vars(self).items() if not k.startswith("_")}
+
+    def get_lookups(self, kwargs):
+        """Lookups shared by the validation run, or new ones when run on its own."""
+        lookups = kwargs.get("lookups")
+        return lookups if lookups is not None else ValidationLookups()
+
     @validator_result
     def skip(self, context=None):
         return OK, None, context
@@ -6,6 +6,7 @@ from rest_framework.exceptions import ParseError
 from ....exceptions import check_uuid
 from ....models import BenthicTransect
 from ....utils import cast_float, get_related_transect_methods
+from ..utils import sample_unit_key
 from ..statuses import ERROR, OK
 from .base import BaseValidator, validator_result
 
@@ -78,6 +79,13 @@ class UniqueBenthicTransectValidator(BaseValidator):
                 )
         return OK
 
+    def _get_sample_unit_key(self, collect_record):
+        try:
+            qry, profiles = self._get_query_args(collect_record)
+        except ParseError:
+            return None
+        return sample_unit_key(self.get_value(collect_record, self.protocol_path), qry, profiles)
+
     @validator_result
     def __call__(self, collect_record, **kwargs):
         protocol = self.get_value(collect_record, self.protocol_path)
@@ -87,6 +95,17 @@ class UniqueBenthicTransectValidator(BaseValidator):
         except ParseError:
             return ERROR, self.INVALID_DATA
 
+        # Records validated together are compared with each other too
+        duplicate_id = self.get_lookups(kwargs).earlier_duplicate(
+            self, collect_record, self._get_sample_unit_key
+        )
+        if duplicate_id is not None:
+            return (
+                ERROR,
+                self.DUPLICATE_BENTHIC_TRANSECT,
+                {"duplicate_collect_record": duplicate_id},
+            )
+
         queryset = BenthicTransect.objects.select_related().filter(**qry)
 
         for profile in profiles:
@@ -117,6 +136,10 @@ class BenthicIntervalObservationCountValidator(BaseValidator):
         self.observations_path = observations_path
         super().__init__(**kwargs)
 
+    @property
+    def depends_on(self):
+        return [self.len_surveyed_path, self.interval_size_path, self.observations_path]
+
     @validator_result
     def __call__(self, collect_record, **kwargs):
         tolerance = 1
@@ -165,6 +188,15 @@ class IntervalSequenceValidator(BaseValidator):
         self.observation_interval_path = observation_interval_path
         super().__init__(**kwargs)
 
+    @property
+    def depends_on(self):
+        return [
+            self.len_surveyed_path,
+            self.interval_size_path,
+            self.interval_start_path,
+            self.observations_path,
+        ]
+
     @validator_result
     def __call__(self, collect_record, **kwargs):
         len_surveyed = cast_float(self.get_value(collect_record, self.len_surveyed_path))
@@ -232,6 +264,10 @@ class IntervalAlignmentValidator(BaseValidator):
         self.observation_interval_path = observation_interval_path
         super().__init__(**kwargs)
 
+    @property
+    def depends_on(self):
+        return [self.interval_size_path, self.interval_start_path, self.observations_path]
+
     @validator_result
     def __call__(self, collect_record, **kwargs):
         interval_size = cast_float(self.get_value(collect_record, self.interval_size_path))
@@ -1,8 +1,5 @@
-from rest_framework.exceptions import ParseError
-
-from ....exceptions import check_uuid
-from ....models import BeltTransectWidth, FishAttribute
 from ....utils import calc_biomass_density, cast_float, cast_int
+from ....utils.fish_attribute_constants import get_fish_attribute_constants
 from .base import OK, WARN, BaseValidator, validator_result
 
 
@@ -52,8 +49,8 @@ class BiomassValidator(BaseValidator):
             o.get("fish_attribute") for o in observations if o.get("fish_attribute") is not None
         ]
         return {
-            str(fa.id): fa.get_biomass_constants()
-            for fa in FishAttribute.objects.filter(id__in=fishattribute_ids)
+            fa_id: constants.biomass_constants
+            for fa_id, constants in get_fish_attribute_constants(fishattribute_ids).items()
         }
 
     def _calc_biomass(self, observation, width, len_surveyed, fish_attr_lookup):
@@ -72,12 +69,8 @@ class BiomassValidator(BaseValidator):
     def __call__(self, collect_record, **kwargs):
         observations = self.get_value(collect_record, self.observations_path) or []
         len_surveyed = cast_float(self.get_value(collect_record, self.len_surveyed_path))
-        width_id = self.get_value(collect_record, self.width_path)
-        try:
-            _ = check_uuid(width_id)
-            width = BeltTransectWidth.objects.get(id=width_id)
-        except (BeltTransectWidth.DoesNotExist, ParseError):
-            width = None
+        lookups = self.get_lookups(kwargs)
+        width = lookups.belt_transect_widths.get(self.get_value(collect_record, self.width_path))
 
         fish_attr_lookup = self._get_fish_attribute_lookup(observations)
 
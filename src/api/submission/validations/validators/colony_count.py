@@ -29,6 +29,10 @@ class ColonyCountValidator(BaseValidator):
 
         super().__init__(**kwargs)
 
+    @property
+    def depends_on(self):
+        return [self.obs_colonies_bleached_path]
+
     def _get_colony_counts(self, obs):
         return safe_sum(
             *[
@@ -14,6 +14,10 @@ class DepthValidator(BaseValidator):
         self.depth_path = depth_path
         super().__init__(**kwargs)
 
+    @property
+    def depends_on(self):
+        return [self.depth_path]
+
     @validator_result
     def __call__(self, collect_record, **kwargs):
         depth = self.get_numeric_value(collect_record, self.depth_path)
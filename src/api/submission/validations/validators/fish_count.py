@@ -10,6 +10,10 @@ class FishCountValidator(BaseValidator):
         self.observation_count_path = observation_count_path
         super().__init__(**kwargs)
 
+    @property
+    def depends_on(self):
+        return [self.observations_path]
+
     @validator_result
     def check_fish_count(self, obs):
         status = OK
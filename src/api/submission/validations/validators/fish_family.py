@@ -1,7 +1,4 @@
-from rest_framework.exceptions import ParseError
-
-from ....exceptions import check_uuid
-from ....models import FishAttributeView, Project
+from ....utils.fish_attribute_constants import get_fish_attribute_constants
 from .base import OK, WARN, BaseValidator, validator_result
 
 
@@ -30,13 +27,8 @@ class FishFamilySubsetValidator(BaseValidator):
 
     def __call__(self, collect_record, **kwargs):
         observations = self.get_value(collect_record, self.observations_path) or []
-        project_id = self.get_value(collect_record, self.project_path)
-
-        try:
-            check_uuid(project_id)
-            project = Project.objects.get_or_none(id=project_id)
-        except ParseError:
-            project = None
+        lookups = self.get_lookups(kwargs)
+        project = lookups.projects.get(self.get_value(collect_record, self.project_path))
 
         if project is None:
             return self._get_ok(observations)
@@ -51,8 +43,8 @@ class FishFamilySubsetValidator(BaseValidator):
             ob.get("fish_attribute") for ob in observations if ob.get("fish_attribute")
         }
         fish_family_lookup = {
-            str(fa.id): str(fa.id_family)
-            for fa in FishAttributeView.objects.filter(id__in=fish_attribute_ids)
+            fa_id: str(constants.family_id)
+            for fa_id, constants in get_fish_attribute_constants(fish_attribute_ids).items()
         }
 
         return [
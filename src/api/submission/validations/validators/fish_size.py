@@ -1,4 +1,4 @@
-from ....models import FishAttribute, FishSize
+from ....utils.fish_attribute_constants import get_fish_attribute_constants
 from .base import ERROR, OK, WARN, BaseValidator, validator_result
 
 
@@ -59,14 +59,15 @@ class FishSizeValidator(BaseValidator):
 
     def __call__(self, collect_record, **kwargs):
         observations = self.get_value(collect_record, self.observations_path) or []
+        lookups = self.get_lookups(kwargs)
         fish_attribute_ids = list(
             {o.get(self.observation_fish_attribute_path) for o in observations}
         )
         max_fish_length_lookup = {
-            str(fa.pk): fa.get_max_length()
-            for fa in FishAttribute.objects.filter(
-                id__in=[fai for fai in fish_attribute_ids if fai]
-            )
+            fa_id: constants.max_length
+            for fa_id, constants in get_fish_attribute_constants(
+                [fai for fai in fish_attribute_ids if fai]
+            ).items()
         }
 
         # Pre-fetch FishSize records for the size bin if available
@@ -74,7 +75,7 @@ class FishSizeValidator(BaseValidator):
         if self.fishbelt_transect_path:
             size_bin_id = self.get_value(collect_record, f"{self.fishbelt_transect_path}.size_bin")
             if size_bin_id:
-                fish_size_bins = list(FishSize.objects.filter(fish_bin_size_id=size_bin_id))
+                fish_size_bins = lookups.fish_sizes(size_bin_id)
 
         return [
             self.check_fish_size(ob, max_fish_length_lookup, fish_size_bins) for ob in observations
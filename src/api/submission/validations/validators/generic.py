@@ -11,6 +11,10 @@ class RequiredValidator(BaseValidator):
         self.path = path
         super().__init__(**kwargs)
 
+    @property
+    def depends_on(self):
+        return [self.path]
+
     @validator_result
     def __call__(self, collect_record, **kwargs):
         val = self.get_value(collect_record, self.path)
@@ -29,6 +33,10 @@ class ListRequiredValidator(BaseValidator):
         self.unique_identifier_key = kwargs.get("unique_identifier_key") or "id"
         super().__init__(**kwargs)
 
+    @property
+    def depends_on(self):
+        return [self.list_path]
+
     @validate_list
     def __call__(self, collect_record, **kwargs):
         records = self.get_value(collect_record, self.list_path)
@@ -44,6 +52,10 @@ class AllEqualValidator(BaseValidator):
         self.ignore_keys = ignore_keys
         super().__init__(**kwargs)
 
+    @property
+    def depends_on(self):
+        return [self.path]
+
     def _to_json(self, d):
         self.ignore_keys = self.ignore_keys or []
         return json.dumps({k: v for k, v in d.items() if k not in self.ignore_keys}, sort_keys=True)
@@ -75,6 +87,10 @@ class DuplicateValidator(BaseValidator):
         self.unique_identifier_key = kwargs.get("unique_identifier_key") or "id"
         super().__init__(**kwargs)
 
+    @property
+    def depends_on(self):
+        return [self.list_path]
+
     @validator_result
     def __call__(self, collect_record, **kwargs):
         records = self.get_value(collect_record, self.list_path)
@@ -104,6 +120,10 @@ class PositiveIntegerValidator(BaseValidator):
         self.key_path = key_path
         super().__init__(**kwargs)
 
+    @property
+    def depends_on(self):
+        return [self.key_path]
+
     @validator_result
     def __call__(self, collect_record, **kwargs):
         val = self.get_value(collect_record, self.key_path)
@@ -123,6 +143,10 @@ class ListPositiveIntegerValidator(BaseValidator):
 
         super().__init__(**kwargs)
 
+    @property
+    def depends_on(self):
+        return [self.list_path]
+
     @validate_list
     def __call__(self, collect_record, **kwargs):
         records = self.get_value(collect_record, self.list_path)
@@ -10,6 +10,10 @@ class IntervalSizeValidator(BaseValidator):
         self.interval_size_path = interval_size_path
         super().__init__(**kwargs)
 
+    @property
+    def depends_on(self):
+        return [self.interval_size_path]
+
     @validator_result
     def __call__(self, collect_record, **kwargs):
         interval_size = self.get_numeric_value(collect_record, self.interval_size_path)
@@ -10,6 +10,10 @@ class IntervalStartValidator(BaseValidator):
         self.interval_start_path = interval_start_path
         super().__init__(**kwargs)
 
+    @property
+    def depends_on(self):
+        return [self.interval_start_path]
+
     @validator_result
     def __call__(self, collect_record, **kwargs):
         interval_start = self.get_numeric_value(collect_record, self.interval_start_path)
@@ -9,6 +9,10 @@ class InvertAllObsExcludedValidator(BaseValidator):
         self.observations_path = observations_path
         super().__init__(**kwargs)
 
+    @property
+    def depends_on(self):
+        return [self.observations_path]
+
     @validator_result
     def __call__(self, collect_record, **kwargs):
         observations = self.get_value(collect_record, self.observations_path) or []
@@ -29,6 +33,10 @@ class InvertCountValidator(BaseValidator):
         self.observation_count_path = observation_count_path
         super().__init__(**kwargs)
 
+    @property
+    def depends_on(self):
+        return [self.observations_path]
+
     @validator_result
     def check_invert_count(self, obs):
         context = {"observation_id": obs.get("id")}
@@ -56,6 +64,10 @@ class InvertObsCountHighValidator(BaseValidator):
         self.observation_count_path = observation_count_path
         super().__init__(**kwargs)
 
+    @property
+    def depends_on(self):
+        return [self.observations_path]
+
     @validator_result
     def check_count_high(self, obs):
         context = {"observation_id": obs.get("id")}
@@ -86,6 +98,10 @@ class InvertSizeBinRequiredValidator(BaseValidator):
         self.size_bin_path = size_bin_path
         super().__init__(**kwargs)
 
+    @property
+    def depends_on(self):
+        return [self.observations_path, self.size_bin_path]
+
     @validator_result
     def check_size_bin(self, obs, size_bin):
         context = {"observation_id": obs.get("id")}
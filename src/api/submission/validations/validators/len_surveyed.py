@@ -12,6 +12,10 @@ class LenSurveyedValidator(BaseValidator):
         self.len_surveyed_path = len_surveyed_path
         super().__init__(**kwargs)
 
+    @property
+    def depends_on(self):
+        return [self.len_surveyed_path]
+
     @validator_result
     def __call__(self, collect_record, **kwargs):
         try:
@@ -1,10 +1,18 @@
-from rest_framework.exceptions import ParseError
+from django.db import connection
 
-from ....exceptions import check_uuid
-from ....models import Management, Site
 from ..statuses import ERROR, OK, WARN
+from ..utils import normalized_id, valid_id
 from .base import BaseValidator, validator_result
 
+HAS_SAMPLE_UNITS_SQL = """(
+    EXISTS (SELECT 1 FROM transect_benthic tbs WHERE tbs.sample_event_id = ses.id)
+    OR EXISTS (SELECT 1 FROM transect_belt_fish tbfs WHERE tbfs.sample_event_id = ses.id)
+    OR EXISTS (SELECT 1 FROM quadrat_collection qcs WHERE qcs.sample_event_id = ses.id)
+    OR EXISTS (SELECT 1 FROM quadrat_transect qts WHERE qts.sample_event_id = ses.id)
+)"""
+
+NORMALIZED_NAME_SQL = "LOWER(REPLACE(REPLACE(REPLACE({name}, ' ', ''), '_', ''), '-', ''))"
+
 
 class UniqueManagementValidator(BaseValidator):
     MANAGEMENT_NOT_FOUND = "management_not_found"
@@ -17,129 +25,102 @@ class UniqueManagementValidator(BaseValidator):
         self.site_path = site_path
         super().__init__(**kwargs)
 
-    def _duplicate_by_site(self, project_id, management_id, site_id):
-        # Finds MRs that:
+    def _fetch_matches(self, match_sql, params, keys):
+        matches = {key: [] for key in keys}
+        with connection.cursor() as cursor:
+            cursor.execute(match_sql, params)
+            for *key, match_id in cursor.fetchall():
+                key = tuple(str(k) for k in key)
+                matches[key if len(key) > 1 else key[0]].append(str(match_id))
+        return matches
+
+    def _duplicate_by_site(self, keys):
+        # For each (management_id, site_id) key, finds MRs that:
         # - are not self and in same project,
         # - AND belong to SEs with the same site (but diff MR) as any SE with
         # associated SUs that uses this MR
-        match_sql = """
-            WITH se_mrs AS (
-                SELECT DISTINCT management_id, site_id FROM
-                sample_event ses
-                INNER JOIN management ON (ses.management_id = management.id)
-                LEFT JOIN transect_benthic tbs ON (ses.id = tbs.sample_event_id)
-                LEFT JOIN transect_belt_fish tbfs ON (ses.id = tbfs.sample_event_id)
-                LEFT JOIN quadrat_collection qcs ON (ses.id = qcs.sample_event_id)
-                LEFT JOIN quadrat_transect qts ON (ses.id = qts.sample_event_id)
-                WHERE management.project_id = %(project_id)s
-                AND (
-                    tbs.id IS NOT NULL OR
-                    tbfs.id IS NOT NULL OR
-                    qcs.id IS NOT NULL OR
-                    qts.id IS NOT NULL
-                )
+        keys = {
+            (normalized_id(management_id), normalized_id(site_id))
+            for management_id, site_id in keys
+            if normalized_id(management_id) and normalized_id(site_id)
+        }
+        match_sql = f"""
+            SELECT DISTINCT pairs.management_id, pairs.site_id, ses.management_id AS id
+            FROM unnest(%(mr_ids)s::uuid[], %(site_ids)s::uuid[])
+                AS pairs (management_id, site_id)
+            INNER JOIN management mr ON (pairs.management_id = mr.id)
+            INNER JOIN sample_event ses ON (
+                ses.site_id = pairs.site_id
+                AND ses.management_id != pairs.management_id
             )
-            SELECT management_id AS id
-            FROM se_mrs
-            WHERE (
-                management_id != %(mr_id)s
-                AND site_id = %(site_id)s
+            INNER JOIN management ON (
+                ses.management_id = management.id
+                AND management.project_id = mr.project_id
             )
+            WHERE {HAS_SAMPLE_UNITS_SQL}
         """
         params = {
-            "site_id": str(site_id),
-            "mr_id": str(management_id),
-            "project_id": str(project_id),
+            "mr_ids": [management_id for management_id, _ in keys],
+            "site_ids": [site_id for _, site_id in keys],
         }
-
-        return Management.objects.raw(match_sql, params)
-
-    def _duplicate_by_name(self, project_id, management_id, name):
-        match_sql = """
-            WITH se_mrs AS (
-                SELECT DISTINCT management_id, management.name AS management_name FROM
-                sample_event ses
-                INNER JOIN management ON (ses.management_id = management.id)
-                LEFT JOIN transect_benthic tbs ON (ses.id = tbs.sample_event_id)
-                LEFT JOIN transect_belt_fish tbfs ON (ses.id = tbfs.sample_event_id)
-                LEFT JOIN quadrat_collection qcs ON (ses.id = qcs.sample_event_id)
-                LEFT JOIN quadrat_transect qts ON (ses.id = qts.sample_event_id)
-                WHERE management.project_id = %(project_id)s
-                AND (
-                    tbs.id IS NOT NULL OR
-                    tbfs.id IS NOT NULL OR
-                    qcs.id IS NOT NULL OR
-                    qts.id IS NOT NULL
-                )
-            )
-            SELECT management_id AS id
-            FROM se_mrs
-            WHERE (
-                management_id != %(mr_id)s
-                AND
-                    LOWER(
-                        REPLACE(
-                            REPLACE(
-                                REPLACE(management_name, ' ', ''),
-                                '_',
-                                ''
-                            ),
-                            '-',
-                            ''
-                        )
-                    )::text =
-                    LOWER(
-                        REPLACE(
-                            REPLACE(
-                                REPLACE(%(name)s, ' ', ''),
-                                '_',
-                                ''
-                            ),
-                            '-',
-                            ''
-                        )
-                    )::text
+        return self._fetch_matches(match_sql, params, keys)
+
+    def _duplicate_by_name(self, management_ids):
+        # For each MR, finds MRs that are not self, in same project, with SEs
+        # with associated SUs and the same name ignoring case, spaces,
+        # underscores and dashes (see management_norm_name_idx)
+        management_ids = set(filter(None, map(normalized_id, management_ids)))
+        match_sql = f"""
+            SELECT DISTINCT mr.id, management.id AS id
+            FROM management mr
+            INNER JOIN management ON (
+                management.project_id = mr.project_id
+                AND management.id != mr.id
+                AND {NORMALIZED_NAME_SQL.format(name="management.name")}
+                    = {NORMALIZED_NAME_SQL.format(name="mr.name")}
             )
+            INNER JOIN sample_event ses ON (ses.management_id = management.id)
+            WHERE mr.id = ANY(%(mr_ids)s::uuid[])
+            AND {HAS_SAMPLE_UNITS_SQL}
         """
-        params = {
-            "name": name,
-            "mr_id": str(management_id),
-            "project_id": str(project_id),
-        }
-        return Management.objects.raw(match_sql, params)
+        params = {"mr_ids": list(management_ids)}
+        return self._fetch_matches(match_sql, params, management_ids)
 
     @validator_result
     def __call__(self, collect_record, **kwargs):
+        lookups = self.get_lookups(kwargs)
         management_id = self.get_value(collect_record, self.management_path) or ""
         site_id = self.get_value(collect_record, self.site_path) or ""
-        try:
-            check_uuid(management_id)
-            management = Management.objects.get_or_none(id=management_id)
-            if management is None:
-                return ERROR, self.MANAGEMENT_NOT_FOUND
-        except ParseError:
+        management = lookups.managements.get(management_id)
+        if management is None:
             return ERROR, self.MANAGEMENT_NOT_FOUND
-        try:
-            check_uuid(site_id)
-            # TODO: Is this needed?
-            _ = Site.objects.get_or_none(id=site_id)
-        except ParseError:
+        if valid_id(site_id) is None:
             return ERROR, self.SITE_NOT_FOUND
 
-        project_id = management.project_id
-        name = management.name
-
-        qry = self._duplicate_by_site(project_id, management_id, site_id)
-        results = qry[:3]
-        if len(results) > 0:
-            matches = [str(r.id) for r in results]
-            return WARN, self.NOT_UNIQUE, {"matches": matches}
-
-        qry = self._duplicate_by_name(project_id, management_id, name)
-        results = qry[:3]
-        if len(results) > 0:
-            matches = [str(r.id) for r in results]
-            return WARN, self.SIMILAR_NAME, {"matches": matches}
+        # Records of a batch validation share one query for each check
+        matches = lookups.batched(
+            (self.name, "duplicate_by_site"),
+            (str(management.pk), normalized_id(site_id)),
+            self._duplicate_by_site,
+            lambda records: [
+                (
+                    self.get_value(r, self.management_path),
+                    self.get_value(r, self.site_path),
+                )
+                for r in records
+            ],
+        )
+        if len(matches) > 0:
+            return WARN, self.NOT_UNIQUE, {"matches": matches[:3]}
+
+        matches = lookups.batched(
+            (self.name, "duplicate_by_name"),
+            str(management.pk),
+            self._duplicate_by_name,
+            lambda records: [self.get_value(r, self.management_path) for r in records],
+        )
+        if len(matches) > 0:
+            return WARN, self.SIMILAR_NAME, {"matches": matches[:3]}
 
         return OK
 
@@ -155,13 +136,7 @@ class ManagementRuleValidator(BaseValidator):
     @validator_result
     def __call__(self, collect_record, **kwargs):
         management_id = self.get_value(collect_record, self.management_path) or ""
-
-        try:
-            check_uuid(management_id)
-            management = Management.objects.get_or_none(id=management_id)
-        except ParseError:
-            management = None
-
+        management = self.get_lookups(kwargs).managements.get(management_id)
         if management is None:
             return ERROR, self.MANAGEMENT_NOT_FOUND
         if not management.rules:
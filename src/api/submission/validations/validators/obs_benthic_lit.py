@@ -17,6 +17,10 @@ class BenthicLITObservationTotalLengthValidator(BaseValidator):
         self.obs_benthiclits_path = obs_benthiclits_path
         super().__init__(**kwargs)
 
+    @property
+    def depends_on(self):
+        return [self.len_surveyed_path, self.obs_benthiclits_path]
+
     @validator_result
     def __call__(self, collect_record, **kwargs):
         tolerance = 0.5
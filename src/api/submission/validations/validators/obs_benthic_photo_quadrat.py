@@ -25,6 +25,10 @@ class PointsPerQuadratValidator(BaseValidator):
         self.observation_num_points_path = observation_num_points_path
         super().__init__(**kwargs)
 
+    @property
+    def depends_on(self):
+        return [self.num_points_per_quadrat_path, self.obs_benthic_photo_quadrats_path]
+
     @validator_result
     def __call__(self, collect_record, **kwargs):
         num_points_per_quadrat = self.get_value(collect_record, self.num_points_per_quadrat_path)
@@ -70,6 +74,10 @@ class QuadratCountValidator(BaseValidator):
 
         super().__init__(**kwargs)
 
+    @property
+    def depends_on(self):
+        return [self.num_quadrats_path, self.obs_benthic_photo_quadrats_path]
+
     @validator_result
     def __call__(self, collect_record, **kwargs):
         num_quadrats = self.get_value(collect_record, self.num_quadrats_path)
@@ -103,6 +111,14 @@ class QuadratNumberSequenceValidator(BaseValidator):
 
         super().__init__(**kwargs)
 
+    @property
+    def depends_on(self):
+        return [
+            self.num_quadrats_path,
+            self.obs_benthic_photo_quadrats_path,
+            self.quadrat_number_start_path,
+        ]
+
     @validator_result
     def __call__(self, collect_record, **kwargs):
         num_quadrats_max = 10000  # default max for num_quadrats
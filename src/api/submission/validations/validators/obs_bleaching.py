@@ -19,6 +19,10 @@ class BleachingObsValidator(BaseValidator):
             self.obs_type = self.BENTHIC_PERCENT
         super().__init__(**kwargs)
 
+    @property
+    def depends_on(self):
+        return [self.obs_path]
+
     @validator_result
     def _check_field_values(self, obs):
         status = OK
@@ -14,6 +14,10 @@ class ObservationCountValidator(BaseValidator):
         self.observations_path = observations_path
         super().__init__(**kwargs)
 
+    @property
+    def depends_on(self):
+        return [self.observations_path]
+
     @validator_result
     def __call__(self, collect_record, **kwargs):
         observations = self.get_value(collect_record, self.observations_path) or []
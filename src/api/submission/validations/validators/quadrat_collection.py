@@ -4,6 +4,7 @@ from rest_framework.exceptions import ParseError
 from ....exceptions import check_uuid
 from ....models import QuadratCollection
 from ....utils import get_related_transect_methods
+from ..utils import sample_unit_key
 from .base import ERROR, OK, BaseValidator, validator_result
 
 
@@ -31,9 +32,7 @@ class UniqueQuadratCollectionValidator(BaseValidator):
         self.observers_path = observers_path
         super().__init__(**kwargs)
 
-    @validator_result
-    def __call__(self, collect_record, **kwargs):
-        protocol = self.get_value(collect_record, self.protocol_path)
+    def _get_query_args(self, collect_record):
         site_id = self.get_value(collect_record, self.site_path)
         management_id = self.get_value(collect_record, self.management_path)
         sample_date = self.get_value(collect_record, self.sample_date_path)
@@ -51,8 +50,8 @@ class UniqueQuadratCollectionValidator(BaseValidator):
                 raise ValueError()
             for profile in profiles:
                 _ = check_uuid(profile)
-        except (ParseError, ValueError, TypeError):
-            return ERROR, self.INVALID_DATA
+        except (ParseError, ValueError, TypeError) as e:
+            raise ParseError() from e
 
         qry = {
             "sample_event__site": site_id,
@@ -63,6 +62,35 @@ class UniqueQuadratCollectionValidator(BaseValidator):
         if label:
             qry["label"] = label
 
+        return qry, profiles
+
+    def _get_sample_unit_key(self, collect_record):
+        try:
+            qry, profiles = self._get_query_args(collect_record)
+        except ParseError:
+            return None
+        return sample_unit_key(self.get_value(collect_record, self.protocol_path), qry, profiles)
+
+    @validator_result
+    def __call__(self, collect_record, **kwargs):
+        protocol = self.get_value(collect_record, self.protocol_path)
+
+        try:
+            qry, profiles = self._get_query_args(collect_record)
+        except ParseError:
+            return ERROR, self.INVALID_DATA
+
+        # Records validated together are compared with each other too
+        duplicate_id = self.get_lookups(kwargs).earlier_duplicate(
+            self, collect_record, self._get_sample_unit_key
+        )
+        if duplicate_id is not None:
+            return (
+                ERROR,
+                self.DUPLICATE_QUADRAT_COLLECTION,
+                {"duplicate_collect_record": duplicate_id},
+            )
+
         queryset = QuadratCollection.objects.filter(**qry)
         for profile in profiles:
             queryset = queryset.filter(
@@ -11,6 +11,10 @@ class QuadratSizeValidator(BaseValidator):
         self.quadrat_size_path = quadrat_size_path
         super().__init__(**kwargs)
 
+    @property
+    def depends_on(self):
+        return [self.quadrat_size_path]
+
     @validator_result
     def __call__(self, collect_record, **kwargs):
         quadrat_size = self.get_value(collect_record, self.quadrat_size_path)
@@ -4,6 +4,7 @@ from rest_framework.exceptions import ParseError
 from ....exceptions import check_uuid
 from ....models import QuadratTransect
 from ....utils import get_related_transect_methods
+from ..utils import sample_unit_key
 from .base import ERROR, OK, BaseValidator, validator_result
 
 
@@ -75,6 +76,13 @@ class UniqueQuadratTransectValidator(BaseValidator):
                 )
         return OK
 
+    def _get_sample_unit_key(self, collect_record):
+        try:
+            qry, profiles = self._get_query_args(collect_record)
+        except ParseError:
+            return None
+        return sample_unit_key(self.get_value(collect_record, self.protocol_path), qry, profiles)
+
     @validator_result
     def __call__(self, collect_record, **kwargs):
         protocol = self.get_value(collect_record, self.protocol_path)
@@ -84,6 +92,17 @@ class UniqueQuadratTransectValidator(BaseValidator):
         except ParseError:
             return ERROR, self.INVALID_DATA
 
+        # Records validated together are compared with each other too
+        duplicate_id = self.get_lookups(kwargs).earlier_duplicate(
+            self, collect_record, self._get_sample_unit_key
+        )
+        if duplicate_id is not None:
+            return (
+                ERROR,
+                self.DUPLICATE_QUADRAT_TRANSECT,
+                {"duplicate_collect_record": duplicate_id},
+            )
+
         queryset = QuadratTransect.objects.select_related().filter(**qry)
 
         for profile in profiles:
@@ -1,7 +1,3 @@
-from rest_framework.exceptions import ParseError
-
-from ....exceptions import check_uuid
-from ....models import Region, Site
 from ..utils import valid_id
 from .base import OK, WARN, BaseValidator, validator_result
 
@@ -62,22 +58,16 @@ class BaseRegionValidator(BaseValidator):
         return status, code, context
 
     def __call__(self, collect_record, **kwargs):
-        site_id = self.get_value(collect_record, self.site_path)
+        lookups = self.get_lookups(kwargs)
+        site = lookups.sites.get(self.get_value(collect_record, self.site_path))
         records = self.get_records(collect_record) or []
-        try:
-            check_uuid(site_id)
-            site = Site.objects.get_or_none(id=site_id)
-            if site is None or site.location is None:
-                raise ParseError()
-        except ParseError:
+        if site is None or site.location is None:
             return self._get_ok(records)
 
-        regions = Region.objects.filter(geom__intersects=site.location)
-        if regions.count() == 0:
+        site_region_id = lookups.site_region_id(site)
+        if site_region_id is None:
             return self._get_ok(records)
 
-        site_region_id = str(regions[0].pk)
-
         observation_ids, attribute_ids = self.get_observation_ids_and_attribute_ids(records)
         attr_lookup = self._get_attribute_region_lookup(set(attribute_ids))
 
@@ -5,7 +5,6 @@ from django.utils import timezone
 from django.utils.dateparse import parse_datetime
 from timezonefinder import TimezoneFinder
 
-from ....models import Site
 from ..statuses import ERROR, OK
 from ..utils import valid_id
 from .base import BaseValidator, validator_result
@@ -34,8 +33,7 @@ class SampleDateValidator(BaseValidator):
 
         return sample_date.date() < datetime(1900, 1, 1).date()
 
-    def is_future_sample_date(self, date_str, time_str, site_id):
-        site = Site.objects.get_or_none(id=site_id)
+    def is_future_sample_date(self, date_str, time_str, site):
 
         if not site or site.location is None:
             return False
@@ -75,7 +73,8 @@ class SampleDateValidator(BaseValidator):
         if site_id:
             if self.is_implausibly_old_date(sample_date_str):
                 return ERROR, self.IMPLAUSIBLY_OLD_DATE
-            if self.is_future_sample_date(sample_date_str, sample_time_str, site_id):
+            site = self.get_lookups(kwargs).sites.get(site_id)
+            if self.is_future_sample_date(sample_date_str, sample_time_str, site):
                 return ERROR, self.FUTURE_SAMPLE_DATE
 
         return OK
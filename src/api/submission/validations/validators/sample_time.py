@@ -13,6 +13,10 @@ class SampleTimeValidator(BaseValidator):
         self.sample_time_path = sample_time_path
         super().__init__(**kwargs)
 
+    @property
+    def depends_on(self):
+        return [self.sample_time_path]
+
     @validator_result
     def __call__(self, collect_record, **kwargs):
         sample_time_str = self.get_value(collect_record, self.sample_time_path)
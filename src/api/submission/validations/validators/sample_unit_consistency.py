@@ -2,8 +2,6 @@
 Validators for checking consistency of sample unit attributes within the same sample event.
 """
 
-from django.utils.dateparse import parse_date
-
 from ....models import (
     BENTHICLIT_PROTOCOL,
     BENTHICPIT_PROTOCOL,
@@ -20,7 +18,6 @@ from ....models import (
     FishBeltTransect,
     HabitatComplexity,
     InvertBeltTransect,
-    SampleEvent,
 )
 from ..statuses import OK, WARN
 from ..utils import valid_id
@@ -34,7 +31,7 @@ class SampleEventConsistencyValidator(BaseValidator):
         self.sample_date_path = sample_date_path
         super().__init__(**kwargs)
 
-    def _get_sample_event(self, collect_record):
+    def _get_sample_event(self, collect_record, lookups):
         """
         Extract sample event identifiers and look up the sample event.
         Returns the sample_event if found, or None if validation should be skipped.
@@ -45,17 +42,9 @@ class SampleEventConsistencyValidator(BaseValidator):
 
         if not site_id or not management_id or not sample_date_str:
             return None
-        sample_date = parse_date(sample_date_str)
-        if sample_date is None:
-            return None  # Let other validators handle invalid dates
-
-        sample_event = SampleEvent.objects.filter(
-            site_id=site_id,
-            management_id=management_id,
-            sample_date=sample_date,
-        ).first()
 
-        return sample_event
+        # Invalid dates are left to other validators
+        return lookups.sample_event(site_id, management_id, sample_date_str)
 
 
 class DifferentNumQuadratsValidator(SampleEventConsistencyValidator):
@@ -72,7 +61,7 @@ class DifferentNumQuadratsValidator(SampleEventConsistencyValidator):
 
     @validator_result
     def __call__(self, collect_record, **kwargs):
-        sample_event = self._get_sample_event(collect_record)
+        sample_event = self._get_sample_event(collect_record, self.get_lookups(kwargs))
         num_quadrats = self.get_numeric_value(collect_record, self.num_quadrats_path)
         if not sample_event or not num_quadrats:
             return OK
@@ -117,7 +106,7 @@ class DifferentNumPointsPerQuadratValidator(SampleEventConsistencyValidator):
 
     @validator_result
     def __call__(self, collect_record, **kwargs):
-        sample_event = self._get_sample_event(collect_record)
+        sample_event = self._get_sample_event(collect_record, self.get_lookups(kwargs))
         num_points_per_quadrat = self.get_numeric_value(
             collect_record, self.num_points_per_quadrat_path
         )
@@ -157,7 +146,7 @@ class DifferentTransectWidthValidator(SampleEventConsistencyValidator):
 
     @validator_result
     def __call__(self, collect_record, **kwargs):
-        sample_event = self._get_sample_event(collect_record)
+        sample_event = self._get_sample_event(collect_record, self.get_lookups(kwargs))
         width_id = valid_id(self.get_value(collect_record, self.width_path))
         if not sample_event or not width_id:
             return OK
@@ -198,7 +187,7 @@ class DifferentInvertTransectWidthValidator(SampleEventConsistencyValidator):
 
     @validator_result
     def __call__(self, collect_record, **kwargs):
-        sample_event = self._get_sample_event(collect_record)
+        sample_event = self._get_sample_event(collect_record, self.get_lookups(kwargs))
         width_id = valid_id(self.get_value(collect_record, self.width_path))
         if not sample_event or not width_id:
             return OK
@@ -256,7 +245,7 @@ class DifferentTransectLengthValidator(SampleEventConsistencyValidator):
 
     @validator_result
     def __call__(self, collect_record, **kwargs):
-        sample_event = self._get_sample_event(collect_record)
+        sample_event = self._get_sample_event(collect_record, self.get_lookups(kwargs))
         protocol = self.get_value(collect_record, self.protocol_path)
         len_surveyed = self.get_numeric_value(collect_record, self.len_surveyed_path)
 
@@ -306,7 +295,7 @@ class DifferentQuadratSizeValidator(SampleEventConsistencyValidator):
 
     @validator_result
     def __call__(self, collect_record, **kwargs):
-        sample_event = self._get_sample_event(collect_record)
+        sample_event = self._get_sample_event(collect_record, self.get_lookups(kwargs))
         quadrat_size = self.get_numeric_value(collect_record, self.quadrat_size_path)
         if not sample_event or not quadrat_size:
             return OK
@@ -1,9 +1,12 @@
+from collections import defaultdict
+from datetime import timedelta
+
+from django.db.models import Q
 from django.utils.dateparse import parse_date
-from rest_framework.exceptions import ParseError
 
-from ....exceptions import check_uuid
+from ....utils.dbutils import iter_queryset
 from ..statuses import ERROR, OK, WARN
-from ..utils import PROTOCOL_MODEL_MAP, PROTOCOL_SAMPLE_EVENT_PATH, valid_id
+from ..utils import PROTOCOL_MODEL_MAP, PROTOCOL_SAMPLE_EVENT_PATH, normalized_id
 from .base import BaseValidator, validator_result
 
 
@@ -27,53 +30,123 @@ class SimilarDateSampleUnitsValidator(BaseValidator):
         self.days_threshold = days_threshold
         super().__init__(**kwargs)
 
-    @validator_result
-    def __call__(self, collect_record, **kwargs):
+    def _get_similar_sample_unit_dates(self, model, sample_event_path, keys):
+        """
+        Dates of the sample units at the same site and management as each
+        (site_id, management_id, sample_date) key that are 1 to
+        `days_threshold` days away from its sample date, using one date
+        window query for all keys.
+        """
+        threshold = timedelta(days=self.days_threshold)
+        qry = Q()
+        sample_dates = defaultdict(list)
+        for site_id, management_id, sample_date in keys:
+            qry |= Q(
+                **{
+                    f"{sample_event_path}__site_id": site_id,
+                    f"{sample_event_path}__management_id": management_id,
+                    f"{sample_event_path}__sample_date__range": (
+                        sample_date - threshold,
+                        sample_date + threshold,
+                    ),
+                }
+            )
+            sample_dates[(site_id, management_id)].append(sample_date)
+
+        queryset = model.objects.filter(qry).values_list(
+            f"{sample_event_path}__site_id",
+            f"{sample_event_path}__management_id",
+            f"{sample_event_path}__sample_date",
+        )
+
+        su_dates = {key: [] for key in keys}
+        for site_id, management_id, su_date in iter_queryset(queryset):
+            site_id = str(site_id)
+            management_id = str(management_id)
+            for sample_date in sample_dates[(site_id, management_id)]:
+                # Same day (0 days) is left to the duplicate validation
+                if 1 <= abs((su_date - sample_date).days) <= self.days_threshold:
+                    su_dates[(site_id, management_id, sample_date)].append(su_date)
+
+        return su_dates
+
+    def _get_record_key(self, collect_record):
+        """
+        Protocol and (site_id, management_id, sample_date) of a record, or
+        None if any of them are missing or invalid.
+        """
         protocol = self.get_value(collect_record, self.protocol_path)
-        site_id = valid_id(self.get_value(collect_record, self.site_path))
-        management_id = valid_id(self.get_value(collect_record, self.management_path))
+        site_id = normalized_id(self.get_value(collect_record, self.site_path))
+        management_id = normalized_id(self.get_value(collect_record, self.management_path))
         sample_date_str = self.get_value(collect_record, self.sample_date_path)
 
-        # Skip validation if required values are missing
         if not protocol or not site_id or not management_id or not sample_date_str:
-            return OK
+            return None
 
         try:
-            check_uuid(site_id)
-            check_uuid(management_id)
             sample_date = parse_date(sample_date_str)
-            if sample_date is None:
-                return OK  # Let other validators handle invalid dates
-        except (ValueError, TypeError, ParseError):
-            return OK  # Let other validators handle invalid data
+        except (ValueError, TypeError):
+            return None
+        if sample_date is None:
+            return None
 
+        return protocol, (site_id, management_id, sample_date)
+
+    def _get_batch_sample_dates(self, records, protocol):
+        """(record id, sample date) of `protocol` records, by (site_id, management_id)."""
+        sample_dates = defaultdict(list)
+        for record in records:
+            record_key = self._get_record_key(record)
+            if record_key is None or record_key[0] != protocol:
+                continue
+            site_id, management_id, sample_date = record_key[1]
+            sample_dates[(site_id, management_id)].append((str(record.get("id")), sample_date))
+        return sample_dates
+
+    @validator_result
+    def __call__(self, collect_record, **kwargs):
+        # Skip validation if required values are missing; other validators
+        # handle invalid ids and dates
+        record_key = self._get_record_key(collect_record)
+        if record_key is None:
+            return OK
+
+        protocol, key = record_key
+        sample_date = key[2]
         model = PROTOCOL_MODEL_MAP.get(protocol)
         sample_event_path = PROTOCOL_SAMPLE_EVENT_PATH.get(protocol)
 
         if not model or not sample_event_path:
             return ERROR, self.UNKNOWN_PROTOCOL, {"protocol": protocol}
 
-        queryset = model.objects.filter(
-            **{
-                f"{sample_event_path}__site_id": site_id,
-                f"{sample_event_path}__management_id": management_id,
-            }
-        ).select_related(sample_event_path)
-
-        parts = sample_event_path.split("__")
-        similar_dates = []
-        for su in queryset:
-            su_sample_event = su
-            for part in parts:
-                su_sample_event = getattr(su_sample_event, part)
-
-            su_date = su_sample_event.sample_date
-            days_difference = abs((su_date - sample_date).days)
-
-            # Only warn if date difference is between 1 and threshold days (inclusive)
-            # Same day (0 days) should not trigger a warning
-            if 1 <= days_difference <= self.days_threshold:
-                similar_dates.append({"date": str(su_date), "days_difference": days_difference})
+        # Records of a batch validation share one query per protocol
+        lookups = self.get_lookups(kwargs)
+        su_dates = lookups.batched(
+            (self.name, protocol),
+            key,
+            lambda keys: self._get_similar_sample_unit_dates(model, sample_event_path, keys),
+            lambda records: [
+                k for p, k in filter(None, map(self._get_record_key, records)) if p == protocol
+            ],
+        )
+
+        # and are compared with each other
+        record_id = str(collect_record.get("id"))
+        batch_dates = lookups.cached(
+            (self, protocol),
+            lambda: self._get_batch_sample_dates(lookups.records, protocol),
+        )
+        su_dates = list(su_dates) + [
+            su_date
+            for other_id, su_date in batch_dates.get(key[:2], [])
+            if other_id != record_id
+            and 1 <= abs((su_date - sample_date).days) <= self.days_threshold
+        ]
+
+        similar_dates = [
+            {"date": str(su_date), "days_difference": abs((su_date - sample_date).days)}
+            for su_date in su_dates
+        ]
 
         if similar_dates:
             # Find the minimum days difference (closest match)
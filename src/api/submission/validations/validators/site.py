@@ -1,12 +1,9 @@
 from django.contrib.gis.geos import Polygon
-from django.contrib.gis.measure import Distance
-from django.contrib.postgres.search import TrigramSimilarity
-from django.db.models import Q
-from rest_framework.exceptions import ParseError
+from django.db import connection
 
-from ....exceptions import check_uuid
-from ....models import SampleUnit, Site
+from ....models import SampleUnit
 from ....utils import get_subclasses
+from ..utils import normalized_id
 from .base import ERROR, OK, WARN, BaseValidator, validator_result
 
 
@@ -34,54 +31,71 @@ class UniqueSiteValidator(BaseValidator):
 
         return Polygon((((x1, y1), (x1, y2), (x2, y2), (x2, y1), (x1, y1))), srid=self.srid)
 
-    def _sample_unit_duplicate_sites(self, sample_unit, site, project_id, location):
-        # Ignore self and ensure same project
-        qry = sample_unit.objects.select_related("sample_event", "sample_event__site").filter(
-            ~Q(sample_event__site=site)
+    def _duplicate_sites(self, site_ids):
+        """
+        Ids of the other sites of the same project, with sample units, that are
+        within `site_buffer` and have a similar name, for each site in
+        `site_ids`. One query for all sites; the bounding box and trigram
+        operators let it use the location and name indexes.
+        """
+        site_ids = set(filter(None, map(normalized_id, site_ids)))
+        has_sample_units = " OR ".join(
+            f"EXISTS (SELECT 1 FROM {suclass._meta.db_table} su WHERE su.sample_event_id = se.id)"
+            for suclass in get_subclasses(SampleUnit)
         )
-        qry = qry.filter(sample_event__site__project_id=project_id)
-        if location is not None:
-            qry = qry.filter(
-                sample_event__site__location__distance_lt=(
-                    location,
-                    Distance(m=self.site_buffer),
-                )
+        match_sql = f"""
+            SELECT s.id, d.id
+            FROM site s
+            INNER JOIN site d ON (
+                d.project_id = s.project_id
+                AND d.id != s.id
+                AND d.location && ST_Expand(s.location, %(bbox_dx)s, %(bbox_dy)s)
+                AND ST_DistanceSphere(d.location, s.location) < %(site_buffer)s
+                AND d.name %% s.name
+                AND similarity(d.name, s.name) >= %(name_match_percent)s
             )
-
-        # Fuzzy name match
-        qry = qry.annotate(similarity=TrigramSimilarity("sample_event__site__name", site.name))
-        qry = qry.filter(similarity__gte=self.name_match_percent)
-
-        return [r.sample_event.site for r in qry.order_by("-similarity")]
+            WHERE s.id = ANY(%(site_ids)s::uuid[])
+            AND EXISTS (
+                SELECT 1 FROM sample_event se
+                WHERE se.site_id = d.id AND ({has_sample_units})
+            )
+            ORDER BY similarity(d.name, s.name) DESC
+        """
+        params = {
+            "bbox_dx": self.search_bbox_size[0] / 2.0,
+            "bbox_dy": self.search_bbox_size[1] / 2.0,
+            "site_buffer": self.site_buffer,
+            "name_match_percent": self.name_match_percent,
+            "site_ids": list(site_ids),
+        }
+
+        duplicate_sites = {site_id: [] for site_id in site_ids}
+        with connection.cursor() as cursor:
+            cursor.execute(match_sql, params)
+            for site_id, duplicate_site_id in cursor.fetchall():
+                duplicate_sites[str(site_id)].append(str(duplicate_site_id))
+
+        return duplicate_sites
 
     @validator_result
     def __call__(self, collect_record, **kwargs):
         # 1. Location within buffer
         # 2. Fuzzy match site name
 
-        site_id = self.get_value(collect_record, self.site_path) or ""
-        try:
-            check_uuid(site_id)
-            site = Site.objects.get_or_none(id=site_id)
-        except ParseError:
-            site = None
-
+        lookups = self.get_lookups(kwargs)
+        site = lookups.sites.get(self.get_value(collect_record, self.site_path))
         if site is None:
             return ERROR, self.SITE_NOT_FOUND
 
-        project_id = site.project_id
-        location = site.location
-
-        duplicate_sites = []
-        for suclass in get_subclasses(SampleUnit):
-            duplicate_sites.extend(
-                self._sample_unit_duplicate_sites(suclass, site, project_id, location)
-            )
-
-        duplicate_sites = list(set(duplicate_sites))
+        # Records of a batch validation share one query
+        duplicate_site_ids = lookups.batched(
+            (self.name, "duplicate_sites"),
+            str(site.pk),
+            self._duplicate_sites,
+            lambda records: [self.get_value(r, self.site_path) for r in records],
+        )
 
-        if len(duplicate_sites) > 0:
-            matches = [str(r.id) for r in duplicate_sites[:3]]
-            return WARN, self.NOT_UNIQUE, {"matches": matches}
+        if len(duplicate_site_ids) > 0:
+            return WARN, self.NOT_UNIQUE, {"matches": duplicate_site_ids[:3]}
 
         return OK
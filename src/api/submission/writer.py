@@ -1,8 +1,13 @@
+import json
 import uuid
 
-from django.db.models import Count, F
+from django.core.exceptions import ValidationError as DJValidationError
+from django.db import IntegrityError
+from django.db.models import Count, F, Q
 from django.utils.translation import gettext_lazy as _
 from rest_framework.exceptions import ValidationError
+from rest_framework.relations import PrimaryKeyRelatedField
+from rest_framework.utils import model_meta
 
 from api.models import (
     Annotation,
@@ -29,6 +34,8 @@ from api.resources.quadrat_collection import QuadratCollectionSerializer
 from api.resources.quadrat_transect import QuadratTransectSerializer
 from api.resources.sample_event import SampleEventSerializer
 from api.utils import combine_into
+from api.utils.auth0utils import get_jwt_token, get_unverified_profile
+from api.utils.related import get_related_project
 from ..resources.sampleunitmethods import clean_sample_event_models
 from ..resources.sampleunitmethods.beltfishmethod import (
     BeltFishSerializer,
@@ -79,31 +86,208 @@ from .parser import (
 
 
 class BaseWriter(object):
+    """
+    Writes a collect record to its protocol models.
+
+    With `context["dry_run"]`, nothing is written: data is validated by the
+    same serializers, instances are built in memory and checked against the
+    unique constraints the inserts would violate, and instances created
+    earlier in the run stand in for their rows in related fields.
+    """
+
     def __init__(self, collect_record, context):
         self.collect_record = collect_record
         self.context = context
 
+    @property
+    def dry_run(self):
+        return self.context.get("dry_run") is True
+
+    def _get_pending(self):
+        # Unsaved instances of a dry run, by pk
+        return self.context.setdefault("pending", {})
+
+    def resolve_related_fields(self, fields, items):
+        """
+        Resolve the primary key related `fields` of `items` with one query per
+        field, instead of one per value, and to pending instances in a dry run.
+        """
+        pending = self._get_pending() if self.dry_run else {}
+        for name, field in fields.items():
+            if not isinstance(field, PrimaryKeyRelatedField) or field.read_only:
+                continue
+
+            queryset = field.get_queryset()
+            pks = set()
+            for item in items:
+                value = item.get(name)
+                if value is None or str(value) in pending:
+                    continue
+                try:
+                    pks.add(queryset.model._meta.pk.to_python(value))
+                except (DJValidationError, TypeError, ValueError):
+                    continue
+            found = {str(obj.pk): obj for obj in queryset.filter(pk__in=pks)} if pks else {}
+
+            def to_internal_value(data, found=found, original=field.to_internal_value):
+                key = str(data)
+                if key in pending:
+                    return pending[key]
+                if key in found:
+                    return found[key]
+                return original(data)
+
+            field.to_internal_value = to_internal_value
+
     def validate_data(self, serializer_cls, data):
         serializer = serializer_cls(data=data, context=self.context)
+        if self.dry_run:
+            self.resolve_related_fields(serializer.fields, [data])
         if serializer.is_valid() is False:
             raise ValidationError(serializer.errors)
 
         return serializer
 
+    def _build_instance(self, model, validated_data):
+        relations = model_meta.get_field_info(model).relations
+        return model(
+            **{
+                k: v
+                for k, v in validated_data.items()
+                if k not in relations or relations[k].to_many is False
+            }
+        )
+
+    def check_unique(self, instances):
+        """
+        Raise IntegrityError if inserting `instances` would violate a unique
+        constraint, among themselves or with existing rows.
+        """
+        if not instances:
+            return
+
+        pending = self._get_pending()
+        unique_checks, _date_checks = instances[0]._get_unique_checks(include_meta_constraints=True)
+        for model_class, field_names in unique_checks:
+            attnames = [model_class._meta.get_field(f).attname for f in field_names]
+            seen = set()
+            existing = []
+            for instance in instances:
+                values = tuple(getattr(instance, attname) for attname in attnames)
+                if any(v is None for v in values):
+                    continue
+                if values in seen:
+                    raise IntegrityError(self._unique_message(model_class, field_names))
+                seen.add(values)
+                # Pending instances have no rows to conflict with
+                if not any(str(v) in pending for v in values):
+                    existing.append(values)
+
+            if not existing:
+                continue
+            if len(attnames) == 1:
+                qry = Q(**{f"{attnames[0]}__in": [values[0] for values in existing]})
+            else:
+                qry = Q()
+                for values in existing:
+                    qry |= Q(**dict(zip(attnames, values)))
+            if model_class._default_manager.filter(qry).exists():
+                raise IntegrityError(self._unique_message(model_class, field_names))
+
+    def _unique_message(self, model, field_names):
+        return (
+            f"duplicate key value violates unique constraint on "
+            f"{model._meta.db_table} ({', '.join(field_names)})"
+        )
+
+    def save(self, serializer):
+        """`serializer.save()`, or an unsaved, checked instance in a dry run."""
+        if self.dry_run is False:
+            return serializer.save()
+
+        instance = self._build_instance(serializer.Meta.model, serializer.validated_data)
+        self.check_unique([instance])
+        self._get_pending()[str(instance.pk)] = instance
+        return instance
+
+    def _instance_cache_key(self, model, data):
+        lookup = {k: v for k, v in data.items() if k != "id"}
+        return model, json.dumps(lookup, sort_keys=True, default=str)
+
     def get_or_create(self, model, serializer_cls, data, additional_data=None):
+        # Writers of a bulk submission share the instances they get or create
+        # through context["instances"]
+        instances = self.context.get("instances")
+        cache_key = self._instance_cache_key(model, data)
+        if instances is not None and cache_key in instances:
+            return instances[cache_key]
+
         pk = data.get("id") or uuid.uuid4()
         data["id"] = pk
         serializer = self.validate_data(serializer_cls, data)
 
         try:
             data.pop("id")
-            return model.objects.get(**data)
+            instance = model.objects.get(**data)
         except model.DoesNotExist:
             if isinstance(additional_data, dict):
                 data["id"] = pk
                 combine_into(additional_data, data)
                 serializer = self.validate_data(serializer_cls, data)
-            return serializer.save()
+            instance = self.save(serializer)
+
+        if instances is not None:
+            instances[cache_key] = instance
+        return instance
+
+    def get_profile(self):
+        request = self.context.get("request")
+        if request is None:
+            return None
+        return get_unverified_profile(get_jwt_token(request))
+
+    def bulk_create(self, serializer_cls, observations_data):
+        """
+        Validate `observations_data` together and insert them with one
+        `bulk_create`. Model save signals don't fire for bulk inserts, so
+        `created_by`/`updated_by` are set here and the related project is
+        touched once for the whole batch. Related fields are resolved with one
+        query per field.
+        """
+        if not observations_data:
+            return []
+
+        for observation_data in observations_data:
+            observation_data["id"] = observation_data.get("id") or uuid.uuid4()
+
+        serializer = serializer_cls(data=observations_data, many=True, context=self.context)
+        self.resolve_related_fields(serializer.child.fields, observations_data)
+        if serializer.is_valid() is False:
+            raise ValidationError(next(errors for errors in serializer.errors if errors))
+
+        model = serializer_cls.Meta.model
+        if self.dry_run:
+            observations = [
+                self._build_instance(model, validated_data)
+                for validated_data in serializer.validated_data
+            ]
+            self.check_unique(observations)
+            return observations
+
+        profile = self.get_profile()
+        observations = []
+        for validated_data in serializer.validated_data:
+            validated_data["updated_by"] = profile
+            if profile is not None:
+                validated_data["created_by"] = profile
+            observations.append(model(**validated_data))
+        observations = model.objects.bulk_create(observations)
+
+        project = get_related_project(observations[0])
+        if project is not None:
+            project.save()
+
+        return observations
 
     def write(self):
         raise NotImplementedError()
@@ -133,7 +317,7 @@ class ProtocolWriter(BaseWriter):
             except Observer.DoesNotExist:
                 if serializer.is_valid() is False:
                     raise ValidationError(serializer.errors) from _
-                observers.append(serializer.save())
+                observers.append(self.save(serializer))
 
         return observers
 
@@ -163,15 +347,8 @@ class FishbeltProtocolWriter(ProtocolWriter):
         )
 
     def create_obsbeltfish(self, belt_fish_id):
-        observation_beltfishes = []
         observations_data = get_obsbeltfish_data(self.collect_record, belt_fish_id)
-
-        for observation_data in observations_data:
-            observation_data["id"] = observation_data.get("id") or uuid.uuid4()
-            serializer = self.validate_data(ObsBeltFishSerializer, observation_data)
-            observation_beltfishes.append(serializer.save())
-
-        return observation_beltfishes
+        return self.bulk_create(ObsBeltFishSerializer, observations_data)
 
     def write(self):
         sample_unit_method_id = self.get_sample_unit_method_id()
@@ -202,22 +379,13 @@ class BenthicPITProtocolWriter(BenthicProtocolWriter):
         )
 
     def create_obsbenthicpit(self, benthic_pit_id):
-        observation_benthicpits = []
         observations_data = get_obsbenthicpit_data(self.collect_record, benthic_pit_id)
         if not observations_data:
             raise ValidationError(
                 {"obs_benthic_pits": [_("Benthic PIT observations are required.")]}
             )
 
-        for observation_data in observations_data:
-            observation_data["id"] = observation_data.get("id") or uuid.uuid4()
-            serializer = ObsBenthicPITSerializer(data=observation_data, context=self.context)
-            if serializer.is_valid() is False:
-                raise ValidationError(serializer.errors)
-
-            observation_benthicpits.append(serializer.save())
-
-        return observation_benthicpits
+        return self.bulk_create(ObsBenthicPITSerializer, observations_data)
 
     def write(self):
         sample_unit_method_id = self.get_sample_unit_method_id()
@@ -246,22 +414,13 @@ class BenthicLITProtocolWriter(BenthicProtocolWriter):
         )
 
     def create_obsbenthiclit(self, benthic_lit_id):
-        observation_benthiclits = []
         observations_data = get_obsbenthiclit_data(self.collect_record, benthic_lit_id)
         if not observations_data:
             raise ValidationError(
                 {"obs_benthic_lits": [_("Benthic LIT observations are required.")]}
             )
 
-        for observation_data in observations_data:
-            observation_data["id"] = observation_data.get("id") or uuid.uuid4()
-            serializer = ObsBenthicLITSerializer(data=observation_data, context=self.context)
-            if serializer.is_valid() is False:
-                raise ValidationError(serializer.errors)
-
-            observation_benthiclits.append(serializer.save())
-
-        return observation_benthiclits
+        return self.bulk_create(ObsBenthicLITSerializer, observations_data)
 
     def write(self):
         sample_unit_method_id = self.get_sample_unit_method_id()
@@ -292,22 +451,13 @@ class HabitatComplexityProtocolWriter(BenthicProtocolWriter):
         )
 
     def create_obshabitatcomplexity(self, habitatcomplexity_id):
-        observation_habitatcomplexities = []
         observations_data = get_obshabitatcomplexity_data(self.collect_record, habitatcomplexity_id)
         if not observations_data:
             raise ValidationError(
                 {"obs_habitat_complexities": [_("Habitat complexity observations are required.")]}
             )
 
-        for observation_data in observations_data:
-            observation_data["id"] = observation_data.get("id") or uuid.uuid4()
-            serializer = ObsHabitatComplexitySerializer(data=observation_data, context=self.context)
-            if serializer.is_valid() is False:
-                raise ValidationError(serializer.errors)
-
-            observation_habitatcomplexities.append(serializer.save())
-
-        return observation_habitatcomplexities
+        return self.bulk_create(ObsHabitatComplexitySerializer, observations_data)
 
     def write(self):
         sample_unit_method_id = self.get_sample_unit_method_id()
@@ -328,11 +478,8 @@ class BleachingQuadratCollectionProtocolWriter(ProtocolWriter):
 
         except (QuadratCollection.DoesNotExist, ValidationError):
             observation_data["id"] = observation_data.get("id") or uuid.uuid4()
-            serializer = QuadratCollectionSerializer(data=observation_data, context=self.context)
-            if serializer.is_valid() is False:
-                raise ValidationError(serializer.errors) from _
-
-            return serializer.save()
+            serializer = self.validate_data(QuadratCollectionSerializer, observation_data)
+            return self.save(serializer)
 
     def get_or_create_bleaching_quadrat_collection(
         self, collect_record_id, quadrat_collection_id, sample_unit_method_id=None
@@ -349,27 +496,15 @@ class BleachingQuadratCollectionProtocolWriter(ProtocolWriter):
         )
 
     def create_obs_quadrat_benthic_percent(self, bleaching_quadrat_collection_id):
-        observation_benthic_percent_covered_data = []
         observations_data = get_obs_quadrat_benthic_percent_data(
             self.collect_record, bleaching_quadrat_collection_id
         )
         if not observations_data:
-            return observation_benthic_percent_covered_data
-
-        for observation_data in observations_data:
-            observation_data["id"] = observation_data.get("id") or uuid.uuid4()
-            serializer = ObsQuadratBenthicPercentSerializer(
-                data=observation_data, context=self.context
-            )
-            if serializer.is_valid() is False:
-                raise ValidationError(serializer.errors)
+            return []
 
-            observation_benthic_percent_covered_data.append(serializer.save())
-
-        return observation_benthic_percent_covered_data
+        return self.bulk_create(ObsQuadratBenthicPercentSerializer, observations_data)
 
     def create_obs_colonies_bleached(self, bleaching_quadrat_collection_id):
-        observation_benthic_percent_covered_data = []
         observations_data = get_obs_colonies_bleached_data(
             self.collect_record, bleaching_quadrat_collection_id
         )
@@ -378,15 +513,7 @@ class BleachingQuadratCollectionProtocolWriter(ProtocolWriter):
                 {"obs_colonies_bleached": [_("Colonies bleached observations are required.")]}
             )
 
-        for observation_data in observations_data:
-            observation_data["id"] = observation_data.get("id") or uuid.uuid4()
-            serializer = ObsColoniesBleachedSerializer(data=observation_data, context=self.context)
-            if serializer.is_valid() is False:
-                raise ValidationError(serializer.errors)
-
-            observation_benthic_percent_covered_data.append(serializer.save())
-
-        return observation_benthic_percent_covered_data
+        return self.bulk_create(ObsColoniesBleachedSerializer, observations_data)
 
     def write(self):
         sample_unit_method_id = self.get_sample_unit_method_id()
@@ -406,13 +533,10 @@ class BenthicPhotoQuadratTransectProtocolWriter(ProtocolWriter):
         try:
             return QuadratTransect.objects.get(**quadrat_transect_data)
 
-        except (QuadratTransect.DoesNotExist, ValidationError) as _:
+        except (QuadratTransect.DoesNotExist, ValidationError):
             quadrat_transect_data["id"] = uuid.uuid4()
-            serializer = QuadratTransectSerializer(data=quadrat_transect_data, context=self.context)
-            if serializer.is_valid() is False:
-                raise ValidationError(serializer.errors) from _
-
-            return serializer.save()
+            serializer = self.validate_data(QuadratTransectSerializer, quadrat_transect_data)
+            return self.save(serializer)
 
     def get_or_create_benthic_photo_quadrat_transect(
         self, collect_record_id, quadrat_transect_id, sample_unit_method_id=None
@@ -484,7 +608,6 @@ class BenthicPhotoQuadratTransectProtocolWriter(ProtocolWriter):
         return observations_data
 
     def create_obs_benthic_photo_quadrat(self, benthic_photo_quadrat_transect_id):
-        observations = []
         image_classification = self.collect_record.data.get("image_classification")
 
         if image_classification:
@@ -503,17 +626,7 @@ class BenthicPhotoQuadratTransectProtocolWriter(ProtocolWriter):
                 }
             )
 
-        for observation_data in observations_data:
-            observation_data["id"] = observation_data.get("id") or uuid.uuid4()
-            serializer = ObsBenthicPhotoQuadratSerializer(
-                data=observation_data, context=self.context
-            )
-            if serializer.is_valid() is False:
-                raise ValidationError(serializer.errors)
-
-            observations.append(serializer.save())
-
-        return observations
+        return self.bulk_create(ObsBenthicPhotoQuadratSerializer, observations_data)
 
     def write(self):
         sample_unit_method_id = self.get_sample_unit_method_id()
@@ -547,15 +660,8 @@ class BeltInvertProtocolWriter(ProtocolWriter):
         )
 
     def create_obsbeltinvert(self, belt_invert_id):
-        observation_beltinverts = []
         observations_data = get_obsbeltinvert_data(self.collect_record, belt_invert_id)
-
-        for observation_data in observations_data:
-            observation_data["id"] = observation_data.get("id") or uuid.uuid4()
-            serializer = self.validate_data(ObsBeltInvertSerializer, observation_data)
-            observation_beltinverts.append(serializer.save())
-
-        return observation_beltinverts
+        return self.bulk_create(ObsBeltInvertSerializer, observations_data)
 
     def write(self):
         sample_unit_method_id = self.get_sample_unit_method_id()
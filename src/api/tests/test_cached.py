@@ -0,0 +1,118 @@
+import datetime
+import os
+from unittest.mock import MagicMock, patch
+
+import botocore
+import pytest
+from django.test import override_settings
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from api.utils import cached
+
+KEY = "cached-key"
+LAST_MODIFIED = datetime.datetime(2024, 1, 2, 3, 4, 5, tzinfo=datetime.timezone.utc)
+CONTENT = [b"a,b\n", b"1,2\n"]
+
+
+def _request(path="/csv/", **headers):
+    return Request(APIRequestFactory().get(path, **headers))
+
+
+def _s3_obj():
+    body = MagicMock()
+    body.iter_chunks.return_value = iter(CONTENT)
+    return {
+        "Body": body,
+        "ContentType": "text/csv",
+        "ContentEncoding": "gzip",
+        "ContentLength": sum(len(c) for c in CONTENT),
+    }
+
+
+@pytest.fixture
+def local_cache_dir(tmp_path):
+    with override_settings(
+        CACHED_FILES_LOCAL_DIR=str(tmp_path), CACHED_FILES_LOCAL_MAX_SIZE=1024 * 1024
+    ):
+        yield tmp_path
+
+
+def test_streaming_response_single_get(local_cache_dir):
+    with patch("api.utils.cached.s3") as s3_mock:
+        s3_mock.get_object.return_value = _s3_obj()
+        response = cached.streaming_response(_request(), KEY, last_modified=LAST_MODIFIED)
+        assert b"".join(response.streaming_content) == b"".join(CONTENT)
+
+    s3_mock.file_exists.assert_not_called()
+    assert s3_mock.get_object.call_count == 1
+    assert response["ETag"] == cached.make_etag(KEY, LAST_MODIFIED)
+    assert response["Content-Encoding"] == "gzip"
+    assert "Last-Modified" in response
+
+
+def test_streaming_response_missing_file(local_cache_dir):
+    error = botocore.exceptions.ClientError({"Error": {"Code": "NoSuchKey"}}, "GetObject")
+    with patch("api.utils.cached.s3") as s3_mock:
+        s3_mock.get_object.side_effect = error
+        assert cached.streaming_response(_request(), KEY, last_modified=LAST_MODIFIED) is None
+
+
+def test_streaming_response_not_modified(local_cache_dir):
+    etag = cached.make_etag(KEY, LAST_MODIFIED)
+    request = _request(HTTP_IF_NONE_MATCH=etag)
+    with patch("api.utils.cached.s3") as s3_mock:
+        response = cached.streaming_response(request, KEY, last_modified=LAST_MODIFIED)
+
+    s3_mock.get_object.assert_not_called()
+    assert response.status_code == 304
+    assert response["ETag"] == etag
+
+
+def test_streaming_response_stale_etag(local_cache_dir):
+    stale_etag = cached.make_etag(KEY, LAST_MODIFIED - datetime.timedelta(days=1))
+    request = _request(HTTP_IF_NONE_MATCH=stale_etag)
+    with patch("api.utils.cached.s3") as s3_mock:
+        s3_mock.get_object.return_value = _s3_obj()
+        response = cached.streaming_response(request, KEY, last_modified=LAST_MODIFIED)
+
+    assert response.status_code == 200
+
+
+def test_streaming_response_filtering_params(local_cache_dir):
+    with patch("api.utils.cached.s3") as s3_mock:
+        response = cached.streaming_response(
+            _request("/csv/?site_name=abc"), KEY, last_modified=LAST_MODIFIED
+        )
+
+    assert response is None
+    s3_mock.get_object.assert_not_called()
+
+
+def test_streaming_response_served_from_local_cache(local_cache_dir):
+    with patch("api.utils.cached.s3") as s3_mock:
+        s3_mock.get_object.return_value = _s3_obj()
+        first = cached.streaming_response(_request(), KEY, last_modified=LAST_MODIFIED)
+        b"".join(first.streaming_content)
+
+        second = cached.streaming_response(_request(), KEY, last_modified=LAST_MODIFIED)
+        assert b"".join(second.streaming_content) == b"".join(CONTENT)
+
+    assert s3_mock.get_object.call_count == 1
+    assert second["Content-Type"] == "text/csv"
+    assert second["Content-Encoding"] == "gzip"
+
+
+def test_evict_local_files(local_cache_dir):
+    for n, name in enumerate(("old", "new")):
+        path = local_cache_dir / name
+        path.write_bytes(b"x" * 10)
+        path.with_suffix(".json").write_text("{}")
+        mtime = LAST_MODIFIED.timestamp() + n
+        os.utime(path, (mtime, mtime))
+
+    cached.evict_local_files(max_size=15)
+
+    assert not (local_cache_dir / "old").exists()
+    assert not (local_cache_dir / "old.json").exists()
+    assert (local_cache_dir / "new").exists()
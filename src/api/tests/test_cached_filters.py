@@ -0,0 +1,97 @@
+import csv
+import datetime
+import io
+from unittest.mock import patch
+
+import pyarrow.parquet as pq
+import pytest
+from django.http import QueryDict
+
+from api.resources.sampleunitmethods.beltfishmethod import BeltFishMethodObsFilterSet
+from api.utils import cached_filters
+
+FIELDS = ["Site", "Management", "Sample date", "Count"]
+FILTER_FIELD_NAMES = [
+    "site_id",
+    "site_name",
+    "management_name",
+    "management_name_secondary",
+    "sample_date",
+]
+ROWS = [
+    ("Site A", "Mgmt A", "2020-01-01", 1),
+    ("Site B", "Mgmt B", "2021-06-01", 2),
+    ("Site C", "Mgmt C", "2022-03-01", None),
+]
+FILTER_VALUES = [
+    ("6A2E4A18-0D47-4C8A-9E2A-1F0D1F6E0001", "Site A", "Mgmt A", "", datetime.date(2020, 1, 1)),
+    (
+        "6a2e4a18-0d47-4c8a-9e2a-1f0d1f6e0002",
+        "Site B",
+        "Mgmt B",
+        "Reserve",
+        datetime.date(2021, 6, 1),
+    ),
+    ("6a2e4a18-0d47-4c8a-9e2a-1f0d1f6e0003", "Site C", "Mgmt C", None, datetime.date(2022, 3, 1)),
+]
+
+
+@pytest.fixture
+def parquet_path(tmp_path):
+    path = tmp_path / "rows.parquet"
+    table = cached_filters.build_table(FIELDS, ROWS, FILTER_FIELD_NAMES, FILTER_VALUES)
+    pq.write_table(table, path)
+    return path
+
+
+class MockRequest:
+    def __init__(self, query_string):
+        self.query_params = QueryDict(query_string)
+
+
+def _export(parquet_path, query_string):
+    with patch("api.utils.cached_filters.cached.get_local_file", return_value=parquet_path):
+        response = cached_filters.filtered_csv_response(
+            MockRequest(query_string),
+            "key",
+            BeltFishMethodObsFilterSet,
+            file_name_prefix="export",
+            last_modified=datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc),
+        )
+
+    if response is None:
+        return None
+    content = b"".join(
+        c if isinstance(c, bytes) else c.encode() for c in response.streaming_content
+    )
+    return list(csv.reader(io.StringIO(content.decode("utf-8"))))
+
+
+def test_filtered_export_date_range(parquet_path):
+    rows = _export(parquet_path, "sample_date_after=2021-01-01&sample_date_before=2021-12-31")
+    assert rows[0] == FIELDS
+    assert rows[1:] == [["Site B", "Mgmt B", "2021-06-01", "2"]]
+
+
+def test_filtered_export_id_lookup_is_case_insensitive(parquet_path):
+    rows = _export(
+        parquet_path,
+        "site_id=6a2e4a18-0d47-4c8a-9e2a-1f0d1f6e0001,6A2E4A18-0D47-4C8A-9E2A-1F0D1F6E0003",
+    )
+    assert [r[0] for r in rows[1:]] == ["Site A", "Site C"]
+    assert rows[2][3] == ""
+
+
+def test_filtered_export_management_name_secondary(parquet_path):
+    rows = _export(parquet_path, "management_name=reserve")
+    assert [r[0] for r in rows[1:]] == ["Site B"]
+
+
+def test_filtered_export_site_name_icontains(parquet_path):
+    rows = _export(parquet_path, "site_name=site a,site c&token=abc")
+    assert [r[0] for r in rows[1:]] == ["Site A", "Site C"]
+
+
+def test_filtered_export_unsupported_filter(parquet_path):
+    assert _export(parquet_path, "fish_family=Labridae") is None
+    assert _export(parquet_path, "sample_date_after=not-a-date") is None
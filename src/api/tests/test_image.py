@@ -1,11 +1,36 @@
 import copy
+import datetime
+import uuid
+from io import StringIO
+from unittest.mock import patch
 
 import pytest
+from django.conf import settings
 from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
 from django.test import override_settings
 from django.urls import reverse
-
-from api.models import Annotation, Classifier, Image, Point
+from django.utils import timezone
+
+from api.models import (
+    BENTHICPQT_PROTOCOL,
+    Annotation,
+    ArchivedRecord,
+    ClassificationStatus,
+    Classifier,
+    CollectRecord,
+    Image,
+    Point,
+)
+from api.utils.classification import (
+    _claim_images,
+    _classify_images,
+    _point_layout_checksum,
+    _replace_classification_results,
+    generate_points,
+)
+from api.utils import point_layouts
+from api.utils.image_cleanup import delete_orphaned_images
 
 
 @pytest.fixture
@@ -13,18 +38,18 @@ def classifier():
     return Classifier.objects.create(name="Test classifier", version="v0", patch_size=144)
 
 
-@pytest.fixture
-def image(valid_benthic_pq_transect_collect_record):
+def _image_file():
     with open("api/tests/data/test_image.jpg", "rb") as f:
         content = f.read()
 
-    image_file = SimpleUploadedFile(
-        name="test_image.jpg", content=content, content_type="image/jpeg"
-    )
+    return SimpleUploadedFile(name="test_image.jpg", content=content, content_type="image/jpeg")
 
+
+@pytest.fixture
+def image(valid_benthic_pq_transect_collect_record):
     return Image.objects.create(
         collect_record_id=valid_benthic_pq_transect_collect_record.pk,
-        image=image_file,
+        image=_image_file(),
         name="Test image",
     )
 
@@ -279,3 +304,194 @@ def test_classification_status_is_none_when_no_statuses(
     response = api_client1.get(url, format="json")
     assert response.status_code == 200
     assert response.json()["classification_status"] is None
+
+
+def test_claim_images_batches_pending_images(image, valid_benthic_pq_transect_collect_record):
+    other_image = Image.objects.create(
+        collect_record_id=valid_benthic_pq_transect_collect_record.pk, image=_image_file()
+    )
+    completed_image = Image.objects.create(
+        collect_record_id=valid_benthic_pq_transect_collect_record.pk, image=_image_file()
+    )
+    for img in (image, other_image):
+        ClassificationStatus.objects.create(image=img, status=ClassificationStatus.PENDING)
+    ClassificationStatus.objects.create(
+        image=completed_image, status=ClassificationStatus.COMPLETED
+    )
+
+    claimed = _claim_images(image.pk, 10)
+    assert claimed == [image.pk, other_image.pk]
+    assert (
+        ClassificationStatus.objects.filter(
+            image__in=claimed, status=ClassificationStatus.RUNNING
+        ).count()
+        == 2
+    )
+
+    # Queued job for an image claimed by another batch is a no-op
+    assert _claim_images(other_image.pk, 10) == []
+
+
+def test_claim_images_reclaims_abandoned_images(image):
+    ClassificationStatus.objects.filter(image=image).delete()
+    ClassificationStatus.objects.create(image=image, status=ClassificationStatus.RUNNING)
+    assert _claim_images(image.pk, 10) == []
+
+    # Running for longer than the timeout, e.g. its worker died
+    ClassificationStatus.objects.filter(image=image).update(
+        created_on=timezone.now()
+        - datetime.timedelta(seconds=settings.CLASSIFICATION_RUNNING_TIMEOUT + 1)
+    )
+    assert _claim_images(image.pk, 10) == [image.pk]
+
+
+def test_replace_classification_results_keeps_confirmed_points(
+    image, point, annotations, classifier, benthic_attribute_1, benthic_attribute_3
+):
+    other_point = Point.objects.create(image=image, row=10, column=10)
+    Annotation.objects.create(
+        classifier=classifier,
+        point=other_point,
+        benthic_attribute=benthic_attribute_1,
+        score=60,
+        is_machine_created=True,
+    )
+    new_classifier = Classifier.objects.create(name="New classifier", version="v1", patch_size=144)
+    label_ids = [str(benthic_attribute_1.pk), str(benthic_attribute_3.pk)]
+    score_sets = [(0, 0, [0.1, 0.9]), (10, 10, [0.2, 0.8])]
+
+    _replace_classification_results(image, score_sets, label_ids, new_classifier)
+
+    assert Annotation.objects.filter(point=point).count() == len(annotations)
+    other_annotations = list(Annotation.objects.filter(point=other_point))
+    assert len(other_annotations) == 1
+    assert other_annotations[0].benthic_attribute_id == benthic_attribute_3.pk
+    assert other_annotations[0].classifier == new_classifier
+
+
+def test_point_layout_checksum_ignores_order():
+    assert _point_layout_checksum([(1, 2), (3, 4)]) == _point_layout_checksum([(3, 4), (1, 2)])
+    assert _point_layout_checksum([(1, 2)]) != _point_layout_checksum([(2, 1)])
+
+
+def test_partial_update_bulk_confirm(
+    db_setup,
+    api_client1,
+    project1,
+    image,
+    point,
+    annotations,
+    benthic_attribute_4,
+    django_assert_max_num_queries,
+):
+    other_point = Point.objects.create(image=image, row=10, column=10)
+    url = reverse("image-detail", kwargs={"project_pk": str(project1.pk), "pk": str(image.pk)})
+    data = api_client1.get(url, format="json").json()
+
+    for point_data in data["points"]:
+        if point_data["id"] == str(other_point.pk):
+            point_data["annotations"] = [
+                {
+                    "benthic_attribute": str(benthic_attribute_4.pk),
+                    "growth_form": None,
+                    "is_confirmed": True,
+                }
+            ]
+
+    with django_assert_max_num_queries(30):
+        response = api_client1.patch(url, data, format="json")
+
+    assert response.status_code == 200
+    updated_data = response.json()
+    assert updated_data["num_confirmed"] == 2
+    assert updated_data["num_unconfirmed"] == 0
+    assert updated_data["num_unclassified"] == 0
+
+    user_annotations = Annotation.objects.filter(point=other_point)
+    assert user_annotations.count() == 1
+    assert user_annotations[0].is_machine_created is False
+    assert user_annotations[0].score == 100
+
+
+def test_delete_orphaned_images_in_bulk(
+    image, point, annotations, django_capture_on_commit_callbacks
+):
+    orphaned_image = Image.objects.create(collect_record_id=uuid.uuid4(), image=_image_file())
+    orphaned_point = Point.objects.create(image=orphaned_image, row=0, column=0)
+    ClassificationStatus.objects.create(image=orphaned_image, status=ClassificationStatus.COMPLETED)
+    image_file_name = orphaned_image.image.name
+
+    with (
+        patch("api.utils.image_cleanup.s3_utils.delete_files", return_value=[]) as delete_files,
+        django_capture_on_commit_callbacks(execute=True),
+    ):
+        count = delete_orphaned_images([orphaned_image.pk, image.pk], chunk_size=10)
+
+    # Image with a collect record is not an orphan
+    assert count == 1
+    assert list(Image.objects.values_list("id", flat=True)) == [image.pk]
+    assert Point.objects.filter(pk=orphaned_point.pk).exists() is False
+    assert ClassificationStatus.objects.filter(image_id=orphaned_image.pk).exists() is False
+    assert set(ArchivedRecord.objects.values_list("model", "record_pk")) == {
+        ("image", orphaned_image.pk),
+        ("point", orphaned_point.pk),
+    }
+
+    assert delete_files.call_count == 1
+    blob_names = delete_files.call_args.args[1]
+    assert any(name.endswith(image_file_name) for name in blob_names)
+
+
+def test_warm_classifier_cache(classifier):
+    out = StringIO()
+    with patch(
+        "tools.management.commands.warm_classifier_cache.cache_classifier_artifacts",
+        return_value={"/tmp/classifier.pkl": "abc"},
+    ) as cache_classifier_artifacts:
+        call_command("warm_classifier_cache", "--classifier-version", "v0", stdout=out)
+
+    cache_classifier_artifacts.assert_called_once_with(classifier)
+    assert "Classifier v0 cached." in out.getvalue()
+
+
+def test_project_point_layout_sets_num_points_per_quadrat(classifier, project1, profile1):
+    project1.data = {
+        point_layouts.POINT_LAYOUT_DATA_KEY: {
+            "strategy": point_layouts.STRATIFIED_RANDOM,
+            "num_points": 50,
+        }
+    }
+    project1.save()
+
+    collect_record = CollectRecord.objects.create(
+        project=project1,
+        profile=profile1,
+        data={
+            "image_classification": True,
+            "protocol": BENTHICPQT_PROTOCOL,
+            "quadrat_transect": {"num_quadrats": 1},
+        },
+    )
+    assert collect_record.data["classifier_id"] == str(classifier.pk)
+    assert collect_record.data["quadrat_transect"]["num_points_per_quadrat"] == 50
+
+    image = Image.objects.create(collect_record_id=collect_record.pk, image=_image_file())
+    layout_options = point_layouts.get_images_layout_options([image], classifier.num_points)
+    assert len(generate_points(image, **layout_options[image.pk])) == 50
+
+
+def test_classify_images_fails_batch_on_invalid_point_layout(image, classifier):
+    with (
+        patch(
+            "api.utils.classification._get_resident_models",
+            return_value=(None, None, classifier, "checksum"),
+        ),
+        patch(
+            "api.utils.classification.point_layouts.get_images_layout_options",
+            side_effect=ValueError("Invalid point layout"),
+        ),
+    ):
+        _classify_images([image.pk])
+
+    status = ClassificationStatus.objects.filter(image=image).order_by("-created_on").first()
+    assert status.status == ClassificationStatus.FAILED
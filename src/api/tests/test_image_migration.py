@@ -0,0 +1,89 @@
+from unittest.mock import patch
+
+import botocore
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+
+from api.models import Image
+from api.utils.image_migration import migrate_project_images
+
+CONFIGS = {
+    "old-bucket": {"bucket": "old-bucket", "s3_path": "old/", "access_key": "k", "secret_key": "s"},
+    "new-bucket": {"bucket": "new-bucket", "s3_path": "new/", "access_key": "k", "secret_key": "s"},
+}
+
+
+class LocalS3:
+    """In-memory stand-in for the S3 client calls used by image migration."""
+
+    def __init__(self):
+        self.objects = {}
+        self.delete_requests = 0
+
+    def copy_object(self, Bucket, CopySource, Key):
+        source = (CopySource["Bucket"], CopySource["Key"])
+        if source not in self.objects:
+            raise botocore.exceptions.ClientError({"Error": {"Code": "NoSuchKey"}}, "CopyObject")
+        self.objects[(Bucket, Key)] = self.objects[source]
+
+    def delete_objects(self, Bucket, Delete):
+        self.delete_requests += 1
+        for obj in Delete["Objects"]:
+            self.objects.pop((Bucket, obj["Key"]), None)
+        return {}
+
+
+@pytest.fixture
+def local_s3():
+    s3 = LocalS3()
+    with (
+        patch("api.utils.image_migration.s3_utils.get_client", return_value=s3),
+        patch("api.utils.image_migration.get_image_storage_config", side_effect=CONFIGS.get),
+    ):
+        yield s3
+
+
+@pytest.fixture
+def project_images(valid_benthic_pq_transect_collect_record):
+    with open("api/tests/data/test_image.jpg", "rb") as f:
+        content = f.read()
+
+    return [
+        Image.objects.create(
+            collect_record_id=valid_benthic_pq_transect_collect_record.pk,
+            image=SimpleUploadedFile(
+                name="test_image.jpg", content=content, content_type="image/jpeg"
+            ),
+            image_bucket="old-bucket",
+        )
+        for _ in range(3)
+    ]
+
+
+def _source_keys(image):
+    return [f"old/{image.image.name}", f"old/{image.thumbnail.name}"]
+
+
+def test_migrate_project_images_resumes(
+    local_s3, project_images, valid_benthic_pq_transect_collect_record
+):
+    project_id = valid_benthic_pq_transect_collect_record.project_id
+    for image in project_images:
+        image.refresh_from_db()
+        for key in _source_keys(image):
+            local_s3.objects[("old-bucket", key)] = b"data"
+
+    # Missing source file: this image fails and stays in the old bucket
+    failing_key = _source_keys(project_images[0])[0]
+    del local_s3.objects[("old-bucket", failing_key)]
+
+    assert migrate_project_images(project_id, "old-bucket", "new-bucket", max_workers=2) == 2
+    assert local_s3.delete_requests == 1
+    assert Image.objects.filter(image_bucket="new-bucket").count() == 2
+    assert Image.objects.get(pk=project_images[0].pk).image_bucket == "old-bucket"
+
+    local_s3.objects[("old-bucket", failing_key)] = b"data"
+    assert migrate_project_images(project_id, "old-bucket", "new-bucket") == 1
+    assert Image.objects.filter(image_bucket="new-bucket").count() == 3
+    assert not [key for key in local_s3.objects if key[0] == "old-bucket"]
+    assert len(local_s3.objects) == 6
@@ -1,8 +1,18 @@
-from api.models import FISHBELT_PROTOCOL, ProjectProfile, SummarySampleEventModel
+import pytest
+
+from api.models import (
+    FISHBELT_PROTOCOL,
+    AuditRecord,
+    BeltFish,
+    CollectRecord,
+    ObsBeltFish,
+    ProjectProfile,
+    SummarySampleEventModel,
+)
 from api.resources.sampleunitmethods.beltfishmethod import BeltFishMethodSerializer
-from api.submission.utils import write_collect_record
+from api.submission.utils import SUCCESS_STATUS, write_collect_record
 from api.utils import Testing
-from api.utils.sample_unit_methods import edit_transect_method
+from api.utils.sample_unit_methods import edit_transect_method, edit_transect_methods
 from api.utils.summary_cache import update_summary_cache
 
 
@@ -21,6 +31,27 @@ def test_project_edit_tracking(valid_collect_record, profile1_request):
         assert beltfish_su_count == 1
 
 
+def test_write_collect_record_bulk_creates_observations(
+    valid_collect_record, profile1, profile1_request
+):
+    with Testing():
+        collect_record_id = valid_collect_record.id
+        project = valid_collect_record.project
+        updated_on = project.updated_on
+        num_obs = len(valid_collect_record.data["obs_belt_fishes"])
+
+        status, _ = write_collect_record(valid_collect_record, profile1_request)
+        assert status == SUCCESS_STATUS
+
+        belt_fish = BeltFish.objects.get(collect_record_id=collect_record_id)
+        observations = ObsBeltFish.objects.filter(beltfish=belt_fish)
+        assert observations.count() == num_obs
+        assert all(o.created_by == profile1 and o.updated_by == profile1 for o in observations)
+
+        project.refresh_from_db()
+        assert project.updated_on > updated_on
+
+
 def test_edit_transect_method(belt_fish_project, belt_fish1, profile1, profile1_request):
     with Testing():
         project_id = belt_fish1.transect.sample_event.site.project_id
@@ -45,6 +76,62 @@ def test_edit_transect_method(belt_fish_project, belt_fish1, profile1, profile1_
         assert summary_se_count == 1
 
 
+def test_edit_transect_methods(
+    belt_fish_project, belt_fish1, belt_fish2, profile1, profile1_request
+):
+    with Testing():
+        pks = [belt_fish1.pk, belt_fish2.pk]
+
+        collect_records = edit_transect_methods(
+            BeltFishMethodSerializer,
+            profile1,
+            profile1_request,
+            pks,
+            FISHBELT_PROTOCOL,
+            project_pk=belt_fish1.transect.sample_event.site.project_id,
+        )
+
+        assert [cr.data["sample_unit_method_id"] for cr in collect_records] == [
+            str(pk) for pk in pks
+        ]
+        assert CollectRecord.objects.filter(
+            id__in=[cr.pk for cr in collect_records], profile=profile1
+        ).count() == len(pks)
+        assert all(cr.data["observers"][0]["email"] for cr in collect_records)
+        assert BeltFish.objects.filter(id__in=pks).exists() is False
+        assert (
+            AuditRecord.objects.filter(
+                event_type=AuditRecord.EDIT_RECORD_EVENT_TYPE, record_id__in=pks
+            ).count()
+            == 2
+        )
+
+
+def test_edit_transect_methods_of_other_project(
+    belt_fish_project, belt_fish1, belt_fish2, project2, profile1, profile1_request
+):
+    with Testing():
+        pks = [belt_fish1.pk, belt_fish2.pk]
+
+        with pytest.raises(BeltFish.DoesNotExist):
+            edit_transect_methods(
+                BeltFishMethodSerializer,
+                profile1,
+                profile1_request,
+                pks,
+                FISHBELT_PROTOCOL,
+                project_pk=project2.pk,
+            )
+
+        assert BeltFish.objects.filter(id__in=pks).count() == len(pks)
+        assert (
+            CollectRecord.objects.filter(
+                data__sample_unit_method_id__in=[str(pk) for pk in pks]
+            ).exists()
+            is False
+        )
+
+
 def test_edit_site(belt_fish_project, site1):
     with Testing():
         project_id = site1.project_id
@@ -0,0 +1,63 @@
+import datetime
+
+import pytest
+from django.contrib.gis.geos import Point
+
+from api.reports import formatters
+from api.reports.fields import ReportField, ReportMethodField
+
+
+class Field:
+    alias = "covariate_a"
+    protocol = "beltfish"
+    key = "biomass_kgha_avg"
+
+
+@pytest.mark.parametrize(
+    "formatter,values",
+    [
+        (formatters.to_str, [None, 1, "a", datetime.time(10, 30)]),
+        (formatters.to_float, [None, 1, "2.5"]),
+        (formatters.to_latitude, [None, Point(1, 2)]),
+        (formatters.to_longitude, [None, Point(1, 2)]),
+        (formatters.to_year, [None, datetime.date(2020, 5, 6)]),
+        (formatters.to_month, [None, datetime.date(2020, 5, 6)]),
+        (formatters.to_day, [None, datetime.date(2020, 5, 6)]),
+        (formatters.to_join_list, [None, [], ["a", "b"]]),
+        (formatters.to_governance, [None, ["a", "b"]]),
+        (formatters.to_names, [None, [{"name": "a"}, {"name": "b"}]]),
+        (
+            formatters.to_life_history,
+            [None, [{"name": "biomass_kgha_avg", "proportion": 0.5}], [{"name": "x"}]],
+        ),
+        (
+            formatters.to_protocol_value,
+            [
+                None,
+                {},
+                {"beltfish": {"biomass_kgha_avg": 10}},
+                {"beltfish": {"biomass_kgha_avg": {"a": 1, "b": 2}}},
+            ],
+        ),
+        (
+            formatters.to_covariate,
+            [None, [], [{"name": "covariate_a", "value": [{"name": "x", "area": 1}]}]],
+        ),
+        (formatters.to_yesno, [None, True, False]),
+        (formatters.to_data_policy, [None, 10, 50]),
+    ],
+)
+def test_column_formatters_match_cell_formatters(formatter, values):
+    field = Field()
+    expected = [formatter(v, field, None, None) for v in values]
+    assert formatter.column(values, field, None) == expected
+
+
+def test_report_field_is_column_formattable():
+    assert ReportField("site_name").is_column_formattable is True
+    assert ReportField("sample_date", formatter=formatters.to_year).is_column_formattable is True
+    assert (
+        ReportField("protocols", formatter=formatters.to_colonies_bleached).is_column_formattable
+        is False
+    )
+    assert ReportMethodField("get_value").is_column_formattable is False
@@ -0,0 +1,49 @@
+import csv
+import gzip
+import io
+from unittest.mock import patch
+
+from api.utils import summary_csv_cache
+
+
+def test_cache_csv_streams_gzip_upload():
+    uploaded = {}
+
+    def _cache_fileobj(key, fileobj, **kwargs):
+        uploaded["key"] = key
+        uploaded["content"] = fileobj.read()
+        uploaded.update(kwargs)
+
+    with patch("api.utils.summary_csv_cache.cached.cache_fileobj", side_effect=_cache_fileobj):
+        summary_csv_cache._cache_csv("key", ["a", "b"], [(1, "x"), (2, None)], "abc")
+
+    assert uploaded["key"] == "key"
+    assert uploaded["content_type"] == "text/csv"
+    assert uploaded["content_encoding"] == "gzip"
+    assert uploaded["metadata"] == {"checksum": "abc"}
+
+    text = gzip.decompress(uploaded["content"]).decode("utf-8")
+    assert text.startswith('"a","b"\r\n')
+    assert list(csv.reader(io.StringIO(text))) == [["a", "b"], ["1", "x"], ["2", ""]]
+
+
+def test_is_cached():
+    with patch("api.utils.summary_csv_cache.cached.get_metadata", return_value=None):
+        assert summary_csv_cache._is_cached("key", "abc") is False
+
+    with patch("api.utils.summary_csv_cache.cached.get_metadata", return_value={"checksum": "old"}):
+        assert summary_csv_cache._is_cached("key", "abc") is False
+
+    with (
+        patch("api.utils.summary_csv_cache.cached.get_metadata", return_value={"checksum": "abc"}),
+        patch("api.utils.summary_csv_cache.cached.exists", return_value=True) as exists,
+    ):
+        assert summary_csv_cache._is_cached("key", "abc") is True
+        exists.assert_called_once_with("key.parquet")
+
+    # Missing Parquet companion, e.g. after a failed upload
+    with (
+        patch("api.utils.summary_csv_cache.cached.get_metadata", return_value={"checksum": "abc"}),
+        patch("api.utils.summary_csv_cache.cached.exists", return_value=False),
+    ):
+        assert summary_csv_cache._is_cached("key", "abc") is False
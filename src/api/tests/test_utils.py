@@ -1,22 +1,37 @@
 import datetime
+import hashlib
 import io
 import pathlib
 import struct
 import zlib
 from fractions import Fraction
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 
+import pandas as pd
 import pytest
 from PIL import Image as PILImage
 
-from api.models import BenthicTransect, QuadratCollection, QuadratTransect, SampleUnit
-from api.utils import get_subclasses
+from api.models import (
+    BenthicTransect,
+    Project,
+    QuadratCollection,
+    QuadratTransect,
+    SampleUnit,
+)
+from api.utils import get_subclasses, point_layouts
 from api.utils.classification import (
+    _ARTIFACT_CHECKSUMS,
+    _get_artifact,
     _normalize_exif_value,
+    _process_annotations_df,
+    export_annotations_parquet,
     extract_datetime_stamp,
     extract_location,
+    get_changed_partitions,
+    process_uploaded_image,
     store_exif,
 )
+from api.utils.dbutils import iter_queryset, queryset_chunks, sql_chunks
 
 _DATA_DIR = pathlib.Path(__file__).resolve().parent / "data"
 
@@ -226,3 +241,207 @@ def test_normalize_exif_value(value, expected):
     assert result == expected
     if expected is not None:
         assert type(result) is type(expected)  # 42 must stay int, not become 42.0
+
+
+def test_queryset_chunks(project1, project2, project3, project4):
+    qs = Project.objects.order_by("name").values_list("name", flat=True)
+    chunks = list(queryset_chunks(qs, chunk_size=3))
+    assert [len(c) for c in chunks] == [3, 1]
+    assert [n for c in chunks for n in c] == list(qs)
+    assert list(iter_queryset(qs, chunk_size=2)) == list(qs)
+
+    sql = f'SELECT name FROM "{Project._meta.db_table}" ORDER BY name'
+    rows = [r[0] for c in sql_chunks(sql, chunk_size=3) for r in c]
+    assert rows == list(qs)
+
+
+def test_process_annotations_df_looks_up_each_site_once():
+    site_regions = {"site-1": {"region_id": "region-1", "region_name": "Region 1"}}
+    site_to_region = {}
+
+    def _chunk(site_ids):
+        return pd.DataFrame(
+            {
+                "id": [f"anno-{n}" for n in range(len(site_ids))],
+                "point__image_id": ["image-1"] * len(site_ids),
+                "site_id": site_ids,
+            }
+        )
+
+    with patch(
+        "api.utils.classification.get_site_regions", return_value=site_regions
+    ) as get_site_regions:
+        df = _process_annotations_df(_chunk(["site-1", None]), site_to_region)
+        _process_annotations_df(_chunk(["site-1"]), site_to_region)
+
+    assert get_site_regions.call_count == 1
+    assert "site_id" not in df.columns
+    assert df["region_id"].tolist() == ["region-1", pd.NA]
+    assert df["region_name"].tolist() == ["Region 1", pd.NA]
+
+
+def test_get_changed_partitions():
+    last_updated = datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc)
+    partitions = {
+        "unchanged": {"num_annotations": 10, "last_updated": last_updated.isoformat()},
+        "deleted_annotation": {"num_annotations": 10, "last_updated": last_updated.isoformat()},
+        "edited": {"num_annotations": 10, "last_updated": last_updated.isoformat()},
+    }
+    stats = {
+        "unchanged": (10, last_updated),
+        "deleted_annotation": (9, last_updated),
+        "edited": (10, last_updated + datetime.timedelta(seconds=1)),
+        "new": (1, last_updated),
+    }
+
+    assert get_changed_partitions(partitions, stats) == ["deleted_annotation", "edited", "new"]
+
+
+@pytest.mark.parametrize("legacy_file", [True, False])
+def test_export_annotations_parquet_full_deletes_removed_partitions(settings, legacy_file):
+    settings.ANNOTATIONS_PARQUET_LEGACY_FILE = legacy_file
+    last_updated = datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc)
+    manifest = {
+        "partitions": {
+            "kept": {"num_annotations": 10, "last_updated": last_updated.isoformat()},
+            "removed": {"num_annotations": 10, "last_updated": last_updated.isoformat()},
+        }
+    }
+    with (
+        patch("api.utils.classification._read_annotations_manifest", return_value=manifest),
+        patch(
+            "api.utils.classification.get_annotation_partition_stats",
+            return_value={"kept": (10, last_updated)},
+        ),
+        patch("api.utils.classification._export_partition", return_value=True) as export,
+        patch("api.utils.classification._update_legacy_annotations_file") as update_legacy,
+        patch("api.utils.classification.file_exists", return_value=True),
+        patch("api.utils.classification.delete_file") as delete_file,
+        patch("api.utils.classification._write_annotations_manifest") as write_manifest,
+    ):
+        export_annotations_parquet(full=True)
+
+    assert export.call_count == 1
+    assert list(write_manifest.call_args.args[0]["partitions"]) == ["kept"]
+
+    deleted_keys = [c.args[1] for c in delete_file.call_args_list]
+    assert "project_id=removed/" in deleted_keys[0]
+    if legacy_file:
+        # The single file export is kept in sync
+        assert update_legacy.call_count == 1
+        assert len(deleted_keys) == 1
+    else:
+        # and only deleted once a full export has succeeded
+        assert update_legacy.call_count == 0
+        assert deleted_keys[1] == f"{settings.IMAGE_S3_PATH}mermaid_confirmed_annotations.parquet"
+
+
+def test_process_uploaded_image_rotates_and_derives_files():
+    buf = io.BytesIO()
+    exif = PILImage.Exif()
+    exif[0x0112] = 6  # Orientation: rotate 90 CW
+    PILImage.new("RGB", (1200, 800), "red").save(buf, format="JPEG", exif=exif)
+
+    instance = _make_instance(buf.getvalue())
+    instance.name = "image.png"
+    process_uploaded_image(instance)
+
+    assert (instance.original_image_width, instance.original_image_height) == (800, 1200)
+    normalized = instance._normalized_image_buf.getvalue()
+    assert instance.original_image_checksum == hashlib.sha256(normalized).hexdigest()
+    with PILImage.open(io.BytesIO(normalized)) as img:
+        assert img.size == (800, 1200)
+        assert not img.getexif()
+    with PILImage.open(io.BytesIO(instance._thumbnail_file.read())) as thumb:
+        assert max(thumb.size) == 500
+    assert instance._thumbnail_file.name == "image_thumbnail.png"
+
+
+def test_process_uploaded_image_invalid():
+    instance = _make_instance(b"not an image")
+    with pytest.raises(ValueError):
+        process_uploaded_image(instance)
+
+
+def test_get_artifact_verifies_and_reuses_download(tmp_path):
+    content = b"weights"
+    checksum = hashlib.sha256(content).hexdigest()
+    local_path = str(tmp_path / "v1" / "efficientnet_weights.pt")
+
+    def _download(bucket, key, path):
+        pathlib.Path(path).write_bytes(content)
+
+    with (
+        patch("api.utils.classification.download_file", side_effect=_download) as download,
+        patch("api.utils.classification.get_object_metadata", return_value={"sha256": checksum}),
+    ):
+        assert _get_artifact("classifier/v1/weights", local_path) == (local_path, checksum)
+        assert pathlib.Path(local_path).read_bytes() == content
+
+        # Cached file is verified against its recorded checksum, not downloaded again
+        _ARTIFACT_CHECKSUMS.clear()
+        assert _get_artifact("classifier/v1/weights", local_path) == (local_path, checksum)
+        assert download.call_count == 1
+
+        # Corrupt cached file is downloaded again
+        _ARTIFACT_CHECKSUMS.clear()
+        pathlib.Path(local_path).write_bytes(b"partial")
+        assert _get_artifact("classifier/v1/weights", local_path) == (local_path, checksum)
+        assert download.call_count == 2
+
+    _ARTIFACT_CHECKSUMS.clear()
+    with (
+        patch("api.utils.classification.download_file", side_effect=_download),
+        patch("api.utils.classification.get_object_metadata", return_value={"sha256": "bad"}),
+    ):
+        with pytest.raises(ValueError):
+            _get_artifact("classifier/v2/weights", str(tmp_path / "v2" / "weights.pt"))
+    assert not (tmp_path / "v2" / "weights.pt").exists()
+
+
+def test_get_point_layout():
+    grid = point_layouts.get_point_layout(3000, 4000, 25, point_layouts.GRID)
+    assert len(grid) == 25
+    assert grid[0] == (500, 666)
+
+    layout = point_layouts.get_point_layout(
+        3000, 4000, 50, point_layouts.STRATIFIED_RANDOM, (100, 100)
+    )
+    assert len(layout) == len(set(layout)) == 50
+    assert all(100 <= row < 2900 and 100 <= col < 3900 for row, col in layout)
+    assert point_layouts._stratified_random_layout(3000, 4000, 50, (100, 100)) == list(layout)
+
+    with pytest.raises(ValueError):
+        point_layouts.get_point_layout(3000, 4000, 25, "unknown")
+
+    with pytest.raises(ValueError):
+        point_layouts.get_point_layout(3000, 4000, 50, point_layouts.GRID)
+
+
+def test_get_layout_options(project1):
+    assert point_layouts.get_layout_options(project1, 16) == {
+        "strategy": point_layouts.GRID,
+        "num_points": 16,
+        "margin": (0, 0),
+    }
+
+    project1.data = {
+        point_layouts.POINT_LAYOUT_DATA_KEY: {
+            "strategy": point_layouts.STRATIFIED_RANDOM,
+            "num_points": 50,
+            "margin": [100, 100],
+        }
+    }
+    assert point_layouts.get_layout_options(project1, 16) == {
+        "strategy": point_layouts.STRATIFIED_RANDOM,
+        "num_points": 50,
+        "margin": (100, 100),
+    }
+
+    # A grid of 50 points isn't square, fall back to the default layout
+    project1.data[point_layouts.POINT_LAYOUT_DATA_KEY]["strategy"] = point_layouts.GRID
+    assert point_layouts.get_layout_options(project1, 16) == {
+        "strategy": point_layouts.GRID,
+        "num_points": 16,
+        "margin": (0, 0),
+    }
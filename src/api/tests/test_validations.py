@@ -1,4 +1,20 @@
+import copy
+import json
+import threading
+import time
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from api.models import ArchivedRecord, AuditRecord, BeltFish, CollectRecord
 from api.resources.collect_record import CollectRecordSerializer
+from api.submission.utils import (
+    _validate_records,
+    submit_collect_records,
+    validate_collect_records,
+)
 from api.submission.validations import (
     ERROR,
     IGNORE,
@@ -13,6 +29,13 @@ from api.submission.validations import (
     bleaching_quadrat_collection,
     habitat_complexity,
 )
+from api.submission.validations.base import Validation
+from api.submission.validations.lookups import ValidationLookups
+from api.submission.validations.validators import (
+    DepthValidator,
+    FishCountValidator,
+    UniqueFishbeltTransectValidator,
+)
 
 
 def _get_result_status(validator_results, validator_name):
@@ -410,3 +433,178 @@ def test_family_observation_passes_validation(
         request=profile1_request,
     )
     assert overall_status == OK
+
+
+def test_fishbelt_validation_shares_lookups(
+    valid_collect_record, profile1_request, belt_transect_width_condition2
+):
+    lookups = ValidationLookups()
+    runner = ValidationRunner(serializer=CollectRecordSerializer, lookups=lookups)
+    with CaptureQueriesContext(connection) as first_run:
+        overall_status = runner.validate(
+            valid_collect_record, belt_fish.belt_fish_validations, request=profile1_request
+        )
+    assert overall_status == OK
+
+    site_id = valid_collect_record.data["sample_event"]["site"]
+    assert str(lookups.sites.get(site_id).pk) == str(site_id)
+
+    # Reference data is reused by later runs sharing the lookups
+    second_runner = ValidationRunner(serializer=CollectRecordSerializer, lookups=lookups)
+    with CaptureQueriesContext(connection) as second_run:
+        second_runner.validate(
+            valid_collect_record, belt_fish.belt_fish_validations, request=profile1_request
+        )
+
+    assert second_runner.to_dict()["results"] == runner.to_dict()["results"]
+    assert len(second_run.captured_queries) < len(first_run.captured_queries)
+
+
+def test_validate_collect_records_in_bulk(
+    valid_collect_record, profile1, belt_transect_width_condition2
+):
+    other_record = CollectRecord.objects.create(
+        project=valid_collect_record.project,
+        profile=profile1,
+        data=copy.deepcopy(valid_collect_record.data),
+    )
+    record_ids = [str(valid_collect_record.pk), str(other_record.pk)]
+
+    output = validate_collect_records(profile1, record_ids, CollectRecordSerializer)
+
+    assert set(output) == set(record_ids)
+    for record_id, record_output in output.items():
+        assert record_output["status"] == OK
+        assert record_output["record"]["id"] == record_id
+
+    records = CollectRecord.objects.filter(id__in=record_ids)
+    assert {r.stage for r in records} == {CollectRecord.VALIDATED_STAGE}
+    assert len({r.validations["last_validated"] for r in records}) == 1
+
+
+def test_validate_records_in_threads_keeps_order():
+    records = [SimpleNamespace(pk=n) for n in range(8)]
+
+    def _validate(record, *args, **kwargs):
+        # Later records finish first
+        time.sleep(0.01 * (len(records) - record.pk))
+        return {"record": record.pk, "thread": threading.get_ident()}
+
+    with (
+        patch("api.submission.utils._validate_collect_record", side_effect=_validate),
+        patch("api.submission.utils.connection") as conn,
+        patch("api.submission.utils.connections") as conns,
+    ):
+        conn.in_atomic_block = False
+        outputs = _validate_records(records, None, None, None, max_workers=4)
+
+    assert [o["record"] for o in outputs] == [r.pk for r in records]
+    assert len({o["thread"] for o in outputs}) > 1
+    # Connections are closed once per worker, not per record
+    assert conns.close_all.call_count == 4
+
+
+def test_submit_collect_records_in_bulk(
+    valid_collect_record, profile1, belt_transect_width_condition2
+):
+    other_data = copy.deepcopy(valid_collect_record.data)
+    other_data["fishbelt_transect"]["number"] = 2
+    other_record = CollectRecord.objects.create(
+        project=valid_collect_record.project,
+        profile=profile1,
+        data=other_data,
+    )
+    record_ids = [str(valid_collect_record.pk), str(other_record.pk)]
+
+    with patch("api.submission.utils.add_project_to_queue") as add_project_to_queue:
+        output = submit_collect_records(profile1, record_ids, CollectRecordSerializer)
+
+    assert {record_id: o["status"] for record_id, o in output.items()} == {
+        record_id: OK for record_id in record_ids
+    }
+    add_project_to_queue.assert_called_once_with(valid_collect_record.project_id)
+
+    assert CollectRecord.objects.filter(id__in=record_ids).exists() is False
+    assert AuditRecord.objects.filter(
+        record_id__in=record_ids, event_type=AuditRecord.SUBMIT_RECORD_EVENT_TYPE
+    ).count() == len(record_ids)
+    assert ArchivedRecord.objects.filter(record_pk__in=record_ids).count() == len(record_ids)
+
+    # Both records share one sample event
+    belt_fishes = BeltFish.objects.filter(collect_record_id__in=record_ids)
+    assert belt_fishes.count() == len(record_ids)
+    assert len({bf.transect.sample_event_id for bf in belt_fishes}) == 1
+
+
+def test_submit_collect_records_with_duplicate_transect(
+    valid_collect_record, profile1, belt_transect_width_condition2
+):
+    duplicate_record = CollectRecord.objects.create(
+        project=valid_collect_record.project,
+        profile=profile1,
+        data=copy.deepcopy(valid_collect_record.data),
+    )
+    record_ids = [str(valid_collect_record.pk), str(duplicate_record.pk)]
+
+    with patch("api.submission.utils.add_project_to_queue"):
+        output = submit_collect_records(profile1, record_ids, CollectRecordSerializer)
+
+    assert output[record_ids[0]]["status"] == OK
+    assert output[record_ids[1]]["status"] == ERROR
+
+    # Only the first record is submitted
+    assert list(CollectRecord.objects.filter(id__in=record_ids)) == [duplicate_record]
+    assert BeltFish.objects.filter(collect_record_id__in=record_ids).count() == 1
+    duplicate_record.refresh_from_db()
+    assert UniqueFishbeltTransectValidator.DUPLICATE_FISHBELT_TRANSECT in json.dumps(
+        duplicate_record.validations
+    )
+
+
+def test_incremental_validation_reruns_affected_validators(
+    valid_collect_record, profile1, belt_transect_width_condition2
+):
+    record_ids = [str(valid_collect_record.pk)]
+    validate_collect_records(profile1, record_ids, CollectRecordSerializer)
+
+    valid_collect_record.refresh_from_db()
+    assert valid_collect_record.validations["fingerprints"]
+    depth_results = valid_collect_record.validations["results"]["data"]["fishbelt_transect"][
+        "depth"
+    ]
+    depth_results[0]["status"] = IGNORE
+    valid_collect_record.data["obs_belt_fishes"][0]["count"] = 7
+    valid_collect_record.save()
+
+    with (
+        patch.object(
+            DepthValidator, "__call__", autospec=True, side_effect=DepthValidator.__call__
+        ) as depth_validator,
+        patch.object(
+            FishCountValidator, "__call__", autospec=True, side_effect=FishCountValidator.__call__
+        ) as fish_count_validator,
+    ):
+        validate_collect_records(profile1, record_ids, CollectRecordSerializer, incremental=True)
+
+    assert depth_validator.call_count == 0
+    assert fish_count_validator.call_count > 0
+
+    valid_collect_record.refresh_from_db()
+    results = valid_collect_record.validations["results"]
+    assert results["data"]["fishbelt_transect"]["depth"] == depth_results
+
+
+def test_validation_fingerprint_includes_versions_and_parameters():
+    record = {"data": {"fishbelt_transect": {"depth": 5}}}
+    path = "data.fishbelt_transect.depth"
+
+    def _fingerprint(version="1", **kwargs):
+        validation = Validation(validator=DepthValidator(depth_path=path, **kwargs), paths=[path])
+        return validation.get_fingerprint(record, version)
+
+    fingerprint = _fingerprint()
+    assert _fingerprint() == fingerprint
+    assert _fingerprint(version="2") != fingerprint
+    assert _fingerprint(max_depth=30) != fingerprint
+    with patch.object(DepthValidator, "VERSION", "2"):
+        assert _fingerprint() != fingerprint
@@ -1,6 +1,13 @@
+from decimal import Decimal
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from api.models import FishGrouping, FishGroupingRelationship
 from api.resources.collect_record import CollectRecordSerializer
 from api.submission.validations import OK, WARN
 from api.submission.validations.validators import BiomassValidator
+from api.utils.fish_attribute_constants import get_fish_attribute_constants
 
 
 def _get_validator():
@@ -64,3 +71,39 @@ def test_biomass_validator_invalid_values(valid_collect_record, belt_transect_wi
     result = validator(record)
     assert result.status == WARN
     assert result.code == BiomassValidator.LOW_DENSITY
+
+
+def test_fish_attribute_constants_cached(fish_species1):
+    fish_species1.refresh_from_db()
+    fish_attribute_id = str(fish_species1.pk)
+    constants = get_fish_attribute_constants([fish_attribute_id])[fish_attribute_id]
+    assert constants.biomass_constants == (
+        fish_species1.biomass_constant_a,
+        fish_species1.biomass_constant_b,
+        fish_species1.biomass_constant_c,
+    )
+    assert constants.max_length == fish_species1.max_length
+
+    with CaptureQueriesContext(connection) as queries:
+        get_fish_attribute_constants([fish_attribute_id])
+    assert len(queries) == 0
+
+    fish_species1.max_length = 50
+    fish_species1.save()
+    constants = get_fish_attribute_constants([fish_attribute_id])[fish_attribute_id]
+    assert constants.max_length == Decimal("50")
+
+
+def test_fish_attribute_constants_of_groupings_refreshed(fish_species1, region1):
+    fish_species1.refresh_from_db()
+    grouping = FishGrouping.objects.create(name="Grouping")
+    grouping_id = str(grouping.pk)
+    assert get_fish_attribute_constants([grouping_id])[grouping_id].max_length is None
+
+    FishGroupingRelationship.objects.create(grouping=grouping, attribute=fish_species1)
+    grouping.regions.add(region1)
+    constants = get_fish_attribute_constants([grouping_id])[grouping_id]
+    assert constants.max_length == fish_species1.max_length
+
+    grouping.regions.clear()
+    assert get_fish_attribute_constants([grouping_id])[grouping_id].max_length is None
@@ -1,3 +1,7 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from api.models import BeltFish, ObsBeltFish, SampleEvent
 from api.submission.validations import ERROR, OK
 from api.submission.validations.validators import DrySubmitValidator
 
@@ -30,3 +34,19 @@ def test_dry_submit_validator_invalid_fishbelt_transect(valid_collect_record, pr
     result = validator(collect_record, request=profile1_request)
     assert result.status == ERROR
     assert "depth" in result.context["dry_submit_results"]
+
+
+def test_dry_submit_validator_writes_nothing(valid_collect_record, profile1_request):
+    validator = DrySubmitValidator()
+    sample_event_count = SampleEvent.objects.count()
+    obs_count = ObsBeltFish.objects.count()
+
+    with CaptureQueriesContext(connection) as queries:
+        result = validator(valid_collect_record, request=profile1_request)
+
+    assert result.status == OK
+    sqls = [q["sql"].upper() for q in queries.captured_queries]
+    assert not [sql for sql in sqls if sql.startswith(("INSERT", "UPDATE", "DELETE", "SAVEPOINT"))]
+    assert SampleEvent.objects.count() == sample_event_count
+    assert BeltFish.objects.filter(collect_record_id=valid_collect_record.pk).exists() is False
+    assert ObsBeltFish.objects.count() == obs_count
@@ -1,5 +1,8 @@
+import copy
+import uuid
+
 from api.resources.collect_record import CollectRecordSerializer
-from api.submission.validations import ERROR, OK
+from api.submission.validations import ERROR, OK, ValidationLookups
 from api.submission.validations.validators import UniqueFishbeltTransectValidator
 
 
@@ -42,3 +45,25 @@ def test_fishbelt_transect_validator_duplicate_invalid(valid_collect_record, obs
     result = validator(record)
     assert result.status == ERROR
     assert result.code == UniqueFishbeltTransectValidator.DUPLICATE_FISHBELT_TRANSECT
+
+
+def test_fishbelt_transect_validator_duplicate_in_batch(valid_collect_record):
+    validator = _get_validator()
+    record = CollectRecordSerializer(valid_collect_record).data
+    duplicate_record = copy.deepcopy(record)
+    duplicate_record["id"] = str(uuid.uuid4())
+    duplicate_record["data"]["fishbelt_transect"]["depth"] = str(
+        duplicate_record["data"]["fishbelt_transect"]["depth"]
+    )
+    other_record = copy.deepcopy(record)
+    other_record["id"] = str(uuid.uuid4())
+    other_record["data"]["fishbelt_transect"]["number"] += 1
+
+    records = [record, duplicate_record, other_record]
+    lookups = ValidationLookups()
+    lookups.prefetch(records)
+    results = [validator(r, lookups=lookups) for r in records]
+
+    assert [r.status for r in results] == [OK, ERROR, OK]
+    assert results[1].code == UniqueFishbeltTransectValidator.DUPLICATE_FISHBELT_TRANSECT
+    assert results[1].context == {"duplicate_collect_record": record["id"]}
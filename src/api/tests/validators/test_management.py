@@ -1,5 +1,11 @@
+import copy
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
 from api.resources.collect_record import CollectRecordSerializer
 from api.submission.validations import ERROR, OK, WARN
+from api.submission.validations.lookups import ValidationLookups
 from api.submission.validations.validators import UniqueManagementValidator
 
 
@@ -44,6 +50,30 @@ def test_management_validator_invalid_not_unique_site(
     assert result.code == UniqueManagementValidator.NOT_UNIQUE
 
 
+def test_management_validator_batched_not_unique_site(
+    project1, management1, valid_collect_record, benthic_lit1, benthic_lit_project
+):
+    validator = _get_validator()
+    record = CollectRecordSerializer(instance=valid_collect_record).data
+
+    records = []
+    for _ in range(2):
+        management1.id = None
+        management1.save()
+        records.append(copy.deepcopy(record))
+        records[-1]["data"]["sample_event"]["management"] = str(management1.pk)
+
+    lookups = ValidationLookups()
+    lookups.prefetch(records)
+
+    with CaptureQueriesContext(connection) as queries:
+        results = [validator(r, lookups=lookups) for r in records]
+
+    assert len(queries.captured_queries) == 1
+    assert [r.status for r in results] == [WARN, WARN]
+    assert [r.code for r in results] == [UniqueManagementValidator.NOT_UNIQUE] * 2
+
+
 def test_management_validator_invalid_not_unique_name(
     project1, management1, site1, valid_collect_record, benthic_lit_project
 ):
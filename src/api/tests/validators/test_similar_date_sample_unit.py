@@ -1,10 +1,12 @@
 from datetime import timedelta
 
 import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 
 from api.models import BenthicPIT, BenthicTransect, CollectRecord
 from api.resources.collect_record import CollectRecordSerializer
-from api.submission.validations import OK, WARN
+from api.submission.validations import OK, WARN, ValidationLookups
 from api.submission.validations.validators import SimilarDateSampleUnitsValidator
 
 
@@ -176,3 +178,70 @@ def test_similar_date_sample_unit_different_site(
 
     result = validator(record)
     assert result.status == OK
+
+
+def test_similar_date_sample_unit_batched(
+    existing_benthic_pit,
+    benthic_attribute_3,
+    project1,
+    profile1,
+    management1,
+    site1,
+    sample_date1,
+):
+    records = [
+        CollectRecordSerializer(
+            instance=_create_collect_record(
+                project1, profile1, benthic_attribute_3, management1, site1, sample_date
+            )
+        ).data
+        for sample_date in (
+            sample_date1 + timedelta(days=2),
+            sample_date1 + timedelta(days=40),
+            sample_date1 - timedelta(days=5),
+        )
+    ]
+    lookups = ValidationLookups()
+    lookups.prefetch(records)
+
+    validator = _get_validator()
+    with CaptureQueriesContext(connection) as queries:
+        results = [validator(record, lookups=lookups) for record in records]
+
+    assert len(queries.captured_queries) == 1
+    assert [r.status for r in results] == [WARN, OK, WARN]
+    assert results[0].context["days_difference"] == 2
+    assert results[2].context["days_difference"] == 5
+
+
+def test_similar_date_sample_unit_batch_records(
+    benthic_attribute_3,
+    project1,
+    profile1,
+    management1,
+    site1,
+    sample_date1,
+):
+    records = [
+        CollectRecordSerializer(
+            instance=_create_collect_record(
+                project1, profile1, benthic_attribute_3, management1, site1, sample_date
+            )
+        ).data
+        for sample_date in (
+            sample_date1,
+            sample_date1 + timedelta(days=3),
+            sample_date1 + timedelta(days=60),
+        )
+    ]
+    lookups = ValidationLookups()
+    lookups.prefetch(records)
+
+    validator = _get_validator()
+    results = [validator(record, lookups=lookups) for record in records]
+
+    assert [r.status for r in results] == [WARN, WARN, OK]
+    assert results[0].context["similar_dates"] == [
+        {"date": f"{sample_date1 + timedelta(days=3):%Y-%m-%d}", "days_difference": 3}
+    ]
+    assert results[1].context["days_difference"] == 3
@@ -1,17 +1,24 @@
 import gzip
 import hashlib
+import json
 import logging
+import os
 from pathlib import Path
 from tempfile import NamedTemporaryFile
 from typing import Optional
 
+import botocore
 from django.conf import settings
 from django.http import StreamingHttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
 from django.utils.encoding import force_bytes
+from django.utils.http import http_date, quote_etag
 
+from ..models import UnrestrictedProjectSummarySampleEvent
 from . import gzip_file, s3
 
 CACHED_PREFIX = f"{settings.ENVIRONMENT}/cached"
+LOCAL_CHUNK_SIZE = 64 * 1024
 IGNORED_QUERY_PARAMS = (
     "token",
     "field_report",
@@ -101,18 +108,41 @@ def cache_file(key, local_file_path, compress=True, content_type=None):
             compress_file_path.unlink()
 
 
+def cache_fileobj(key, fileobj, content_type=None, content_encoding=None, metadata=None):
+    s3.upload_fileobj(
+        settings.AWS_DATA_BUCKET,
+        fileobj,
+        full_s3_path(key),
+        content_type=content_type,
+        content_encoding=content_encoding,
+        metadata=metadata,
+    )
+
+
+def get_metadata(key):
+    return s3.get_object_metadata(settings.AWS_DATA_BUCKET, full_s3_path(key))
+
+
 def get_cached_textfile(key):
     s3_obj = _get_file_from_s3(key)
     return _cached_text_file(s3_obj) if s3_obj else None
 
 
+def _get_object(key):
+    try:
+        return s3.get_object(settings.AWS_DATA_BUCKET, full_s3_path(key))
+    except botocore.exceptions.ClientError as e:
+        if e.response["Error"]["Code"] in ("NoSuchKey", "404"):
+            return None
+        raise
+
+
 def _get_file_from_s3(key):
     try:
-        if exists(key):
-            s3_obj = s3.get_object(settings.AWS_DATA_BUCKET, full_s3_path(key))
+        s3_obj = _get_object(key)
+        if s3_obj:
             logger.info(f"Content length: {s3_obj['ContentLength']}")
-            return s3_obj
-        return None
+        return s3_obj
     except Exception as e:
         logger.error(f"Failed to get cached file for key {key}: {e}")
     return None
@@ -142,6 +172,157 @@ def exists(key):
     return s3.file_exists(settings.AWS_DATA_BUCKET, full_s3_path(key))
 
 
+def get_project_last_modified(project_id):
+    """
+    Timestamp of the last summary rebuild for a project. Cached files are
+    regenerated as part of the same rebuild, so it doubles as their version.
+    """
+    return (
+        UnrestrictedProjectSummarySampleEvent.objects.filter(project_id=project_id)
+        .values_list("created_on", flat=True)
+        .first()
+    )
+
+
+def make_etag(key, last_modified):
+    return quote_etag(make_key(key, last_modified.isoformat()))
+
+
+def _local_dir():
+    return Path(settings.CACHED_FILES_LOCAL_DIR)
+
+
+def _local_paths(key, last_modified):
+    path = _local_dir() / make_key(key, last_modified.isoformat())
+    return path, path.with_suffix(".json")
+
+
+def _open_local_file(key, last_modified):
+    if not settings.CACHED_FILES_LOCAL_MAX_SIZE or last_modified is None:
+        return None, None
+
+    path, meta_path = _local_paths(key, last_modified)
+    try:
+        meta = json.loads(meta_path.read_text())
+        f = path.open("rb")
+    except (OSError, ValueError):
+        return None, None
+
+    try:
+        # Touching the file on each hit is what makes eviction least-recently-used.
+        os.utime(path)
+    except OSError:
+        pass
+
+    return f, meta
+
+
+def _iter_local_file(f):
+    with f:
+        while chunk := f.read(LOCAL_CHUNK_SIZE):
+            yield chunk
+
+
+def evict_local_files(max_size=None):
+    max_size = settings.CACHED_FILES_LOCAL_MAX_SIZE if max_size is None else max_size
+    local_dir = _local_dir()
+    if not local_dir.exists():
+        return
+
+    entries = []
+    for path in local_dir.iterdir():
+        if path.suffix:
+            continue
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            continue
+        entries.append((stat.st_mtime, stat.st_size, path))
+
+    total_size = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries, key=lambda e: e[0]):
+        if total_size <= max_size:
+            break
+        path.unlink(missing_ok=True)
+        path.with_suffix(".json").unlink(missing_ok=True)
+        total_size -= size
+
+
+def get_local_file(key, last_modified):
+    """
+    Path to a local copy of a cached file, downloading it into the local
+    cache first if needed. Returns None if the file isn't cached.
+    """
+    if last_modified is None:
+        return None
+
+    path, _ = _local_paths(key, last_modified)
+    if path.exists():
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return path
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with NamedTemporaryFile(dir=path.parent, suffix=".tmp", delete=False) as tmp_file:
+        tmp_path = Path(tmp_file.name)
+
+    try:
+        s3.download_file(settings.AWS_DATA_BUCKET, full_s3_path(key), str(tmp_path))
+    except botocore.exceptions.ClientError as e:
+        tmp_path.unlink(missing_ok=True)
+        if e.response["Error"]["Code"] in ("NoSuchKey", "404"):
+            return None
+        raise
+    except Exception:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+    os.replace(tmp_path, path)
+    evict_local_files()
+    return path
+
+
+def _iter_and_store(s3_obj, key, last_modified, meta):
+    """
+    Stream the S3 body to the client while writing a copy to the local cache.
+    The local copy is only made visible once it has been completely written.
+    """
+    body = s3_obj["Body"]
+    path, meta_path = _local_paths(key, last_modified)
+    tmp_file = None
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = NamedTemporaryFile(dir=path.parent, suffix=".tmp", delete=False)
+    except OSError as e:
+        logger.warning(f"Unable to write local cache file for key {key}: {e}")
+
+    try:
+        for chunk in body.iter_chunks():
+            if tmp_file:
+                try:
+                    tmp_file.write(chunk)
+                except OSError as e:
+                    logger.warning(f"Unable to write local cache file for key {key}: {e}")
+                    tmp_file.close()
+                    Path(tmp_file.name).unlink(missing_ok=True)
+                    tmp_file = None
+            yield chunk
+
+        if tmp_file:
+            tmp_file.close()
+            meta_path.write_text(json.dumps(meta))
+            os.replace(tmp_file.name, path)
+            tmp_file = None
+            evict_local_files()
+    finally:
+        body.close()
+        if tmp_file:
+            tmp_file.close()
+            Path(tmp_file.name).unlink(missing_ok=True)
+
+
 def _get_or_none(val, fallback, default=None):
     return val if val is not None else fallback or default
 
@@ -153,12 +334,48 @@ def streaming_response(
     content_type=None,
     content_encoding=None,
     content_disposition="inline",
+    last_modified=None,
 ) -> Optional[StreamingHttpResponse]:
-    if has_filtering_params(request) or not exists(key):
+    """
+    Serve a cached file, or return None if the caller should render it live.
+
+    When `last_modified` is given, the response carries `ETag`/`Last-Modified`
+    validators, conditional requests are answered with 304 without touching S3,
+    and the file is kept in a bounded local disk cache.
+    """
+    if has_filtering_params(request):
         return None
 
+    etag = None
+    if last_modified is not None:
+        etag = make_etag(key, last_modified)
+        not_modified = get_conditional_response(
+            request, etag=etag, last_modified=int(last_modified.timestamp())
+        )
+        if not_modified is not None:
+            not_modified.headers["ETag"] = etag
+            return not_modified
+
     try:
-        s3_obj = s3.get_object(settings.AWS_DATA_BUCKET, full_s3_path(key))
+        local_file, meta = _open_local_file(key, last_modified)
+        if local_file:
+            content = _iter_local_file(local_file)
+            content_length = os.fstat(local_file.fileno()).st_size
+        else:
+            s3_obj = _get_object(key)
+            if s3_obj is None:
+                return None
+
+            meta = {
+                "ContentType": s3_obj.get("ContentType"),
+                "ContentEncoding": s3_obj.get("ContentEncoding"),
+            }
+            content_length = s3_obj.get("ContentLength")
+            if last_modified is not None and settings.CACHED_FILES_LOCAL_MAX_SIZE:
+                content = _iter_and_store(s3_obj, key, last_modified, meta)
+            else:
+                content = s3_obj["Body"].iter_chunks()
+
         file_name = file_name or Path(key).stem
 
         response_args = {
@@ -166,15 +383,22 @@ def streaming_response(
                 "Content-Disposition": f'{content_disposition}; filename="{file_name}"',
             }
         }
-        content_type = _get_or_none(content_type, s3_obj.get("ContentType"))
+        content_type = _get_or_none(content_type, meta.get("ContentType"))
         if content_type:
             response_args["content_type"] = content_type
 
-        content_encoding = _get_or_none(content_encoding, s3_obj.get("ContentEncoding"))
+        content_encoding = _get_or_none(content_encoding, meta.get("ContentEncoding"))
         if content_encoding:
             response_args["headers"]["Content-Encoding"] = content_encoding
 
-        response = StreamingHttpResponse(s3_obj["Body"].iter_chunks(), **response_args)
+        if content_length is not None:
+            response_args["headers"]["Content-Length"] = content_length
+
+        response = StreamingHttpResponse(content, **response_args)
+        if etag:
+            response.headers["ETag"] = etag
+            response.headers["Last-Modified"] = http_date(last_modified.timestamp())
+            patch_cache_control(response, private=True, no_cache=True)
 
         return response
     except Exception as e:
@@ -0,0 +1,236 @@
+"""
+Filterable companions to the cached summary CSVs.
+
+Alongside each cached CSV a Parquet artifact is stored holding the same
+formatted rows plus the raw values of commonly used filter columns. Filtered
+CSV exports that only use supported filters are answered from that artifact
+(with row group statistics pruning date ranges) instead of the summary tables.
+"""
+
+import datetime
+import logging
+from tempfile import NamedTemporaryFile
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from django.utils.text import slugify
+from django_filters import DateFromToRangeFilter
+
+from ..reports import RawCSVReport
+from . import cached
+from .dbutils import iter_queryset
+
+logger = logging.getLogger(__name__)
+
+PARQUET_CONTENT_TYPE = "application/x-parquet"
+PARQUET_ROW_GROUP_SIZE = 10000
+COLUMN_PREFIX = "col_"
+HEADERS_METADATA_KEY = b"mermaid_headers"
+
+# Raw values stored next to the formatted columns so they can be filtered on.
+FILTER_COLUMNS = {
+    "site_id": pa.string(),
+    "site_name": pa.string(),
+    "country_id": pa.string(),
+    "country_name": pa.string(),
+    "management_id": pa.string(),
+    "management_name": pa.string(),
+    "management_name_secondary": pa.string(),
+    "sample_date": pa.date32(),
+}
+
+# Filter name -> (FilterSet method, columns searched). Only applied if the
+# viewset's FilterSet declares the filter with the same method, so cached
+# results match what the FilterSet would return.
+ID_FILTERS = {
+    "site_id": ("id_lookup", ["site_id"]),
+    "country_id": ("id_lookup", ["country_id"]),
+    "management_id": ("id_lookup", ["management_id"]),
+}
+CHAR_FILTERS = {
+    "site_name": ("char_lookup", ["site_name"]),
+    "country_name": ("char_lookup", ["country_name"]),
+    "management_name": (
+        "full_management_name",
+        ["management_name", "management_name_secondary"],
+    ),
+}
+DATE_RANGE_FILTERS = {
+    "sample_date_after": ("sample_date", pc.greater_equal),
+    "sample_date_before": ("sample_date", pc.less_equal),
+}
+
+
+def make_parquet_key(key):
+    return f"{key}.parquet"
+
+
+def _filter_field_names(model_cls):
+    field_names = {f.name for f in model_cls._meta.get_fields()}
+    return [name for name in FILTER_COLUMNS if name in field_names]
+
+
+def _to_str(value):
+    return None if value is None else str(value)
+
+
+def build_table(fields, rows, filter_field_names, filter_values):
+    """
+    `filter_values` must be row aligned with `rows`, one tuple of values per
+    row ordered as `filter_field_names`.
+    """
+    columns = list(zip(*rows)) if rows else [[] for _ in fields]
+    arrays = {
+        f"{COLUMN_PREFIX}{n}": pa.array([_to_str(v) for v in col], type=pa.string())
+        for n, col in enumerate(columns)
+    }
+
+    filter_columns = (
+        list(zip(*filter_values)) if filter_values else [[] for _ in filter_field_names]
+    )
+    for name, col in zip(filter_field_names, filter_columns):
+        arrays[name] = pa.array(
+            [_to_str(v) if FILTER_COLUMNS[name] == pa.string() else v for v in col],
+            type=FILTER_COLUMNS[name],
+        )
+
+    table = pa.table(arrays)
+    headers = "\x1f".join(str(f) for f in fields).encode("utf-8")
+    return table.replace_schema_metadata({HEADERS_METADATA_KEY: headers})
+
+
+def get_filter_values(queryset):
+    """
+    Raw filter column values for each row of `queryset`, in queryset order.
+    """
+    filter_field_names = _filter_field_names(queryset.model)
+    if not filter_field_names:
+        return filter_field_names, []
+    return filter_field_names, list(iter_queryset(queryset.values_list(*filter_field_names)))
+
+
+def cache_filterable_rows(key, fields, rows, filter_field_names, filter_values):
+    if filter_values and len(filter_values) != len(rows):
+        logger.warning(f"Row count mismatch, not caching filterable rows for key {key}")
+        return False
+
+    table = build_table(fields, rows, filter_field_names, filter_values)
+    with NamedTemporaryFile(suffix=".parquet") as f:
+        pq.write_table(table, f.name, row_group_size=PARQUET_ROW_GROUP_SIZE)
+        cached.cache_file(
+            make_parquet_key(key), f.name, compress=False, content_type=PARQUET_CONTENT_TYPE
+        )
+
+    return True
+
+
+def delete_filterable_rows(key):
+    return cached.delete_file(make_parquet_key(key))
+
+
+def _split_values(value):
+    return [v.strip() for v in (value or "").split(",") if v.strip()]
+
+
+def _any_of(expressions):
+    expression = None
+    for e in expressions:
+        expression = e if expression is None else expression | e
+    return expression
+
+
+def get_filter_expression(query_params, filterset_class):
+    """
+    Translate query params into a pyarrow filter expression. Returns None if
+    any of the params can't be answered from the cached artifact.
+    """
+    base_filters = getattr(filterset_class, "base_filters", {})
+    expressions = []
+    for name in query_params:
+        if name.lower() in cached.IGNORED_QUERY_PARAMS:
+            continue
+
+        if name in DATE_RANGE_FILTERS:
+            column, op = DATE_RANGE_FILTERS[name]
+            if not isinstance(base_filters.get(column), DateFromToRangeFilter):
+                return None
+            value = query_params.get(name)
+            if not value:
+                continue
+            try:
+                value = datetime.date.fromisoformat(value)
+            except ValueError:
+                return None
+            expressions.append(op(ds.field(column), pa.scalar(value, type=pa.date32())))
+            continue
+
+        lookup = ID_FILTERS.get(name) or CHAR_FILTERS.get(name)
+        if lookup is None:
+            return None
+        method, columns = lookup
+        if getattr(base_filters.get(name), "method", None) != method:
+            return None
+
+        values = _split_values(query_params.get(name))
+        if not values:
+            continue
+
+        if name in ID_FILTERS:
+            matches = [
+                pc.utf8_lower(ds.field(c)).isin([v.lower() for v in values]) for c in columns
+            ]
+        else:
+            matches = [
+                pc.match_substring(ds.field(c), v, ignore_case=True)
+                for c in columns
+                for v in values
+            ]
+        expressions.append(_any_of(matches))
+
+    expression = None
+    for e in expressions:
+        expression = e if expression is None else expression & e
+
+    return expression if expression is not None else pc.scalar(True)
+
+
+def _iter_rows(dataset, expression):
+    columns = [n for n in dataset.schema.names if n.startswith(COLUMN_PREFIX)]
+    for batch in dataset.to_batches(columns=columns, filter=expression):
+        yield from zip(*(col.to_pylist() for col in batch.columns))
+
+
+def filtered_csv_response(request, key, filterset_class, file_name_prefix, last_modified):
+    """
+    Filtered CSV export served from the cached Parquet artifact, or None if the
+    request can't be answered from it.
+    """
+    expression = get_filter_expression(request.query_params, filterset_class)
+    if expression is None:
+        return None
+
+    try:
+        local_path = cached.get_local_file(make_parquet_key(key), last_modified)
+        if local_path is None:
+            return None
+
+        metadata = pq.read_schema(local_path).metadata
+        headers = metadata[HEADERS_METADATA_KEY].decode("utf-8").split("\x1f")
+        dataset = ds.dataset(str(local_path), format="parquet")
+    except Exception as e:
+        logger.error(f'Failed to read filterable rows for key "{key}": {e}')
+        return None
+
+    time_stamp = timezone.now().strftime("%Y%m%d")
+    file_name = f"{slugify(file_name_prefix)}-{time_stamp}.csv"
+    response = StreamingHttpResponse(
+        RawCSVReport().stream_list(headers, _iter_rows(dataset, expression)),
+        content_type="text/csv",
+    )
+    response["Content-Disposition"] = f'attachment; filename="{file_name}"'
+
+    return response
@@ -1,13 +1,19 @@
 import datetime
+import fcntl
 import hashlib
-import math
+import json
+import logging
 import os
+import shutil
+from contextlib import contextmanager
 from io import BytesIO
 from operator import itemgetter
 from pathlib import Path
 from tempfile import NamedTemporaryFile, TemporaryDirectory
 from typing import Any, Dict, Optional, Tuple
 
+import botocore
+import numpy as np
 import pandas as pd
 import pyarrow as pa
 import pyarrow.parquet as pq
@@ -15,14 +21,16 @@ from django.conf import settings
 from django.contrib.gis.geos import Point as GEOSPoint
 from django.core.files.base import ContentFile, File
 from django.db import IntegrityError, transaction
-from django.db.models import Exists, OuterRef
+from django.db.models import Count, Exists, Max, OuterRef, Q, Subquery
 from django.db.models.fields.files import ImageFieldFile
+from django.db.models.functions import Greatest
 from django.utils import timezone
 from PIL import Image as PILImage
 from PIL.ExifTags import GPSTAGS, TAGS
+from spacer.data_classes import ImageFeatures
 from spacer.extractors import EfficientNetExtractor
-from spacer.messages import ClassifyFeaturesMsg, DataLocation, ExtractFeaturesMsg
-from spacer.tasks import classify_features, extract_features
+from spacer.messages import DataLocation
+from spacer.storage import load_classifier, load_image
 
 from ..models import (
     Annotation,
@@ -37,8 +45,20 @@ from ..models import (
     Site,
 )
 from ..models.classification import get_image_storage_config
+from . import point_layouts
+from .dbutils import queryset_chunks
 from .q import submit_image_job
-from .s3 import download_directory, upload_file
+from .s3 import (
+    delete_file,
+    download_file,
+    file_exists,
+    get_object,
+    get_object_metadata,
+    upload_file,
+    upload_fileobj,
+)
+
+logger = logging.getLogger(__name__)
 
 CLASSIFIER_CONFIG_S3_PATH = "classifier"
 CLASSIFIER_CONFIG_LOCAL_CACHE_DIR = settings.SPACER.get("EXTRACTORS_CACHE_DIR")
@@ -46,6 +66,24 @@ assert CLASSIFIER_CONFIG_LOCAL_CACHE_DIR is not None
 CLASSIFIER_FILE_NAME = "classifier.pkl"
 WEIGHTS_FILE_NAME = "efficientnet_weights.pt"
 ANNOTATIONS_PARQUET_FILE_NAME = "mermaid_confirmed_annotations.parquet"
+THUMBNAIL_SIZE = (500, 500)
+ANNOTATIONS_PARQUET_DATASET_NAME = "mermaid_confirmed_annotations"
+ANNOTATIONS_MANIFEST_FILE_NAME = "manifest.json"
+_OBS_SITE_LOOKUP = "benthic_photo_quadrat_transect__quadrat_transect__sample_event__site"
+# Image.data key describing how the stored feature vector was extracted
+FEATURE_VECTOR_DATA_KEY = "feature_vector"
+
+# Classifier artifacts are verified against the sha256 checksum stored in this
+# S3 object metadata key, if present. The checksum of a downloaded file is
+# kept next to it with ARTIFACT_CHECKSUM_SUFFIX.
+ARTIFACT_CHECKSUM_METADATA_KEY = "sha256"
+ARTIFACT_CHECKSUM_SUFFIX = ".sha256"
+
+# Local artifact path -> sha256 checksum, for files verified by this process
+_ARTIFACT_CHECKSUMS = {}
+
+# Classifier version -> (extractor, classifier, Classifier record, weights checksum)
+_RESIDENT_MODELS = {}
 
 
 def _get_file_for_reading(image_fieldfile: ImageFieldFile):
@@ -63,20 +101,6 @@ def _get_file_for_reading(image_fieldfile: ImageFieldFile):
         return image_fieldfile.file
 
 
-def check_if_valid_image(instance):
-    file_obj = _get_file_for_reading(instance.image)
-
-    try:
-        with PILImage.open(file_obj) as img:
-            img.verify()
-            w, h = img.size
-            if settings.MAX_IMAGE_PIXELS < w * h:
-                raise ValueError(f"Maximum number of pixels is {settings.MAX_IMAGE_PIXELS}.")
-        return
-    except (AttributeError, TypeError, IOError, SyntaxError) as _:
-        raise ValueError("Invalid image.")
-
-
 def create_image_name(image: Image) -> str:
     name = str(image.id)
     image_name = image.image.name
@@ -107,8 +131,6 @@ def create_image_checksum(image: ImageFieldFile, image_buf: Optional[BytesIO] =
 
 
 def create_thumbnail(image_instance: Image, image_buf: Optional[BytesIO] = None) -> ContentFile:
-    size = (500, 500)
-
     if image_buf is not None:
         image_buf.seek(0)
         img = PILImage.open(image_buf)
@@ -118,14 +140,18 @@ def create_thumbnail(image_instance: Image, image_buf: Optional[BytesIO] = None)
             img = PILImage.open(f)
             img.load()
 
-    img.thumbnail(size, PILImage.Resampling.LANCZOS)
+    return _make_thumbnail(image_instance, img, img.format)
+
+
+def _make_thumbnail(image_instance: Image, img: PILImage.Image, image_format: str) -> ContentFile:
+    img.thumbnail(THUMBNAIL_SIZE, PILImage.Resampling.LANCZOS)
 
     base, ext = os.path.splitext(image_instance.name)
     thumb_name = f"{base}_thumbnail{ext}"
 
     thumb_io = BytesIO()
     try:
-        img.save(thumb_io, img.format)
+        img.save(thumb_io, image_format)
     except IOError as io_err:
         print(f"Cannot create thumbnail for [{image_instance.pk}]: {io_err}")
         raise
@@ -151,6 +177,10 @@ _DATETIME_ORIGINAL = 36867  # "YYYY:MM:DD HH:MM:SS"
 _OFFSET_TIME = 36880  # "+HH:MM" — UTC offset for DateTime
 _OFFSET_TIME_ORIGINAL = 36881  # "+HH:MM" — UTC offset for DateTimeOriginal
 
+# IFD0 orientation tag -> counter-clockwise rotation that normalizes it
+_ORIENTATION = 0x0112  # 274
+_ORIENTATION_ROTATIONS = {3: 180, 6: 270, 8: 90}
+
 # Top-level IFD pointer tag IDs
 _GPS_IFD_TAG = 0x8825  # 34853
 _EXIF_IFD_TAG = 0x8769  # 34665
@@ -230,49 +260,7 @@ def extract_location(gps_ifd: Dict[int, Any]) -> Optional[GEOSPoint]:
     return GEOSPoint(longitude, latitude)
 
 
-def save_normalized_imagefile(instance: Image):
-    file_obj = _get_file_for_reading(instance.image)
-
-    with PILImage.open(file_obj) as image_file:
-        image_format = image_file.format
-        try:
-            for orientation in TAGS.keys():
-                if TAGS[orientation] == "Orientation":
-                    break
-
-            exif = dict(image_file.getexif().items())
-
-            if exif[orientation] == 3:
-                image_file = image_file.rotate(180, expand=True)
-            elif exif[orientation] == 6:
-                image_file = image_file.rotate(270, expand=True)
-            elif exif[orientation] == 8:
-                image_file = image_file.rotate(90, expand=True)
-        except (AttributeError, KeyError, IndexError) as _:
-            pass
-
-        # Saving the orientated image back to the image record
-        # strips out the EXIF data, which is intentional.
-        img_content = BytesIO()
-        image_file.save(img_content, format=image_format)
-
-        # Wrap the BytesIO directly (no copy) and stash it for post_save so
-        # thumbnail creation and checksum can read from the buffer already in
-        # memory instead of fetching the file back from S3.
-        img_content.seek(0)
-        instance.image = File(img_content, name=instance.image.name)
-        instance._normalized_image_buf = img_content
-
-
-def store_exif(instance: Image) -> None:
-    file_obj = _get_file_for_reading(instance.image)
-
-    with PILImage.open(file_obj) as img:
-        exif = img.getexif()
-
-    if not exif:
-        return
-
+def _store_exif_details(instance: Image, exif: PILImage.Exif) -> None:
     gps_ifd = exif.get_ifd(_GPS_IFD_TAG)
     exif_ifd = exif.get_ifd(_EXIF_IFD_TAG)
 
@@ -307,6 +295,67 @@ def store_exif(instance: Image) -> None:
     instance.photo_timestamp = extract_datetime_stamp(exif_ifd, gps_ifd)
 
 
+def store_exif(instance: Image) -> None:
+    file_obj = _get_file_for_reading(instance.image)
+
+    with PILImage.open(file_obj) as img:
+        exif = img.getexif()
+
+    if not exif:
+        return
+
+    _store_exif_details(instance, exif)
+
+
+def process_uploaded_image(instance: Image) -> None:
+    """
+    Decode an uploaded image once and derive everything stored with it: EXIF
+    details, the orientation-normalized image file with its dimensions and
+    checksum, and the thumbnail (saved by post_save as `_thumbnail_file`).
+    """
+    file_obj = _get_file_for_reading(instance.image)
+
+    try:
+        img = PILImage.open(file_obj)
+        w, h = img.size
+        if settings.MAX_IMAGE_PIXELS < w * h:
+            raise ValueError(f"Maximum number of pixels is {settings.MAX_IMAGE_PIXELS}.")
+        image_format = img.format
+        exif = img.getexif()
+        img.load()
+    except (AttributeError, TypeError, IOError, SyntaxError) as _:
+        raise ValueError("Invalid image.")
+
+    if exif:
+        try:
+            _store_exif_details(instance, exif)
+        except Exception:
+            logger.exception("Error storing EXIF data")
+
+    rotation = _ORIENTATION_ROTATIONS.get(exif.get(_ORIENTATION))
+    if rotation:
+        rotated = img.rotate(rotation, expand=True)
+        img.close()
+        img = rotated
+
+    # Saving the orientated image back to the image record
+    # strips out the EXIF data, which is intentional.
+    img_content = BytesIO()
+    img.save(img_content, format=image_format)
+
+    # original_* dimensions refer to width/height after correcting for orientation
+    # i.e. original width/height of the image taken with a 'camera on its side'
+    instance.original_image_width, instance.original_image_height = img.size
+    instance.original_image_checksum = hashlib.sha256(img_content.getbuffer()).hexdigest()
+
+    img_content.seek(0)
+    instance.image = File(img_content, name=instance.name)
+    instance._normalized_image_buf = img_content
+    # Thumbnail is resized in place from the already decoded pixels.
+    instance._thumbnail_file = _make_thumbnail(instance, img, image_format)
+    img.close()
+
+
 def create_classification_status(image, status, message=None):
     try:
         with transaction.atomic():
@@ -322,7 +371,12 @@ def create_classification_status(image, status, message=None):
         print(f"Writing classification status Image {image.pk}, status: {status}: {err}")
 
 
-def generate_points(image: Image, num_points: int, margin: Tuple[int, int] = (0, 0)):
+def generate_points(
+    image: Image,
+    num_points: int,
+    margin: Tuple[int, int] = (0, 0),
+    strategy: str = point_layouts.DEFAULT_STRATEGY,
+):
     assert len(margin) == 2
 
     if image.original_image_height and image.original_image_width:
@@ -332,29 +386,86 @@ def generate_points(image: Image, num_points: int, margin: Tuple[int, int] = (0,
         h = image.image.height
         w = image.image.width
 
-    points_per_side = math.ceil(math.sqrt(num_points)) + 1
-    shift_y = (h - 2 * margin[0]) / points_per_side
-    shift_x = (w - 2 * margin[1]) / points_per_side
+    return list(point_layouts.get_point_layout(h, w, num_points, strategy, tuple(margin)))
 
-    points_per_side -= 1
 
-    start_x = margin[1] + shift_x
-    start_y = margin[0] + shift_y
-    coords = []
-    for y in range(points_per_side):
-        cur_y = int(start_y + (shift_y * y))
-        for x in range(points_per_side):
-            coords.append((cur_y, int(start_x + (shift_x * x))))
+@contextmanager
+def _file_lock(path):
+    """Exclusive lock shared by all processes on the host."""
+    with open(path, "a") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def _download_artifact(s3_key, local_path):
+    """
+    Download to a temporary file next to `local_path`, verify it against the
+    sha256 checksum stored in the S3 object metadata (if any) and then move
+    it into place, so readers never see a partially written file.
+    """
+    metadata = get_object_metadata(settings.AWS_CONFIG_BUCKET, s3_key) or {}
+    expected_checksum = metadata.get(ARTIFACT_CHECKSUM_METADATA_KEY)
 
-    return coords
+    tmp_path = f"{local_path}.{os.getpid()}.tmp"
+    try:
+        download_file(settings.AWS_CONFIG_BUCKET, s3_key, tmp_path)
+        checksum = _get_file_checksum(tmp_path)
+        if expected_checksum and checksum != expected_checksum:
+            raise ValueError(
+                f"Checksum mismatch for classifier artifact {s3_key}: "
+                f"expected {expected_checksum}, got {checksum}"
+            )
+        Path(f"{local_path}{ARTIFACT_CHECKSUM_SUFFIX}").write_text(checksum)
+        os.replace(tmp_path, local_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
 
+    return checksum
 
-def _fetch_and_cache_classifier_config(classifier: Classifier):
+
+def _get_artifact(s3_key, local_path):
+    """
+    Path and sha256 checksum of a locally cached classifier artifact,
+    downloading it if it's missing or doesn't match its recorded checksum.
+    Files are verified once per process.
+    """
+    checksum = _ARTIFACT_CHECKSUMS.get(local_path)
+    if checksum and os.path.exists(local_path):
+        return local_path, checksum
+
+    os.makedirs(os.path.dirname(local_path), exist_ok=True)
+    with _file_lock(f"{local_path}.lock"):
+        checksum_path = Path(f"{local_path}{ARTIFACT_CHECKSUM_SUFFIX}")
+        checksum = None
+        if os.path.exists(local_path) and checksum_path.exists():
+            checksum = checksum_path.read_text().strip()
+            if _get_file_checksum(local_path) != checksum:
+                logger.warning(f"Cached classifier artifact {local_path} is corrupt, refetching")
+                checksum = None
+
+        if checksum is None:
+            checksum = _download_artifact(s3_key, local_path)
+
+    _ARTIFACT_CHECKSUMS[local_path] = checksum
+    return local_path, checksum
+
+
+def cache_classifier_artifacts(classifier: Classifier) -> Dict[str, str]:
+    """Fetch and verify the classifier and weights files of `classifier`."""
     cls_version = classifier.version
+    artifacts = {}
+    for file_name in (CLASSIFIER_FILE_NAME, WEIGHTS_FILE_NAME):
+        local_path, checksum = _get_artifact(
+            f"{CLASSIFIER_CONFIG_S3_PATH}/{cls_version}/{file_name}",
+            f"{CLASSIFIER_CONFIG_LOCAL_CACHE_DIR}/{cls_version}/{file_name}",
+        )
+        artifacts[local_path] = checksum
 
-    classifier_s3_dir = f"{CLASSIFIER_CONFIG_S3_PATH}/{cls_version}"
-    classifier_local_dir = f"{CLASSIFIER_CONFIG_LOCAL_CACHE_DIR}/{cls_version}"
-    download_directory(settings.AWS_CONFIG_BUCKET, classifier_s3_dir, classifier_local_dir)
+    return artifacts
 
 
 def _get_classifier_and_weights(
@@ -369,8 +480,7 @@ def _get_classifier_and_weights(
     classifier_path = f"{classifier_dir}/{CLASSIFIER_FILE_NAME}"
     weights_path = f"{classifier_dir}/{WEIGHTS_FILE_NAME}"
 
-    if not Path(classifier_path).exists() or not Path(weights_path).exists():
-        _fetch_and_cache_classifier_config(classifier)
+    cache_classifier_artifacts(classifier)
 
     return (
         DataLocation("filesystem", classifier_path),
@@ -391,6 +501,31 @@ def _get_image_location(image: Image):
         )
 
 
+def _build_annotations(point, scores, label_ids, classifer_record, profile, created_on):
+    annotations = []
+    top_predictions = sorted(zip(label_ids, scores), key=itemgetter(1), reverse=True)
+    for label, score in top_predictions[0:3]:
+        ba_id, gf_id = (label.split("::", 1) + [None])[:2]
+        if score >= settings.CLASSIFIED_THRESHOLD and ba_id is not None:
+            annotations.append(
+                Annotation(
+                    point=point,
+                    classifier=classifer_record,
+                    benthic_attribute_id=ba_id,
+                    growth_form_id=gf_id,
+                    score=score * 100,
+                    is_confirmed=score >= settings.AUTOCONFIRM_THRESHOLD,
+                    created_on=created_on,
+                    updated_on=created_on,
+                    created_by=profile,
+                    updated_by=profile,
+                    is_machine_created=True,
+                )
+            )
+
+    return annotations
+
+
 @transaction.atomic
 def _write_classification_results(image, score_sets, label_ids, classifer_record, profile=None):
     _annotations = []
@@ -398,7 +533,6 @@ def _write_classification_results(image, score_sets, label_ids, classifer_record
     created_on = timezone.now()
 
     for row, col, scores in score_sets:
-        _label_ids = label_ids[:]
         point = Point(
             row=row,
             column=col,
@@ -409,82 +543,262 @@ def _write_classification_results(image, score_sets, label_ids, classifer_record
             updated_by=profile,
         )
         _points.append(point)
-        top_predictions = sorted(zip(_label_ids, scores), key=itemgetter(1), reverse=True)
-        for label, score in top_predictions[0:3]:
-            ba_id, gf_id = (label.split("::", 1) + [None])[:2]
-            if score >= settings.CLASSIFIED_THRESHOLD and ba_id is not None:
-                _annotations.append(
-                    Annotation(
-                        point=point,
-                        classifier=classifer_record,
-                        benthic_attribute_id=ba_id,
-                        growth_form_id=gf_id,
-                        score=score * 100,
-                        is_confirmed=score >= settings.AUTOCONFIRM_THRESHOLD,
-                        created_on=created_on,
-                        updated_on=created_on,
-                        created_by=profile,
-                        updated_by=profile,
-                        is_machine_created=True,
-                    )
-                )
+        _annotations.extend(
+            _build_annotations(point, scores, label_ids, classifer_record, profile, created_on)
+        )
 
     Point.objects.bulk_create(_points)
     Annotation.objects.bulk_create(_annotations)
 
 
-def _classify_image(image_record_id, profile_id=None):
-    profile = Profile.objects.get_or_none(id=profile_id) if profile_id else None
+@transaction.atomic
+def _replace_classification_results(image, score_sets, label_ids, classifer_record, profile=None):
+    """
+    Replace the machine suggestions on the image's existing points. Points
+    with a confirmed annotation are left untouched.
+    """
+    created_on = timezone.now()
+    points = {(p.row, p.column): p for p in Point.objects.filter(image=image)}
+    confirmed_point_ids = set(
+        Annotation.objects.filter(point__image=image, is_confirmed=True).values_list(
+            "point_id", flat=True
+        )
+    )
+    Annotation.objects.filter(
+        point__image=image, is_machine_created=True, is_confirmed=False
+    ).exclude(point_id__in=confirmed_point_ids).delete()
 
-    image = Image.objects.get_or_none(id=image_record_id)
-    if not image:
-        return
+    _annotations = []
+    for row, col, scores in score_sets:
+        point = points.get((row, col))
+        if point is None or point.pk in confirmed_point_ids:
+            continue
+        _annotations.extend(
+            _build_annotations(point, scores, label_ids, classifer_record, profile, created_on)
+        )
 
-    create_classification_status(image, ClassificationStatus.RUNNING)
+    Annotation.objects.bulk_create(_annotations)
 
-    try:
-        tmp_dir = TemporaryDirectory()
-        tmp_feat_vector_file_path = Path(tmp_dir.name, f"{image.id}.featurevector")
-        feature_location = DataLocation("filesystem", tmp_feat_vector_file_path)
-
-        data_location = _get_image_location(image)
-        classifier, weights, classifer_record = _get_classifier_and_weights()
-        points = generate_points(image, 25)
-
-        extract_features_msg = ExtractFeaturesMsg(
-            job_token=image_record_id,
-            extractor=EfficientNetExtractor(
-                data_locations=dict(
-                    weights=weights,
-                ),
-            ),
-            rowcols=points,
-            image_loc=data_location,
-            feature_loc=feature_location,
+
+def _get_file_checksum(path):
+    file_hash = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(1024 * 1024):
+            file_hash.update(chunk)
+    return file_hash.hexdigest()
+
+
+def _get_artifact_checksum(path):
+    checksum = _ARTIFACT_CHECKSUMS.get(path)
+    if checksum is None:
+        checksum = _ARTIFACT_CHECKSUMS[path] = _get_file_checksum(path)
+    return checksum
+
+
+def _point_layout_checksum(rowcols):
+    layout = ";".join(f"{row},{col}" for row, col in sorted(rowcols))
+    return hashlib.sha256(layout.encode("utf-8")).hexdigest()
+
+
+def _feature_vector_info(features, weights_checksum):
+    rowcols = [(pf.row, pf.col) for pf in features.point_features]
+    return {
+        "weights_checksum": weights_checksum,
+        "point_layout": _point_layout_checksum(rowcols),
+    }
+
+
+def _load_compatible_features(image, weights_checksum):
+    """
+    Stored feature vector of `image`, if it was extracted with the current
+    extractor weights for the image's current points, otherwise None.
+    """
+    feature_vector = (image.data or {}).get(FEATURE_VECTOR_DATA_KEY) or {}
+    if not image.feature_vector_file or feature_vector.get("weights_checksum") != weights_checksum:
+        return None
+
+    rowcols = Point.objects.filter(image=image).values_list("row", "column")
+    if feature_vector.get("point_layout") != _point_layout_checksum(rowcols):
+        return None
+
+    with NamedTemporaryFile(suffix=".featurevector") as tmp:
+        with image.feature_vector_file.open("rb") as f:
+            shutil.copyfileobj(f, tmp)
+        tmp.flush()
+        return ImageFeatures.load(DataLocation("filesystem", tmp.name))
+
+
+def _get_resident_models():
+    """
+    Extractor and classifier kept loaded in the worker process between jobs,
+    reloaded only when a new classifier version is released.
+    """
+    classifier_loc, weights_loc, classifier_record = _get_classifier_and_weights()
+    models = _RESIDENT_MODELS.get(classifier_record.pk)
+    if models is None:
+        _RESIDENT_MODELS.clear()
+        models = (
+            EfficientNetExtractor(data_locations=dict(weights=weights_loc)),
+            load_classifier(classifier_loc),
+            classifier_record,
+            _get_artifact_checksum(weights_loc.key),
         )
-        classify_features_msg = ClassifyFeaturesMsg(
-            job_token=extract_features_msg.job_token,
-            feature_loc=extract_features_msg.feature_loc,
-            classifier_loc=classifier,
+        _RESIDENT_MODELS[classifier_record.pk] = models
+
+    return models
+
+
+def _score_features(clf, features_sets):
+    """
+    Score the points of all images with a single `predict_proba` call and
+    split the scores back out per image as (row, col, scores) sets.
+    """
+    point_features = [pf for features in features_sets for pf in features.point_features]
+    if not point_features:
+        return [[] for _ in features_sets]
+
+    scores = clf.predict_proba(np.array([pf.data for pf in point_features])).tolist()
+
+    score_sets = []
+    offset = 0
+    for features in features_sets:
+        num_points = len(features.point_features)
+        score_sets.append(
+            [
+                (pf.row, pf.col, point_scores)
+                for pf, point_scores in zip(
+                    features.point_features, scores[offset : offset + num_points]
+                )
+            ]
         )
-        _ = extract_features(extract_features_msg)
-        response_message = classify_features(classify_features_msg)
-        label_ids = response_message.classes
-        score_sets = response_message.scores
-        _write_classification_results(image, score_sets, label_ids, classifer_record, profile)
-
-        with open(tmp_feat_vector_file_path, "rb") as tmp_feat_vector_file:
-            image.feature_vector_file.save(
-                f"{image.id}_featurevector", tmp_feat_vector_file, save=True
+        offset += num_points
+
+    return score_sets
+
+
+def _claim_images(image_record_id, batch_size):
+    """
+    Mark `image_record_id` and up to `batch_size - 1` other pending images as
+    running so they are classified together. Images already claimed by another
+    worker are skipped, which turns their own queued jobs into no-ops, unless
+    they have been running for longer than CLASSIFICATION_RUNNING_TIMEOUT
+    seconds, e.g. because the worker died.
+    """
+    latest_statuses = ClassificationStatus.objects.filter(image=OuterRef("pk")).order_by(
+        "-created_on"
+    )
+    stale_before = timezone.now() - datetime.timedelta(
+        seconds=settings.CLASSIFICATION_RUNNING_TIMEOUT
+    )
+    claimable = Q(latest_status=ClassificationStatus.PENDING) | Q(
+        latest_status=ClassificationStatus.RUNNING, latest_status_on__lt=stale_before
+    )
+    with transaction.atomic():
+        qs = Image.objects.annotate(
+            latest_status=Subquery(latest_statuses.values("status")[:1]),
+            latest_status_on=Subquery(latest_statuses.values("created_on")[:1]),
+        ).select_for_update(skip_locked=True, of=("self",))
+        claimed = list(
+            qs.filter(id=image_record_id)
+            .filter(claimable | Q(latest_status__isnull=True))
+            .values_list("id", flat=True)
+        )
+        if claimed and batch_size > 1:
+            claimed.extend(
+                qs.filter(claimable)
+                .exclude(id=image_record_id)
+                .order_by("created_on")
+                .values_list("id", flat=True)[: batch_size - 1]
             )
+        ClassificationStatus.objects.bulk_create(
+            [
+                ClassificationStatus(image_id=pk, status=ClassificationStatus.RUNNING)
+                for pk in claimed
+            ]
+        )
 
-        create_classification_status(image, ClassificationStatus.COMPLETED)
+    return claimed
+
+
+def _classify_images(image_record_ids, profile_id=None):
+    profile = Profile.objects.get_or_none(id=profile_id) if profile_id else None
+
+    images = list(Image.objects.filter(id__in=image_record_ids))
+    if not images:
+        return
+
+    try:
+        extractor, clf, classifer_record, weights_checksum = _get_resident_models()
     except Exception as err:
-        print(err)
-        create_classification_status(image, ClassificationStatus.FAILED, str(err))
-    finally:
-        if Path(tmp_feat_vector_file_path).exists():
-            os.unlink(tmp_feat_vector_file_path)
+        logger.exception("Error loading classifier")
+        for image in images:
+            create_classification_status(image, ClassificationStatus.FAILED, str(err))
+        return
+
+    try:
+        layout_options = point_layouts.get_images_layout_options(
+            images, classifer_record.num_points
+        )
+    except Exception as err:
+        logger.exception("Error getting point layout options")
+        for image in images:
+            create_classification_status(image, ClassificationStatus.FAILED, str(err))
+        return
+
+    with TemporaryDirectory() as tmp_dir:
+        extracted = []
+        for image in images:
+            try:
+                points = generate_points(image, **layout_options[image.pk])
+                features, _ = extractor(load_image(_get_image_location(image)), points)
+                extracted.append((image, features))
+            except Exception as err:
+                logger.exception(f"Error extracting features of image {image.pk}")
+                create_classification_status(image, ClassificationStatus.FAILED, str(err))
+
+        if not extracted:
+            return
+
+        try:
+            score_sets = _score_features(clf, [features for _, features in extracted])
+        except Exception as err:
+            logger.exception("Error scoring image features")
+            for image, _ in extracted:
+                create_classification_status(image, ClassificationStatus.FAILED, str(err))
+            return
+
+        label_ids = list(clf.classes_)
+        for (image, features), image_score_sets in zip(extracted, score_sets):
+            try:
+                _write_classification_results(
+                    image, image_score_sets, label_ids, classifer_record, profile
+                )
+
+                image.data = image.data or {}
+                image.data[FEATURE_VECTOR_DATA_KEY] = _feature_vector_info(
+                    features, weights_checksum
+                )
+                feat_vector_file_path = Path(tmp_dir, f"{image.id}.featurevector")
+                features.store(DataLocation("filesystem", str(feat_vector_file_path)))
+                with open(feat_vector_file_path, "rb") as feat_vector_file:
+                    image.feature_vector_file.save(
+                        f"{image.id}_featurevector", feat_vector_file, save=True
+                    )
+                os.unlink(feat_vector_file_path)
+
+                create_classification_status(image, ClassificationStatus.COMPLETED)
+            except Exception as err:
+                logger.exception(f"Error writing classification results of image {image.pk}")
+                create_classification_status(image, ClassificationStatus.FAILED, str(err))
+
+
+def _classify_image(image_record_id, profile_id=None):
+    image_record_ids = _claim_images(image_record_id, settings.CLASSIFICATION_BATCH_SIZE)
+    if not image_record_ids:
+        print(f"Image {image_record_id} already classified or in progress, skipping")
+        return
+
+    _classify_images(image_record_ids, profile_id)
 
 
 def classify_image_job(image_record_id, profile_id=None):
@@ -492,41 +806,90 @@ def classify_image_job(image_record_id, profile_id=None):
 
 
 def classify_image(image_record_id, profile_id=None):
-    _classify_image(image_record_id)
+    image = Image.objects.get_or_none(id=image_record_id)
+    if not image:
+        return
 
+    create_classification_status(image, ClassificationStatus.RUNNING)
+    _classify_images([image_record_id])
 
-def chunked_queryset_dataframe(qs, chunk_size=10000):
-    buffer = []
-    for obj in qs.iterator(chunk_size=chunk_size):
-        buffer.append(obj)
-        if len(buffer) >= chunk_size:
-            yield pd.DataFrame(buffer)
-            buffer.clear()
-    if buffer:
-        yield pd.DataFrame(buffer)
 
+def reclassify_images(image_record_ids, profile_id=None):
+    """
+    Re-score images with the latest classifier using their stored feature
+    vectors, skipping feature extraction. Images without a feature vector
+    compatible with the current extractor weights and point layout are
+    skipped.
 
-def get_site_regions(site_ids):
-    sites = Site.objects.filter(id__in=site_ids).exclude(location__isnull=True)
+    Returns (reclassified image ids, skipped image ids).
+    """
+    profile = Profile.objects.get_or_none(id=profile_id) if profile_id else None
+    _, clf, classifer_record, weights_checksum = _get_resident_models()
+    label_ids = list(clf.classes_)
 
-    site_to_region = {}
-    for site in sites:
-        region = Region.objects.filter(geom__intersects=site.location).first()
-        if region:
-            site_to_region[str(site.id)] = {
-                "region_id": str(region.id),
-                "region_name": region.name,
-            }
+    reclassified = []
+    skipped = []
+    loaded = []
+    for image in Image.objects.filter(id__in=image_record_ids):
+        try:
+            features = _load_compatible_features(image, weights_checksum)
+        except Exception as err:
+            print(f"Loading feature vector for image {image.pk}: {err}")
+            features = None
+
+        if features is None:
+            skipped.append(image.pk)
         else:
-            site_to_region[str(site.id)] = {
-                "region_id": None,
-                "region_name": None,
-            }
+            loaded.append((image, features))
+
+    score_sets = _score_features(clf, [features for _, features in loaded])
+    for (image, _), image_score_sets in zip(loaded, score_sets):
+        try:
+            _replace_classification_results(
+                image, image_score_sets, label_ids, classifer_record, profile
+            )
+            reclassified.append(image.pk)
+        except Exception as err:
+            print(f"Reclassifying image {image.pk}: {err}")
+            skipped.append(image.pk)
+
+    return reclassified, skipped
+
+
+def chunked_queryset_dataframe(qs, chunk_size=10000):
+    for chunk in queryset_chunks(qs, chunk_size=chunk_size):
+        yield pd.DataFrame(chunk)
+
+
+def get_site_regions(site_ids):
+    """
+    Region of each site with a location, looked up for all sites in one query.
+    """
+    regions = Region.objects.filter(geom__intersects=OuterRef("location"))
+    sites = (
+        Site.objects.filter(id__in=site_ids)
+        .exclude(location__isnull=True)
+        .annotate(
+            site_region_id=Subquery(regions.values("id")[:1]),
+            site_region_name=Subquery(regions.values("name")[:1]),
+        )
+        .values_list("id", "site_region_id", "site_region_name")
+    )
 
-    return site_to_region
+    return {
+        str(site_id): {
+            "region_id": str(region_id) if region_id else None,
+            "region_name": region_name,
+        }
+        for site_id, region_id, region_name in sites
+    }
 
 
-def _process_annotations_df(df):
+def _process_annotations_df(df, site_to_region):
+    """
+    `site_to_region` is shared across the chunks of an export and extended
+    with the sites first seen in `df`.
+    """
     df.rename(
         columns={
             "point__image_id": "image_id",
@@ -543,44 +906,79 @@ def _process_annotations_df(df):
         if col in df.columns:
             df[col] = df[col].astype(str)
 
-    image_ids = df["image_id"].unique().tolist()
-    images = Image.objects.filter(id__in=image_ids)
-    image_to_site = {str(image.id): str(image.site.id) for image in images if image.site}
-
-    site_to_region = get_site_regions(image_to_site.values())
+    site_ids = df.pop("site_id").astype(str)
+    new_site_ids = set(site_ids.unique()) - set(site_to_region)
+    if new_site_ids:
+        site_to_region.update(dict.fromkeys(new_site_ids, {"region_id": None, "region_name": None}))
+        site_to_region.update(get_site_regions(new_site_ids - {"None"}))
 
-    def get_region_info(image_id):
-        site_id = image_to_site.get(image_id)
-        region = site_to_region.get(site_id, {"region_id": None, "region_name": None})
-        return pd.Series([region["region_id"], region["region_name"]])
-
-    df[["region_id", "region_name"]] = df["image_id"].apply(get_region_info).apply(pd.Series)
+    for col in ("region_id", "region_name"):
+        values = {site_id: region[col] for site_id, region in site_to_region.items()}
+        df[col] = site_ids.map(values).astype("string")
 
     return df
 
 
-def export_annotations_to_parquet_streaming(output_path, chunk_size=10000):
+def _confirmed_annotations(project_id=None):
+    """
+    Confirmed annotations of images in non-test projects, annotated with the
+    site and project of each image's photo quadrat observation.
+    """
+    valid_obs = ObsBenthicPhotoQuadrat.objects.filter(
+        **{f"{ObsBenthicPhotoQuadrat.project_lookup}__status__gt": Project.TEST}
+    )
+    if project_id is not None:
+        valid_obs = valid_obs.filter(**{ObsBenthicPhotoQuadrat.project_lookup: project_id})
+
     valid_image_ids = (
-        Image.objects.annotate(
-            has_valid_obs=Exists(
-                ObsBenthicPhotoQuadrat.objects.filter(
-                    image=OuterRef("pk"),
-                    **{f"{ObsBenthicPhotoQuadrat.project_lookup}__status__gt": Project.TEST},
-                )
-            )
-        )
+        Image.objects.annotate(has_valid_obs=Exists(valid_obs.filter(image=OuterRef("pk"))))
         .filter(has_valid_obs=True)
         .values_list("id", flat=True)
     )
 
+    image_obs = ObsBenthicPhotoQuadrat.objects.filter(image=OuterRef("point__image_id"))
+    return Annotation.objects.filter(
+        is_confirmed=True,
+        point__image_id__in=valid_image_ids,
+    ).annotate(
+        site_id=Subquery(image_obs.values(f"{_OBS_SITE_LOOKUP}_id")[:1]),
+        project_id=Subquery(image_obs.values(f"{_OBS_SITE_LOOKUP}__project_id")[:1]),
+    )
+
+
+def get_annotation_partition_stats():
+    """
+    Number of confirmed annotations and time of the latest change to them,
+    their images, classifiers or benthic attributes, per project.
+    """
     qs = (
-        Annotation.objects.select_related(
-            "point", "point__image", "benthic_attribute", "growth_form"
-        )
-        .filter(
-            is_confirmed=True,
-            point__image_id__in=valid_image_ids,
+        _confirmed_annotations()
+        .order_by()
+        .values("project_id")
+        .annotate(
+            num_annotations=Count("id"),
+            last_updated=Max(
+                Greatest(
+                    "updated_on",
+                    "point__image__updated_on",
+                    "classifier__updated_on",
+                    "benthic_attribute__updated_on",
+                    "growth_form__updated_on",
+                )
+            ),
         )
+    )
+    return {
+        str(row["project_id"]): (row["num_annotations"], row["last_updated"])
+        for row in qs
+        if row["project_id"] is not None
+    }
+
+
+def export_annotations_to_parquet_streaming(output_path, chunk_size=10000, project_id=None):
+    qs = (
+        _confirmed_annotations(project_id)
+        .select_related("point", "point__image", "benthic_attribute", "growth_form")
         .order_by("point__image__id", "point__row", "point__column")
         .values(
             "id",
@@ -593,6 +991,7 @@ def export_annotations_to_parquet_streaming(output_path, chunk_size=10000):
             "growth_form_id",
             "growth_form__name",
             "updated_on",
+            "site_id",
         )
     )
     if not qs.exists():
@@ -601,10 +1000,11 @@ def export_annotations_to_parquet_streaming(output_path, chunk_size=10000):
 
     writer = None
     total = 0
+    site_to_region = {}
 
     try:
         for df in chunked_queryset_dataframe(qs, chunk_size):
-            df = _process_annotations_df(df)
+            df = _process_annotations_df(df, site_to_region)
             table = pa.Table.from_pandas(df)
             if writer is None:
                 writer = pq.ParquetWriter(output_path, table.schema)
@@ -618,27 +1018,177 @@ def export_annotations_to_parquet_streaming(output_path, chunk_size=10000):
     return Path(output_path)
 
 
-def export_annotations_parquet(chunk_size=10000):
-    with NamedTemporaryFile(mode="wb", delete=False) as tmp:
-        tmp_path = Path(tmp.name)
+def _annotations_dataset_key(name):
+    return f"{settings.IMAGE_S3_PATH}{ANNOTATIONS_PARQUET_DATASET_NAME}/{name}"
+
+
+def _partition_key(project_id):
+    return _annotations_dataset_key(f"project_id={project_id}/{ANNOTATIONS_PARQUET_FILE_NAME}")
+
+
+def _legacy_annotations_key():
+    return f"{settings.IMAGE_S3_PATH}{ANNOTATIONS_PARQUET_FILE_NAME}"
+
+
+def _update_legacy_annotations_file(chunk_size):
+    """
+    Keep the single file export, which predates the partitioned dataset, in
+    sync with it while ANNOTATIONS_PARQUET_LEGACY_FILE is set.
+    """
+    with NamedTemporaryFile(mode="wb", suffix=".parquet") as tmp:
+        if not export_annotations_to_parquet_streaming(tmp.name, chunk_size):
+            return
+
+        upload_file(
+            settings.IMAGE_PROCESSING_BUCKET,
+            tmp.name,
+            _legacy_annotations_key(),
+            content_type="application/x-parquet",
+            aws_access_key_id=settings.IMAGE_BUCKET_AWS_ACCESS_KEY_ID,
+            aws_secret_access_key=settings.IMAGE_BUCKET_AWS_SECRET_ACCESS_KEY,
+        )
+
+
+def _delete_legacy_annotations_file():
+    credentials = {
+        "aws_access_key_id": settings.IMAGE_BUCKET_AWS_ACCESS_KEY_ID,
+        "aws_secret_access_key": settings.IMAGE_BUCKET_AWS_SECRET_ACCESS_KEY,
+    }
+    legacy_key = _legacy_annotations_key()
+    if not file_exists(settings.IMAGE_PROCESSING_BUCKET, legacy_key, **credentials):
+        return
+
+    delete_file(settings.IMAGE_PROCESSING_BUCKET, legacy_key, **credentials)
+    logger.warning(
+        f"Deleted legacy annotations export {legacy_key}, read the "
+        f"{ANNOTATIONS_PARQUET_DATASET_NAME} dataset instead"
+    )
+
+
+def _read_annotations_manifest():
+    try:
+        obj = get_object(
+            settings.IMAGE_PROCESSING_BUCKET,
+            _annotations_dataset_key(ANNOTATIONS_MANIFEST_FILE_NAME),
+            aws_access_key_id=settings.IMAGE_BUCKET_AWS_ACCESS_KEY_ID,
+            aws_secret_access_key=settings.IMAGE_BUCKET_AWS_SECRET_ACCESS_KEY,
+        )
+    except botocore.exceptions.ClientError as e:
+        if e.response["Error"]["Code"] in ("NoSuchKey", "404"):
+            return {}
+        raise
+
+    return json.loads(obj["Body"].read())
+
+
+def _write_annotations_manifest(manifest):
+    upload_fileobj(
+        settings.IMAGE_PROCESSING_BUCKET,
+        BytesIO(json.dumps(manifest, indent=2).encode("utf-8")),
+        _annotations_dataset_key(ANNOTATIONS_MANIFEST_FILE_NAME),
+        content_type="application/json",
+        aws_access_key_id=settings.IMAGE_BUCKET_AWS_ACCESS_KEY_ID,
+        aws_secret_access_key=settings.IMAGE_BUCKET_AWS_SECRET_ACCESS_KEY,
+    )
+
+
+def get_changed_partitions(partitions, stats):
+    """
+    Projects whose partition is missing or out of date. A partition is out of
+    date if something changed after its high-water mark or if its annotation
+    count differs, which catches deletions.
+    """
+    changed = []
+    for project_id, (num_annotations, last_updated) in stats.items():
+        partition = partitions.get(project_id)
+        if (
+            partition is None
+            or partition.get("num_annotations") != num_annotations
+            or partition.get("last_updated") != last_updated.isoformat()
+        ):
+            changed.append(project_id)
+
+    return changed
+
+
+def _export_partition(project_id, chunk_size):
+    with NamedTemporaryFile(mode="wb", suffix=".parquet") as tmp:
+        output = export_annotations_to_parquet_streaming(tmp.name, chunk_size, project_id)
+        if not output:
+            return False
+
+        upload_file(
+            settings.IMAGE_PROCESSING_BUCKET,
+            tmp.name,
+            _partition_key(project_id),
+            content_type="application/x-parquet",
+            aws_access_key_id=settings.IMAGE_BUCKET_AWS_ACCESS_KEY_ID,
+            aws_secret_access_key=settings.IMAGE_BUCKET_AWS_SECRET_ACCESS_KEY,
+        )
+
+    return True
+
+
+def export_annotations_parquet(chunk_size=10000, full=False):
+    """
+    Export confirmed annotations to a parquet dataset partitioned by project,
+    re-exporting only partitions that changed since the last run (or all of
+    them if `full`). The manifest records each partition's annotation count
+    and high-water mark on `updated_on`. Partitions of projects without
+    confirmed annotations are deleted.
+
+    The single file export is rewritten when anything changed while
+    ANNOTATIONS_PARQUET_LEGACY_FILE is set. Otherwise it's deleted after a
+    successful full export.
+    """
+    previous_partitions = _read_annotations_manifest().get("partitions") or {}
+    partitions = {} if full else dict(previous_partitions)
+    stats = get_annotation_partition_stats()
+
+    changed = get_changed_partitions(partitions, stats)
+    removed = sorted(set(previous_partitions) - set(stats))
+    print(f"{len(changed)} changed and {len(removed)} removed of {len(stats)} partitions")
 
     try:
-        output = export_annotations_to_parquet_streaming(tmp_path, chunk_size)
+        for project_id in changed:
+            num_annotations, last_updated = stats[project_id]
+            if not _export_partition(project_id, chunk_size):
+                continue
+
+            partitions[project_id] = {
+                "key": _partition_key(project_id),
+                "num_annotations": num_annotations,
+                "last_updated": last_updated.isoformat(),
+                "exported_on": timezone.now().isoformat(),
+            }
 
-        if output and output.exists():
-            upload_file(
+        for project_id in removed:
+            delete_file(
                 settings.IMAGE_PROCESSING_BUCKET,
-                output,
-                f"{settings.IMAGE_S3_PATH}{ANNOTATIONS_PARQUET_FILE_NAME}",
-                content_type="application/x-parquet",
+                _partition_key(project_id),
                 aws_access_key_id=settings.IMAGE_BUCKET_AWS_ACCESS_KEY_ID,
                 aws_secret_access_key=settings.IMAGE_BUCKET_AWS_SECRET_ACCESS_KEY,
             )
+            partitions.pop(project_id, None)
+    finally:
+        # Record progress even if a partition failed, so it's retried next run
+        # without re-exporting the ones that succeeded.
+        high_water_mark = max((p["last_updated"] for p in partitions.values()), default=None)
+        _write_annotations_manifest(
+            {
+                "high_water_mark": high_water_mark,
+                "updated_on": timezone.now().isoformat(),
+                "partitions": partitions,
+            }
+        )
 
-            print(
-                f"Uploaded to {settings.IMAGE_PROCESSING_BUCKET}: {ANNOTATIONS_PARQUET_FILE_NAME}"
-            )
+    print(
+        f"Uploaded {len(changed)} partitions to {settings.IMAGE_PROCESSING_BUCKET}: "
+        f"{ANNOTATIONS_PARQUET_DATASET_NAME}"
+    )
 
-    finally:
-        if tmp_path.exists():
-            tmp_path.unlink()
+    if settings.ANNOTATIONS_PARQUET_LEGACY_FILE:
+        if changed or removed:
+            _update_legacy_annotations_file(chunk_size)
+    elif full:
+        _delete_legacy_annotations_file()
@@ -1,9 +1,10 @@
 import os
 import shlex
 import subprocess
+from itertools import islice
 
 from django.conf import settings
-from django.db import DEFAULT_DB_ALIAS
+from django.db import DEFAULT_DB_ALIAS, connections
 from django.db.transaction import Atomic, get_connection
 
 sql_dir = os.path.join(os.path.sep, "tmp", "mermaid")
@@ -101,3 +102,45 @@ class LockedAtomicTransaction(Atomic):
             finally:
                 if cursor and not cursor.closed:
                     cursor.close()
+
+
+def iter_queryset(queryset, chunk_size=None):
+    """
+    Iterate a queryset through a server-side cursor, fetching `chunk_size` rows
+    per round trip, so memory stays bounded regardless of table size.
+
+    Outside of a transaction Django declares the cursor `WITH HOLD`, so it
+    also works for streaming responses consumed after the view returns.
+    """
+    chunk_size = chunk_size or settings.DB_ITERATOR_CHUNK_SIZE
+    return queryset.iterator(chunk_size=chunk_size)
+
+
+def queryset_chunks(queryset, chunk_size=None):
+    """Same as `iter_queryset` but yields lists of up to `chunk_size` rows."""
+    chunk_size = chunk_size or settings.DB_ITERATOR_CHUNK_SIZE
+    iterator = iter_queryset(queryset, chunk_size=chunk_size)
+    while chunk := list(islice(iterator, chunk_size)):
+        yield chunk
+
+
+def sql_chunks(sql, params=None, chunk_size=None, using=DEFAULT_DB_ALIAS):
+    """Raw SQL counterpart of `queryset_chunks`, yielding lists of row tuples."""
+    chunk_size = chunk_size or settings.DB_ITERATOR_CHUNK_SIZE
+    with connections[using].chunked_cursor() as cursor:
+        cursor.execute(sql, params)
+        while rows := cursor.fetchmany(chunk_size):
+            yield rows
+
+
+def raw_delete(queryset):
+    """
+    Delete the rows of `queryset` with a single DELETE, without fetching them,
+    sending pre/post_delete signals or collecting related rows to cascade.
+
+    Only for callers that already do what the delete signals would (e.g.
+    archive the rows in bulk). Dependent rows must be deleted first: rows still
+    referencing the deleted ones are rejected by the database's foreign key
+    constraints when the transaction commits. Returns the number of deleted rows.
+    """
+    return queryset._raw_delete(queryset.db)
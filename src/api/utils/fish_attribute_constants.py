@@ -0,0 +1,123 @@
+"""
+Resolved fish attribute constants, cached per process.
+
+Biomass constants and max length of genera, families and groupings are
+aggregated from their species, so resolving them per observation walks the
+taxonomy. The constants of all fish attributes are resolved together instead
+and kept in memory, stamped with a version stored in the Django cache. Fish
+attribute signals bump the version (`invalidate_fish_attribute_constants`)
+after refreshing `mv_fish_attributes`, and every process reloads its
+constants the next time it checks the version, at most `VERSION_CHECK_TTL`
+seconds later.
+"""
+
+import threading
+import uuid
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Dict, Iterable, Optional
+
+from django.core.cache import cache
+
+from ..models import FishAttribute, FishAttributeView, FishFamily, FishGenus
+from . import create_timestamp, expired_timestamp
+
+VERSION_CACHE_KEY = "fish_attribute_constants_version"
+VERSION_CHECK_TTL = 30  # seconds
+
+
+@dataclass(frozen=True)
+class FishAttributeConstants:
+    biomass_constant_a: Optional[Decimal] = None
+    biomass_constant_b: Optional[Decimal] = None
+    biomass_constant_c: Optional[Decimal] = None
+    max_length: Optional[Decimal] = None
+    trophic_group: Optional[str] = None
+    family_id: Optional[str] = None
+
+    @property
+    def biomass_constants(self):
+        return self.biomass_constant_a, self.biomass_constant_b, self.biomass_constant_c
+
+
+_lock = threading.Lock()
+_constants = None
+_version = None
+_version_expires = None
+
+
+def _load_constants():
+    # Drop the genus and family aggregates cached on the classes so they are
+    # recomputed from current species
+    FishFamily.species_agg = None
+    FishGenus.species_agg = None
+
+    view_values = {
+        pk: (trophic_group, id_family)
+        for pk, trophic_group, id_family in FishAttributeView.objects.values_list(
+            "id", "trophic_group", "id_family"
+        )
+    }
+    fish_attributes = FishAttribute.objects.select_related(
+        "fishgrouping", "fishfamily", "fishgenus", "fishspecies"
+    )
+
+    constants = {}
+    for fish_attribute in fish_attributes:
+        trophic_group, id_family = view_values.get(fish_attribute.pk, (None, None))
+        constants[str(fish_attribute.pk)] = FishAttributeConstants(
+            *fish_attribute.get_biomass_constants(),
+            max_length=fish_attribute.get_max_length(),
+            trophic_group=trophic_group or None,
+            family_id=str(id_family) if id_family else None,
+        )
+    return constants
+
+
+def _get_version():
+    version = cache.get(VERSION_CACHE_KEY)
+    if version is None:
+        version = uuid.uuid4().hex
+        if not cache.add(VERSION_CACHE_KEY, version, timeout=None):
+            version = cache.get(VERSION_CACHE_KEY)
+    return version
+
+
+def _get_all_constants():
+    global _constants, _version, _version_expires
+
+    with _lock:
+        if _constants is not None and not expired_timestamp(_version_expires):
+            return _constants
+
+        version = _get_version()
+        if _constants is None or version != _version:
+            _constants = _load_constants()
+            _version = version
+        _version_expires = create_timestamp(ttl=VERSION_CHECK_TTL)
+        return _constants
+
+
+def get_fish_attribute_constants(
+    fish_attribute_ids: Iterable,
+) -> Dict[str, FishAttributeConstants]:
+    """Constants of the fish attributes of `fish_attribute_ids` that exist, keyed by id."""
+    constants = _get_all_constants()
+    found = {}
+    for fish_attribute_id in fish_attribute_ids:
+        try:
+            key = str(uuid.UUID(str(fish_attribute_id)))
+        except (ValueError, TypeError, AttributeError):
+            continue
+        if key in constants:
+            found[fish_attribute_id] = constants[key]
+    return found
+
+
+def invalidate_fish_attribute_constants():
+    """Bump the constants version, so every process reloads its constants."""
+    global _constants
+
+    cache.set(VERSION_CACHE_KEY, uuid.uuid4().hex, timeout=None)
+    with _lock:
+        _constants = None
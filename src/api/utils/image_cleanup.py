@@ -0,0 +1,121 @@
+import json
+import logging
+from collections import defaultdict
+
+from django.core import serializers
+from django.db import transaction
+from django.db.models import Exists, OuterRef
+
+from ..models import (
+    Annotation,
+    ArchivedRecord,
+    ClassificationStatus,
+    CollectRecord,
+    Image,
+    ObsBenthicPhotoQuadrat,
+    Point,
+)
+from ..models.classification import get_image_storage_config
+from . import s3 as s3_utils
+from .dbutils import raw_delete
+
+logger = logging.getLogger(__name__)
+
+FILE_FIELDS = ("image", "thumbnail", "feature_vector_file", "annotations_file")
+DELETE_CHUNK_SIZE = 500
+
+
+def get_orphaned_images():
+    """Images without a matching CollectRecord and not referenced by ObsBenthicPhotoQuadrat."""
+    return Image.objects.annotate(
+        has_collect_record=Exists(CollectRecord.objects.filter(id=OuterRef("collect_record_id"))),
+        is_used=Exists(ObsBenthicPhotoQuadrat.objects.filter(image=OuterRef("pk"))),
+    ).filter(has_collect_record=False, is_used=False)
+
+
+def _archive_records(querysets):
+    records = []
+    for qs in querysets:
+        for obj in qs.iterator():
+            records.append(
+                ArchivedRecord(
+                    app_label=obj._meta.app_label,
+                    model=obj._meta.model_name,
+                    record_pk=obj.pk,
+                    project_pk=None,
+                    record=json.loads(serializers.serialize("json", [obj]))[0],
+                )
+            )
+    ArchivedRecord.objects.bulk_create(records)
+
+
+def _delete_image_rows(image_ids):
+    """Archive and delete a chunk of images and their points, annotations and
+    statuses. Rows are deleted with set-based DELETEs, so the per-row
+    post_delete signals (archiving and file cleanup) don't run; both are
+    handled here instead. Returns the number of deleted images and their
+    storage keys grouped by storage config."""
+    image_ids = list(
+        get_orphaned_images()
+        .filter(id__in=image_ids)
+        .select_for_update(of=("self",))
+        .values_list("id", flat=True)
+    )
+    if not image_ids:
+        return 0, {}
+
+    points = Point.objects.filter(image_id__in=image_ids)
+    annotations = Annotation.objects.filter(point__image_id__in=image_ids)
+    _archive_records([Image.objects.filter(id__in=image_ids), points, annotations])
+
+    keys = defaultdict(list)
+    for image_bucket, *file_names in Image.objects.filter(id__in=image_ids).values_list(
+        "image_bucket", *FILE_FIELDS
+    ):
+        config = get_image_storage_config(image_bucket)
+        config_key = (config["bucket"], config["access_key"], config["secret_key"])
+        keys[config_key].extend(f"{config['s3_path']}{name}" for name in file_names if name)
+
+    for qs in (
+        annotations,
+        points,
+        ClassificationStatus.objects.filter(image_id__in=image_ids),
+        Image.objects.filter(id__in=image_ids),
+    ):
+        raw_delete(qs)
+
+    return len(image_ids), keys
+
+
+def _delete_storage_files(keys):
+    for (bucket, access_key, secret_key), blob_names in keys.items():
+        try:
+            failed = s3_utils.delete_files(
+                bucket,
+                blob_names,
+                aws_access_key_id=access_key,
+                aws_secret_access_key=secret_key,
+            )
+        except Exception:
+            logger.error(f"Failed to delete orphaned image files from {bucket}", exc_info=True)
+            continue
+        for key in failed:
+            logger.error(f"Failed to delete orphaned image file {key} from {bucket}")
+
+
+def delete_orphaned_images(image_ids, chunk_size=DELETE_CHUNK_SIZE):
+    """Delete orphaned images in chunks of `chunk_size`.
+
+    Each chunk is deleted in its own transaction with one ArchivedRecord
+    insert, and its storage files are removed with multi-object deletes once
+    the transaction commits. Images that are no longer orphaned when their
+    chunk is deleted are skipped. Returns the number of deleted images.
+    """
+    image_ids = list(image_ids)
+    count = 0
+    for n in range(0, len(image_ids), chunk_size):
+        with transaction.atomic():
+            num_deleted, keys = _delete_image_rows(image_ids[n : n + chunk_size])
+            count += num_deleted
+            transaction.on_commit(lambda keys=keys: _delete_storage_files(keys))
+    return count
@@ -1,6 +1,8 @@
 import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 from django.conf import settings
+from django.db.models import Q
 
 from ..models import CollectRecord, Image, ObsBenthicPhotoQuadrat
 from ..models.classification import get_image_storage_config
@@ -10,6 +12,7 @@ from .q import submit_job
 logger = logging.getLogger(__name__)
 
 FILE_FIELDS = ("image", "thumbnail", "annotations_file", "feature_vector_file")
+MIGRATION_BATCH_SIZE = 100
 
 
 def _get_project_images(project_id):
@@ -34,47 +37,101 @@ def _get_project_images(project_id):
     return Image.objects.filter(id__in=all_image_ids)
 
 
-def migrate_project_images(project_id, old_bucket, new_bucket, skip_delete=False):
-    """Move all images for a project from old_bucket to new_bucket and update image_bucket."""
+class _MigrationClients:
+    """S3 clients shared by all copy workers of one migration (boto3 clients
+    are thread safe)."""
+
+    def __init__(self, source_config, dest_config):
+        self.same_credentials = (
+            source_config["access_key"] == dest_config["access_key"]
+            and source_config["secret_key"] == dest_config["secret_key"]
+        )
+        self.source = s3_utils.get_client(source_config["access_key"], source_config["secret_key"])
+        if self.same_credentials:
+            self.dest = self.source
+        else:
+            self.dest = s3_utils.get_client(dest_config["access_key"], dest_config["secret_key"])
+
+
+def migrate_project_images(project_id, old_bucket, new_bucket, skip_delete=False, max_workers=None):
+    """Move all images for a project from old_bucket to new_bucket and update image_bucket.
+
+    Files are copied by a pool of `max_workers` threads in batches of
+    MIGRATION_BATCH_SIZE images. After each batch, image_bucket is updated for
+    the images that copied successfully, which records progress: re-running
+    the migration resumes with the images still in old_bucket.
+    """
     if old_bucket == new_bucket:
         logger.info(f"Project {project_id}: buckets are the same, skipping migration")
         return 0
 
-    images = _get_project_images(project_id)
     source_config = get_image_storage_config(old_bucket)
     dest_config = get_image_storage_config(new_bucket)
+    clients = _MigrationClients(source_config, dest_config)
+    max_workers = max_workers or settings.IMAGE_MIGRATION_MAX_WORKERS
+
+    image_files = list(
+        _get_project_images(project_id)
+        .filter(Q(image_bucket="") | Q(image_bucket=old_bucket))
+        .order_by("created_on")
+        .values_list("id", *FILE_FIELDS)
+    )
 
     count = 0
-    for image in images.iterator():
-        if image.image_bucket and image.image_bucket != old_bucket:
-            continue
-
-        try:
-            copied_keys = _copy_image_files(image, source_config, dest_config)
-            image.image_bucket = new_bucket
-            image.save(update_fields=["image_bucket"])
-            if not skip_delete:
-                _delete_source_files(copied_keys, source_config)
-            count += 1
-        except Exception:
-            logger.exception(f"Failed to migrate image {image.id}")
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for n in range(0, len(image_files), MIGRATION_BATCH_SIZE):
+            futures = {
+                executor.submit(
+                    _copy_image_files, file_names, source_config, dest_config, clients
+                ): image_id
+                for image_id, *file_names in image_files[n : n + MIGRATION_BATCH_SIZE]
+            }
+
+            migrated_ids = []
+            source_keys = []
+            for future in as_completed(futures):
+                image_id = futures[future]
+                try:
+                    source_keys.extend(future.result())
+                    migrated_ids.append(image_id)
+                except Exception:
+                    logger.exception(f"Failed to migrate image {image_id}")
+
+            Image.objects.filter(id__in=migrated_ids).update(image_bucket=new_bucket)
+            if not skip_delete and source_keys:
+                s3_utils.delete_files(source_config["bucket"], source_keys, client=clients.source)
+
+            count += len(migrated_ids)
+            logger.info(
+                f"Project {project_id}: migrated {count} of {len(image_files)} images "
+                f"from {old_bucket} to {new_bucket}"
+            )
 
     logger.info(f"Project {project_id}: migrated {count} images from {old_bucket} to {new_bucket}")
     return count
 
 
-def _copy_image_files(image, source_config, dest_config):
-    """Copy all file fields for a single image to the destination bucket.
+def _copy_image_files(file_names, source_config, dest_config, clients):
+    """Copy the stored files of a single image to the destination bucket.
 
     Returns the list of source keys that were copied, for later deletion.
     """
     copied_keys = []
-    for field_name in FILE_FIELDS:
-        field_file = getattr(image, field_name, None)
-        if field_file and field_file.name:
-            source_key = f"{source_config['s3_path']}{field_file.name}"
-            dest_key = f"{dest_config['s3_path']}{field_file.name}"
+    for file_name in file_names:
+        if not file_name:
+            continue
 
+        source_key = f"{source_config['s3_path']}{file_name}"
+        dest_key = f"{dest_config['s3_path']}{file_name}"
+        if clients.same_credentials:
+            s3_utils.copy_object_server_side(
+                source_bucket=source_config["bucket"],
+                source_key=source_key,
+                dest_bucket=dest_config["bucket"],
+                dest_key=dest_key,
+                client=clients.dest,
+            )
+        else:
             s3_utils.move_file_cross_account(
                 source_bucket=source_config["bucket"],
                 source_key=source_key,
@@ -85,22 +142,13 @@ def _copy_image_files(image, source_config, dest_config):
                 dest_access_key=dest_config["access_key"],
                 dest_secret_key=dest_config["secret_key"],
                 delete_source=False,
+                source_client=clients.source,
+                dest_client=clients.dest,
             )
-            copied_keys.append(source_key)
+        copied_keys.append(source_key)
     return copied_keys
 
 
-def _delete_source_files(copied_keys, source_config):
-    """Delete source files after a successful copy and DB update."""
-    for source_key in copied_keys:
-        s3_utils.delete_file(
-            bucket=source_config["bucket"],
-            blob_name=source_key,
-            aws_access_key_id=source_config["access_key"],
-            aws_secret_access_key=source_config["secret_key"],
-        )
-
-
 def queue_image_migration(project_id, old_bucket, new_bucket):
     """Submit an async job to migrate project images between buckets."""
     if settings.ENVIRONMENT not in ("dev", "prod"):
@@ -0,0 +1,143 @@
+"""
+Point layouts used to sample classification points on images.
+
+A project picks a sampling strategy and number of points per image in
+`Project.data["point_layout"]`, for example::
+
+    {"strategy": "stratified_random", "num_points": 50, "margin": [100, 100]}
+
+Layouts only depend on image dimensions and the layout options, so they are
+computed once per process and shared by all images of the same size.
+"""
+
+import logging
+import math
+import random
+from functools import lru_cache
+from typing import Optional, Tuple
+
+from ..models import CollectRecord, Project
+
+logger = logging.getLogger(__name__)
+
+POINT_LAYOUT_DATA_KEY = "point_layout"
+
+GRID = "grid"
+STRATIFIED_RANDOM = "stratified_random"
+STRATEGIES = (GRID, STRATIFIED_RANDOM)
+
+DEFAULT_STRATEGY = GRID
+DEFAULT_NUM_POINTS = 25
+MAX_NUM_POINTS = 1000
+
+
+def _grid_layout(height, width, num_points, margin):
+    """Evenly spaced grid of `num_points` points, a square number."""
+    points_per_side = math.isqrt(num_points) + 1
+    shift_y = (height - 2 * margin[0]) / points_per_side
+    shift_x = (width - 2 * margin[1]) / points_per_side
+
+    points_per_side -= 1
+
+    start_x = margin[1] + shift_x
+    start_y = margin[0] + shift_y
+    coords = []
+    for y in range(points_per_side):
+        cur_y = int(start_y + (shift_y * y))
+        for x in range(points_per_side):
+            coords.append((cur_y, int(start_x + (shift_x * x))))
+
+    return coords
+
+
+def _stratified_random_layout(height, width, num_points, margin):
+    """
+    One random point in each of `num_points` cells of a grid laid over the
+    image. Seeded by the layout options, so a layout is reproducible.
+    """
+    rng = random.Random(f"{height}:{width}:{num_points}:{margin[0]}:{margin[1]}")
+    cells_per_side = math.ceil(math.sqrt(num_points))
+    cell_h = (height - 2 * margin[0]) / cells_per_side
+    cell_w = (width - 2 * margin[1]) / cells_per_side
+
+    cells = [(y, x) for y in range(cells_per_side) for x in range(cells_per_side)]
+    coords = []
+    for y, x in sorted(rng.sample(cells, num_points)):
+        coords.append(
+            (
+                int(margin[0] + (y + rng.random()) * cell_h),
+                int(margin[1] + (x + rng.random()) * cell_w),
+            )
+        )
+
+    return coords
+
+
+_LAYOUTS = {
+    GRID: _grid_layout,
+    STRATIFIED_RANDOM: _stratified_random_layout,
+}
+
+
+def _check_layout(strategy, num_points):
+    if strategy not in _LAYOUTS:
+        raise ValueError(f"Unknown point layout strategy: {strategy}")
+    if not 0 < num_points <= MAX_NUM_POINTS:
+        raise ValueError(f"Number of points must be between 1 and {MAX_NUM_POINTS}")
+    if strategy == GRID and math.isqrt(num_points) ** 2 != num_points:
+        raise ValueError(f"Number of points of a {GRID} layout must be a square: {num_points}")
+
+
+@lru_cache(maxsize=256)
+def get_point_layout(
+    height: int,
+    width: int,
+    num_points: int = DEFAULT_NUM_POINTS,
+    strategy: str = DEFAULT_STRATEGY,
+    margin: Tuple[int, int] = (0, 0),
+) -> Tuple[Tuple[int, int], ...]:
+    """(row, column) coordinates of the points of a layout."""
+    _check_layout(strategy, num_points)
+    if len(margin) != 2 or 2 * margin[0] >= height or 2 * margin[1] >= width:
+        raise ValueError(f"Invalid point layout margin: {margin}")
+
+    return tuple(_LAYOUTS[strategy](height, width, num_points, tuple(margin)))
+
+
+def get_layout_options(project: Optional[Project] = None, num_points: Optional[int] = None):
+    """
+    Point layout options of `project`, falling back to the default strategy
+    and `num_points` (e.g. the classifier's number of points) if the project
+    has none or they are invalid.
+    """
+    options = ((project.data or {}) if project else {}).get(POINT_LAYOUT_DATA_KEY) or {}
+    try:
+        layout_options = {
+            "strategy": options.get("strategy") or DEFAULT_STRATEGY,
+            "num_points": int(options.get("num_points") or num_points or DEFAULT_NUM_POINTS),
+            "margin": tuple(int(m) for m in options.get("margin") or (0, 0)),
+        }
+        _check_layout(layout_options["strategy"], layout_options["num_points"])
+        return layout_options
+    except (TypeError, ValueError):
+        if project is None:
+            raise
+        logger.warning(f"Invalid point layout options for project {project.pk}: {options}")
+        return get_layout_options(num_points=num_points)
+
+
+def get_images_layout_options(images, num_points: Optional[int] = None):
+    """Point layout options for each image, keyed by image id, using two queries."""
+    project_ids = dict(
+        CollectRecord.objects.filter(
+            id__in={image.collect_record_id for image in images}
+        ).values_list("id", "project_id")
+    )
+    projects = Project.objects.only("id", "data").in_bulk(set(project_ids.values()))
+
+    return {
+        image.pk: get_layout_options(
+            projects.get(project_ids.get(image.collect_record_id)), num_points
+        )
+        for image in images
+    }
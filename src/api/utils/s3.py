@@ -7,6 +7,9 @@ from django.conf import settings
 
 logger = logging.getLogger(__name__)
 
+# Max number of keys per DeleteObjects request
+S3_DELETE_BATCH_SIZE = 1000
+
 
 def get_client(aws_access_key_id=None, aws_secret_access_key=None):
     if aws_access_key_id is None:
@@ -55,6 +58,32 @@ def delete_file(bucket, blob_name, aws_access_key_id=None, aws_secret_access_key
         return False
 
 
+def delete_files(
+    bucket, blob_names, aws_access_key_id=None, aws_secret_access_key=None, client=None
+):
+    """Delete files with multi-object deletes of up to S3_DELETE_BATCH_SIZE keys
+    per request. Returns the keys that could not be deleted."""
+    if client is None:
+        client = get_client(aws_access_key_id, aws_secret_access_key)
+
+    blob_names = list(blob_names)
+    failed = []
+    for n in range(0, len(blob_names), S3_DELETE_BATCH_SIZE):
+        batch = blob_names[n : n + S3_DELETE_BATCH_SIZE]
+        response = client.delete_objects(
+            Bucket=bucket,
+            Delete={"Objects": [{"Key": key} for key in batch], "Quiet": True},
+        )
+        for error in response.get("Errors") or []:
+            logger.error(
+                f"Error deleting file {error.get('Key')} from bucket {bucket}: "
+                f"{error.get('Message')}"
+            )
+            failed.append(error.get("Key"))
+
+    return failed
+
+
 def upload_file(
     bucket,
     local_file_path,
@@ -82,6 +111,36 @@ def upload_file(
     client.upload_file(local_file_path, bucket, blob_name, ExtraArgs=extra_args)
 
 
+def upload_fileobj(
+    bucket,
+    fileobj,
+    blob_name,
+    content_type=None,
+    content_encoding=None,
+    metadata=None,
+    aws_access_key_id=None,
+    aws_secret_access_key=None,
+):
+    if aws_access_key_id is None:
+        aws_access_key_id = settings.AWS_ACCESS_KEY_ID
+    if aws_secret_access_key is None:
+        aws_secret_access_key = settings.AWS_SECRET_ACCESS_KEY
+
+    client = get_client(
+        aws_access_key_id=aws_access_key_id, aws_secret_access_key=aws_secret_access_key
+    )
+
+    extra_args = {}
+    if content_type:
+        extra_args["ContentType"] = content_type
+    if content_encoding:
+        extra_args["ContentEncoding"] = content_encoding
+    if metadata:
+        extra_args["Metadata"] = metadata
+
+    client.upload_fileobj(fileobj, bucket, blob_name, ExtraArgs=extra_args)
+
+
 def download_file(
     bucket, blob_name, local_file_path, aws_access_key_id=None, aws_secret_access_key=None
 ):
@@ -114,6 +173,24 @@ def file_exists(bucket, blob_name, aws_access_key_id=None, aws_secret_access_key
         raise
 
 
+def get_object_metadata(bucket, blob_name, aws_access_key_id=None, aws_secret_access_key=None):
+    """User metadata of an object, or None if the object doesn't exist."""
+    if aws_access_key_id is None:
+        aws_access_key_id = settings.AWS_ACCESS_KEY_ID
+    if aws_secret_access_key is None:
+        aws_secret_access_key = settings.AWS_SECRET_ACCESS_KEY
+
+    client = get_client(
+        aws_access_key_id=aws_access_key_id, aws_secret_access_key=aws_secret_access_key
+    )
+    try:
+        return client.head_object(Bucket=bucket, Key=blob_name).get("Metadata") or {}
+    except botocore.exceptions.ClientError as e:
+        if e.response["Error"]["Code"] == "404":
+            return None
+        raise
+
+
 def download_directory(
     bucket, s3_directory, local_directory, aws_access_key_id=None, aws_secret_access_key=None
 ):
@@ -187,10 +264,15 @@ def move_file_cross_account(
     dest_access_key,
     dest_secret_key,
     delete_source=True,
+    source_client=None,
+    dest_client=None,
 ):
-    """Move a file between buckets that may require different AWS credentials."""
-    source_client = get_client(source_access_key, source_secret_key)
-    dest_client = get_client(dest_access_key, dest_secret_key)
+    """Move a file between buckets that may require different AWS credentials.
+    Pass pre-created clients to avoid repeated session instantiation."""
+    if source_client is None:
+        source_client = get_client(source_access_key, source_secret_key)
+    if dest_client is None:
+        dest_client = get_client(dest_access_key, dest_secret_key)
 
     response = source_client.get_object(Bucket=source_bucket, Key=source_key)
     body = response["Body"].read()
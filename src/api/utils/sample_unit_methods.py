@@ -1,9 +1,10 @@
 import uuid
 
 from django.db import transaction
+from django.db.models.signals import pre_save
+from rest_framework.serializers import ListSerializer, Serializer
 
-from ..mocks import MockRequest
-from ..models import AuditRecord
+from ..models import AuditRecord, CollectRecord, Project, ProjectProfile, Revision
 
 
 def get_project(obj, keys):
@@ -17,17 +18,49 @@ def get_project(obj, keys):
 def add_protected_data(instance, k, v):
     decorated_v = v
     if k == "observers":
-        observers = {str(o.id): o for o in instance.observers.select_related("profile")}
+        # Prefetched with profiles by `get_transect_methods`
+        observers = {str(o.id): o for o in instance.observers.all()}
         for serialized_observer in decorated_v:
             serialized_observer["email"] = observers[serialized_observer["id"]].profile.email
 
     return decorated_v
 
 
-def transect_method_to_collect_record(serializer, transect_method_instance, profile, protocol):
-    from api.resources.collect_record import CollectRecordSerializer
+def _transect_method_filters(model, pks, project_pk=None):
+    filters = {"id__in": pks}
+    if project_pk is not None:
+        filters[model.project_lookup] = project_pk
+    return filters
+
+
+def get_transect_methods(serializer_class, pks, project_pk=None):
+    """
+    Transect methods of `pks`, in project `project_pk` if given, with their
+    project, observers and everything `serializer_class` serializes fetched
+    in a fixed number of queries.
+    """
+    model = serializer_class.Meta.model
+    select_related = [model.project_lookup]
+    prefetch_related = ["observers__profile"]
+    for field in serializer_class().fields.values():
+        if isinstance(field, ListSerializer):
+            prefetch_related.append(field.source.replace(".", "__"))
+        elif isinstance(field, Serializer):
+            select_related.append(field.source.replace(".", "__"))
+
+    return (
+        model.objects.filter(**_transect_method_filters(model, pks, project_pk))
+        .select_related(*select_related)
+        .prefetch_related(*prefetch_related)
+    )
+
 
-    request = MockRequest(profile=profile)
+def transect_method_to_collect_record(data, transect_method_instance, profile, protocol):
+    """
+    Unsaved collect record of `transect_method_instance`, serialized as
+    `data`, owned by `profile`.
+    """
+    from ..submission.validations.statuses import STALE
 
     if transect_method_instance is None:
         raise TypeError("instance is None")
@@ -43,24 +76,23 @@ def transect_method_to_collect_record(serializer, transect_method_instance, prof
         transect_method_instance, transect_method_instance.project_lookup.split("__")
     )
 
-    data = serializer(instance=transect_method_instance).data
-    record = {
-        "id": transect_method_instance.collect_record_id or str(uuid.uuid4()),
-        "stage": CollectRecordSerializer.Meta.model.SAVED_STAGE,
-        "project": str(project.pk),
-        "profile": str(profile.pk),
-        "data": {"protocol": protocol, "sample_unit_method_id": str(transect_method_instance.pk)},
-    }
-
+    record_data = {"protocol": protocol, "sample_unit_method_id": str(transect_method_instance.pk)}
     for k, v in data.items():
-        if k in skip_fields:
-            record[k] = v
-        else:
-            record["data"][k] = add_protected_data(transect_method_instance, k, v)
-
-    cr = CollectRecordSerializer(data=record, context={"request": request})
-    cr.is_valid(raise_exception=True)
-    return cr.save()
+        if k not in skip_fields:
+            record_data[k] = add_protected_data(transect_method_instance, k, v)
+
+    collect_record = CollectRecord(
+        id=transect_method_instance.collect_record_id or uuid.uuid4(),
+        stage=CollectRecord.SAVED_STAGE,
+        project=project,
+        profile=profile,
+        data=record_data,
+        validations={"status": STALE},
+        created_by=profile,
+        updated_by=profile,
+    )
+    collect_record.ensure_obs_ids()
+    return collect_record
 
 
 def create_audit_record(profile, event_type, record):
@@ -72,13 +104,84 @@ def create_audit_record(profile, event_type, record):
     )
 
 
+def _save_collect_records(collect_records):
+    # Bulk inserts skip model save signals: run pre_save (e.g. classifier
+    # assignment) per record and the post_save revisions and project updates
+    # once per project profile and project.
+    for collect_record in collect_records:
+        pre_save.send(
+            sender=CollectRecord,
+            instance=collect_record,
+            raw=False,
+            using=CollectRecord.objects.db,
+            update_fields=None,
+        )
+
+    # Update collect records that still exist, like CollectRecordSerializer
+    CollectRecord.objects.bulk_create(
+        collect_records,
+        update_conflicts=True,
+        unique_fields=["id"],
+        update_fields=["stage", "project", "profile", "data", "validations", "updated_by"],
+    )
+
+    project_profiles = {(cr.profile_id, cr.project_id) for cr in collect_records}
+    for project_profile in ProjectProfile.objects.filter(
+        profile_id__in={profile_id for profile_id, _ in project_profiles},
+        project_id__in={project_id for _, project_id in project_profiles},
+    ):
+        if (project_profile.profile_id, project_profile.project_id) in project_profiles:
+            Revision.create_from_instance(project_profile)
+
+    # Saving a project queues its summary update
+    for project in Project.objects.filter(id__in={cr.project_id for cr in collect_records}):
+        project.save()
+
+
 @transaction.atomic
-def edit_transect_method(serializer_class, collect_record_owner, request, pk, protocol):
-    instance = serializer_class.Meta.model.objects.get(id=pk)
-    collect_record = transect_method_to_collect_record(
-        serializer_class, instance, collect_record_owner, protocol
+def edit_transect_methods(
+    serializer_class, collect_record_owner, request, pks, protocol, project_pk=None
+):
+    """
+    Convert the submitted transect methods of `pks` back into collect records
+    owned by `collect_record_owner`, in one transaction. Collect records and
+    audit records are inserted in bulk. Raises DoesNotExist if any transect
+    method doesn't exist, or isn't in project `project_pk` if given.
+    """
+    model = serializer_class.Meta.model
+    pks = list(dict.fromkeys(str(pk) for pk in pks))
+    instances = {str(i.pk): i for i in get_transect_methods(serializer_class, pks, project_pk)}
+    missing = [pk for pk in pks if pk not in instances]
+    if missing:
+        raise model.DoesNotExist(f"{model.__name__} with id {missing[0]} not found")
+
+    instances = [instances[pk] for pk in pks]
+    serialized_instances = serializer_class(instances, many=True).data
+    collect_records = [
+        transect_method_to_collect_record(data, instance, collect_record_owner, protocol)
+        for data, instance in zip(serialized_instances, instances)
+    ]
+    _save_collect_records(collect_records)
+
+    AuditRecord.objects.bulk_create(
+        AuditRecord(
+            event_type=AuditRecord.EDIT_RECORD_EVENT_TYPE,
+            event_by=request.user.profile,
+            model=model.__name__.lower(),
+            record_id=instance.pk,
+        )
+        for instance in instances
     )
-    create_audit_record(request.user.profile, AuditRecord.EDIT_RECORD_EVENT_TYPE, instance)
-    instance.delete()
+    # Deleting keeps the delete signals, which archive the submitted data and
+    # remove orphaned sample units and events
+    model.objects.filter(**_transect_method_filters(model, pks, project_pk)).delete()
 
-    return collect_record
+    return collect_records
+
+
+def edit_transect_method(
+    serializer_class, collect_record_owner, request, pk, protocol, project_pk=None
+):
+    return edit_transect_methods(
+        serializer_class, collect_record_owner, request, [pk], protocol, project_pk
+    )[0]
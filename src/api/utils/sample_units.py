@@ -12,6 +12,7 @@ from ..models import (
     TransectMethod,
 )
 from . import get_subclasses
+from .dbutils import iter_queryset
 
 
 def delete_orphaned_sample_unit(su, deleted_tm=None):
@@ -130,7 +131,7 @@ def consolidate_sample_events(*args, dryrun=False, **kwargs):
     with transaction.atomic():
         sid = transaction.savepoint()
 
-        for se in qryset:
+        for se in iter_queryset(qryset):
             se_pk = se.pk
             orphaned = delete_orphaned_sample_event(se)
             if orphaned:
@@ -67,6 +67,7 @@ from ..models import (
 )
 from ..resources.summary_sample_event import SummarySampleEventSerializer
 from ..utils import summary_csv_cache
+from ..utils.dbutils import queryset_chunks
 from ..utils.project import suggested_citation as get_suggested_citation
 from ..utils.timer import timing
 
@@ -99,21 +100,19 @@ def _delete_existing_records(project_id, target_model_cls):
 
 
 def _update_records(records, target_model_cls, created_on, suggested_citation, skip_updates=False):
-    if skip_updates or not records:
+    if skip_updates:
         return
-    idx = 0
-    while True:
-        batch = records[idx : idx + BATCH_SIZE]
+    for batch in records:
         _set_created_on(created_on, batch)
         _set_suggested_citation(suggested_citation, batch)
-        if not batch:
-            break
         target_model_cls.objects.bulk_create(batch, batch_size=BATCH_SIZE)
-        idx += BATCH_SIZE
 
 
 def _fetch_records(sql_model_cls, project_id):
-    return list(sql_model_cls.objects.all().sql_table(project_id=project_id))
+    """Lazily fetch summary records in batches of `BATCH_SIZE`."""
+    return queryset_chunks(
+        sql_model_cls.objects.all().sql_table(project_id=project_id), chunk_size=BATCH_SIZE
+    )
 
 
 def _update_cache(
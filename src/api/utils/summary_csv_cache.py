@@ -1,6 +1,11 @@
 import csv
+import gzip
+import hashlib
+import io
 import logging
-from tempfile import NamedTemporaryFile
+from tempfile import SpooledTemporaryFile
+
+from django.utils.encoding import force_bytes
 
 from ..exceptions import UpdateSummariesException
 from ..mocks import MockRequest
@@ -52,69 +57,121 @@ from ..resources.sampleunitmethods.habitatcomplexitymethod import (
     HabitatComplexityProjectMethodSUView,
 )
 from ..resources.summary_sample_event import SummarySampleEventView
-from ..utils import cached
+from ..utils import cached, cached_filters
+from ..utils.dbutils import iter_queryset
 from ..utils.timer import timing
 
 logger = logging.getLogger(__name__)
 
 
-def _update_cached_csv(
-    project_id,
-    viewset_cls,
-    skip_updates=False,
-    include_additional_fields=False,
-    show_display_fields=False,
-):
-    assert hasattr(viewset_cls, "serializer_class_csv")
+# Bump to force cached CSVs to be regenerated when their rendering changes
+# without the underlying summary rows changing.
+CSV_CACHE_VERSION = "1"
+CHECKSUM_METADATA_KEY = "checksum"
+SPOOL_MAX_SIZE = 32 * 1024 * 1024
 
-    key = cached.make_viewset_cache_key(
-        viewset_cls,
-        project_id,
-        include_additional_fields=include_additional_fields,
-        show_display_fields=show_display_fields,
-    )
+# (include_additional_fields, show_display_fields)
+CSV_FIELD_OPTIONS = (
+    # CSV with user-friendly field names
+    (False, True),
+    # CSV with additional fields and variable column names
+    (True, False),
+)
 
-    if skip_updates is not True:
-        cached.delete_file(key)
+
+def _summary_checksum(qs, serializer_class):
+    """
+    Checksum of everything a cached CSV is rendered from: the summary rows
+    (minus their rebuild timestamp) and the serializer's columns.
+    """
+    checksum = hashlib.sha256(force_bytes(CSV_CACHE_VERSION))
+    for include_additional_fields, show_display_fields in CSV_FIELD_OPTIONS:
+        fields = csv_report.get_fields(
+            serializer_class,
+            include_additional_fields=include_additional_fields,
+            show_display_fields=show_display_fields,
+        )
+        checksum.update(force_bytes("\x1f".join(str(f) for f in fields)))
+
+    field_names = [f.attname for f in qs.model._meta.concrete_fields if f.name != "created_on"]
+    for row in iter_queryset(qs.values_list(*field_names)):
+        checksum.update(force_bytes("\x1f".join(str(v) for v in row)))
+        checksum.update(b"\x1e")
+
+    return checksum.hexdigest()
+
+
+def _is_cached(key, checksum):
+    """
+    Whether the CSV of `key` was rendered from `checksum` and its Parquet
+    companion, which filtered exports are answered from, exists.
+    """
+    metadata = cached.get_metadata(key)
+    if metadata is None or metadata.get(CHECKSUM_METADATA_KEY) != checksum:
+        return False
+    return cached.exists(cached_filters.make_parquet_key(key))
+
+
+def _cache_csv(key, fields, rows, checksum):
+    with SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE) as f:
+        with gzip.GzipFile(fileobj=f, mode="wb", compresslevel=5) as gz:
+            text = io.TextIOWrapper(gz, encoding="utf-8", newline="")
+            writer = csv.writer(text, quoting=csv.QUOTE_ALL)
+            writer.writerow(fields)
+            writer.writerows(rows)
+            text.flush()
+            text.detach()
+
+        f.seek(0)
+        cached.cache_fileobj(
+            key,
+            f,
+            content_type="text/csv",
+            content_encoding="gzip",
+            metadata={CHECKSUM_METADATA_KEY: checksum},
+        )
+
+
+def _update_cached_csvs(project_id, viewset_cls, skip_updates=False):
+    assert hasattr(viewset_cls, "serializer_class_csv")
+
+    keys = [
+        cached.make_viewset_cache_key(
+            viewset_cls,
+            project_id,
+            include_additional_fields=include_additional_fields,
+            show_display_fields=show_display_fields,
+        )
+        for include_additional_fields, show_display_fields in CSV_FIELD_OPTIONS
+    ]
 
     request = MockRequest()
 
     vw = viewset_cls()
     vw.kwargs = {"project_pk": project_id}
     vw.request = request
-    qs = vw.get_queryset().filter(project_id=project_id)
-    fields, rows = csv_report.get_formatted_data(
-        qs,
-        serializer_class=viewset_cls.serializer_class_csv,
-        include_additional_fields=include_additional_fields,
-        show_display_fields=show_display_fields,
-    )
-    with NamedTemporaryFile(mode="w") as csvfile:
-        writer = csv.writer(csvfile, quoting=csv.QUOTE_ALL)
-        writer.writerow(fields)
-        writer.writerows(rows)
-        csvfile.flush()
-        cached.cache_file(key, csvfile.name, compress=True, content_type="text/csv")
+    # Explicit ordering keeps the rendered rows aligned with the filter
+    # values cached alongside them.
+    ordering = list(getattr(viewset_cls, "ordering", None) or []) + ["pk"]
+    qs = vw.get_queryset().filter(project_id=project_id).order_by(*ordering)
 
+    checksum = _summary_checksum(qs, viewset_cls.serializer_class_csv)
+    if all(_is_cached(key, checksum) for key in keys):
+        logger.info(f"Summary rows unchanged, skipping {viewset_cls.__name__} cached CSVs")
+        return
 
-def _update_cached_csvs(project_id, viewset_cls, skip_updates=False):
-    # CSV with user-friendly field names
-    _update_cached_csv(
-        project_id,
-        viewset_cls,
-        skip_updates=skip_updates,
-        include_additional_fields=False,
-        show_display_fields=True,
-    )
+    if skip_updates is not True:
+        for key in keys:
+            cached.delete_file(key)
+            cached_filters.delete_filterable_rows(key)
 
-    # CSV with additional fields and variable column names
-    _update_cached_csv(
-        project_id,
-        viewset_cls,
-        skip_updates=skip_updates,
-        include_additional_fields=True,
-        show_display_fields=False,
+    formatted_data_sets = csv_report.get_formatted_data_sets(
+        qs, viewset_cls.serializer_class_csv, CSV_FIELD_OPTIONS
     )
+    filter_field_names, filter_values = cached_filters.get_filter_values(qs)
+    for key, (fields, rows) in zip(keys, formatted_data_sets):
+        _cache_csv(key, fields, rows, checksum)
+        cached_filters.cache_filterable_rows(key, fields, rows, filter_field_names, filter_values)
 
 
 @timing
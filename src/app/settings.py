@@ -91,6 +91,8 @@ DEBUG = False
 TESTING = False
 DEBUG_LEVEL = "WARNING"
 CONN_MAX_AGE = 0
+# Rows fetched per round trip when iterating large querysets with server-side cursors.
+DB_ITERATOR_CHUNK_SIZE = int(os.environ.get("DB_ITERATOR_CHUNK_SIZE", 2000))
 CORS_ALLOW_ALL_ORIGINS = True
 CORS_ALLOW_METHODS = list(default_methods) + ["HEAD"]
 CORS_EXPOSE_HEADERS = ["HTTP_API_VERSION"]
@@ -412,6 +414,13 @@ CACHES = {
     }
 }
 
+# Local disk LRU for cached summary files (e.g. CSV exports), per container.
+# Set CACHED_FILES_LOCAL_MAX_SIZE to 0 to disable.
+CACHED_FILES_LOCAL_DIR = os.environ.get("CACHED_FILES_LOCAL_DIR", "/tmp/mermaid/cached")
+CACHED_FILES_LOCAL_MAX_SIZE = int(
+    os.environ.get("CACHED_FILES_LOCAL_MAX_SIZE", 512 * 1024 * 1024)  # 512 MB
+)
+
 
 # SIMPLEQ SETTINGS
 
@@ -446,6 +455,22 @@ MAX_IMAGE_FILE_SIZE = 30 * 1024 * 1024  # 30 MB
 AWS_QUERYSTRING_AUTH = False
 AUTOCONFIRM_THRESHOLD = 1.0
 CLASSIFIED_THRESHOLD = 0.5
+# Max number of pending images classified together by one worker job
+CLASSIFICATION_BATCH_SIZE = int(os.environ.get("CLASSIFICATION_BATCH_SIZE", "10"))
+# Seconds after which a running classification is considered abandoned (e.g. its
+# worker died) and its image can be claimed again
+CLASSIFICATION_RUNNING_TIMEOUT = int(os.environ.get("CLASSIFICATION_RUNNING_TIMEOUT", "1800"))
+# Keep writing the single file annotations export alongside the partitioned
+# dataset until its consumers have moved to the dataset
+ANNOTATIONS_PARQUET_LEGACY_FILE = (
+    os.environ.get("ANNOTATIONS_PARQUET_LEGACY_FILE", "True") == "True"
+)
+# Number of threads copying files when moving a project's images between buckets
+IMAGE_MIGRATION_MAX_WORKERS = int(os.environ.get("IMAGE_MIGRATION_MAX_WORKERS", "8"))
+# Number of threads validating collect records in bulk validations (1 validates serially)
+VALIDATION_MAX_WORKERS = int(os.environ.get("VALIDATION_MAX_WORKERS", "4"))
+# Number of collect records written per transaction in bulk submissions
+SUBMIT_BATCH_SIZE = int(os.environ.get("SUBMIT_BATCH_SIZE", "50"))
 SPACER = {
     "AWS_ACCESS_KEY_ID": IMAGE_BUCKET_AWS_ACCESS_KEY_ID,
     "AWS_SECRET_ACCESS_KEY": IMAGE_BUCKET_AWS_SECRET_ACCESS_KEY,
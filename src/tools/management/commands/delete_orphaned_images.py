@@ -1,7 +1,6 @@
 from django.core.management.base import BaseCommand
-from django.db.models import Exists, OuterRef
 
-from api.models import CollectRecord, Image, ObsBenthicPhotoQuadrat
+from api.utils.image_cleanup import DELETE_CHUNK_SIZE, delete_orphaned_images, get_orphaned_images
 
 
 class Command(BaseCommand):
@@ -13,35 +12,35 @@ class Command(BaseCommand):
             action="store_true",
             help="Only show which images would be deleted, without actually deleting.",
         )
+        parser.add_argument(
+            "--chunk_size",
+            type=int,
+            default=DELETE_CHUNK_SIZE,
+            help="Number of images deleted per transaction.",
+        )
 
     def handle(self, *args, **options):
         dry_run = options["dry_run"]
         self.stdout.write("Finding orphaned images...")
 
-        orphaned_images = Image.objects.annotate(
-            has_collect_record=Exists(
-                CollectRecord.objects.filter(id=OuterRef("collect_record_id"))
-            ),
-            is_used=Exists(ObsBenthicPhotoQuadrat.objects.filter(image=OuterRef("pk"))),
-        ).filter(has_collect_record=False, is_used=False)
+        orphaned_images = get_orphaned_images()
+
+        if dry_run:
+            count = orphaned_images.count()
+            if count == 0:
+                self.stdout.write("No orphaned images found.")
+                return
 
-        count = orphaned_images.count()
+            self.stdout.write(f"Dry run: {count} orphaned images would be deleted:")
+            for image_id, name in orphaned_images.values_list("id", "name").iterator():
+                self.stdout.write(f"- Image ID: {image_id}, name: {name or 'Unnamed'}")
+            return
 
-        if count == 0:
+        image_ids = list(orphaned_images.order_by("created_on").values_list("id", flat=True))
+        if not image_ids:
             self.stdout.write("No orphaned images found.")
             return
 
-        if dry_run:
-            self.stdout.write(f"Dry run: {count} orphaned images would be deleted:")
-            for image in orphaned_images.iterator():
-                self.stdout.write(f"- Image ID: {image.id}, name: {image.name or 'Unnamed'}")
-        else:
-            self.stdout.write(f"Deleting {count} orphaned images...")
-            for image in orphaned_images.iterator():
-                self.stdout.write(
-                    f"- Deleting image ID: {image.id}, name: {image.name or 'Unnamed'}"
-                )
-                # file cleanup happens via signal
-                image.delete()
-
-            self.stdout.write("Orphaned images cleanup completed.")
+        self.stdout.write(f"Deleting {len(image_ids)} orphaned images...")
+        count = delete_orphaned_images(image_ids, chunk_size=options["chunk_size"])
+        self.stdout.write(f"Orphaned images cleanup completed, {count} images deleted.")
@@ -4,19 +4,28 @@ from api.utils.classification import export_annotations_parquet
 
 
 class Command(BaseCommand):
-    help = "Exports confirmed image annotations to a Parquet file and uploads it to S3."
+    help = (
+        "Exports confirmed image annotations to a project partitioned Parquet dataset in S3, "
+        "re-exporting only partitions that changed since the last run."
+    )
 
     def add_arguments(self, parser):
         parser.add_argument("--chunk_size", type=int, default=10000)
+        parser.add_argument(
+            "--full",
+            action="store_true",
+            help="Re-export all partitions, ignoring the manifest.",
+        )
 
     def handle(self, *args, **options):
         chunk_size = options["chunk_size"]
+        full = options["full"]
 
         self.stdout.write(
             f"Starting export of annotations to parquet with chunk size: {chunk_size}"
         )
         try:
-            export_annotations_parquet(chunk_size=chunk_size)
+            export_annotations_parquet(chunk_size=chunk_size, full=full)
             self.stdout.write(self.style.SUCCESS("Export completed successfully."))
         except Exception as e:
             self.stderr.write(self.style.ERROR(f"Export failed: {e}"))
@@ -1,8 +1,9 @@
 from django.core.management.base import BaseCommand
-from PIL import Image as PILImage, ImageDraw
+from PIL import Image as PILImage
+from PIL import ImageDraw
 
-from api.models import Image
-from api.utils import classification
+from api.models import Classifier, Image
+from api.utils import classification, point_layouts
 
 
 class Command(BaseCommand):
@@ -27,7 +28,11 @@ class Command(BaseCommand):
             self.stderr.write(f"Image with id {image} does not exist.")
             self.exit(1)
 
-        points = classification.generate_points(img_rec, 25)
+        classifier = Classifier.latest()
+        layout_options = point_layouts.get_layout_options(
+            img_rec.project, classifier.num_points if classifier else None
+        )
+        points = classification.generate_points(img_rec, **layout_options)
 
         with img_rec.image.open("rb") as f:
             pil_image = PILImage.open(f).copy()
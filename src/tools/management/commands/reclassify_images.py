@@ -0,0 +1,62 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+
+from api.models import CollectRecord, Image, ObsBenthicPhotoQuadrat
+from api.utils.classification import reclassify_images
+
+
+class Command(BaseCommand):
+    help = """
+    Re-score images with the latest classifier using their stored feature vectors.
+    Images whose feature vectors were extracted with different extractor weights
+    or for a different point layout are skipped.
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--project",
+            nargs="*",
+            dest="project_ids",
+            help="Only reclassify images of these projects.",
+        )
+        parser.add_argument("--batch_size", type=int, default=100)
+
+    def handle(self, *args, **options):
+        project_ids = options.get("project_ids")
+        batch_size = options["batch_size"]
+
+        images = Image.objects.exclude(feature_vector_file="").exclude(
+            feature_vector_file__isnull=True
+        )
+        if project_ids:
+            images = images.filter(
+                Q(
+                    collect_record_id__in=CollectRecord.objects.filter(
+                        project_id__in=project_ids
+                    ).values("id")
+                )
+                | Q(
+                    id__in=ObsBenthicPhotoQuadrat.objects.filter(
+                        **{f"{ObsBenthicPhotoQuadrat.project_lookup}__in": project_ids}
+                    ).values("image_id")
+                )
+            )
+
+        image_ids = list(images.order_by("created_on").values_list("id", flat=True))
+        self.stdout.write(f"Reclassifying {len(image_ids)} images...")
+
+        num_reclassified = 0
+        num_skipped = 0
+        for n in range(0, len(image_ids), batch_size):
+            reclassified, skipped = reclassify_images(image_ids[n : n + batch_size])
+            num_reclassified += len(reclassified)
+            num_skipped += len(skipped)
+            for image_id in skipped:
+                self.stdout.write(f"- Skipped image ID: {image_id}")
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Reclassified {num_reclassified} images, skipped {num_skipped} images "
+                "without a compatible feature vector."
+            )
+        )
@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from api.models.classification import Classifier
+from api.utils.classification import cache_classifier_artifacts
+
+
+class Command(BaseCommand):
+    help = (
+        "Download and verify classifier artifacts (classifier and extractor weights) "
+        "into the local classifier cache so the first classification job doesn't have to."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--classifier-version",
+            help="Classifier version to cache. Defaults to the latest classifier.",
+        )
+
+    def handle(self, *args, **options):
+        classifier_version = options.get("classifier_version")
+        if classifier_version:
+            classifier = (
+                Classifier.objects.filter(version=classifier_version)
+                .order_by("-created_on")
+                .first()
+            )
+        else:
+            classifier = Classifier.latest()
+
+        if classifier is None:
+            raise CommandError("Classifier not found.")
+
+        for local_path, checksum in cache_classifier_artifacts(classifier).items():
+            self.stdout.write(f"- {local_path} (sha256: {checksum})")
+
+        self.stdout.write(self.style.SUCCESS(f"Classifier {classifier.version} cached."))